@@ -7,15 +7,29 @@ Bot tarafinda taranan veriler burada gosterilir.
 Kullanim:
     uvicorn admin.app:app --host 0.0.0.0 --port 8000
 """
+import asyncio
+import gzip
 import logging
 import json
 import os
+import threading
+import time
 from datetime import datetime
 from contextlib import asynccontextmanager
 from pathlib import Path
 
-from fastapi import FastAPI
-from fastapi.responses import HTMLResponse
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import HTMLResponse, StreamingResponse
+
+# Opsiyonel hizli JSON / brotli sikistirma
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import brotli
+except ImportError:
+    brotli = None
 
 logger = logging.getLogger(__name__)
 
@@ -42,16 +56,203 @@ bot_state = {
 
 DATA_FILE = Path("bot_data.json")
 
+# Bot ayni surecte calisiyor mu (bot.runner.start_web_panel True yapar):
+# o zaman durum dogrudan set_bot_state ile gelir, Postgres kanali dinlenmez
+in_process_bot = False
+
+# Surum numaralari: her guncellemede "state", cekim listeleri/sayilari
+# degisince "withdrawals" artar. ETag = surum (+ surec kimligi, yeniden
+# baslatmada eski ETag'ler eslesmesin).
+_WITHDRAWAL_KEYS = frozenset(
+    f"{status}_{field}"
+    for status in ("beklemede", "reserve", "islemde")
+    for field in ("items", "count", "total")
+)
+_versions = {"state": 0, "withdrawals": 0}
+_versions_lock = threading.Lock()
+_BOOT_ID = format(int(time.time() * 1000), "x")
+
+# Surum basina bir kez uretilen yanit byte'lari: kind -> (surum, {encoding: bytes})
+_encoded = {}
+_encode_lock = threading.Lock()
+COMPRESS_MIN_BYTES = 1024
+
+STREAM_STATUSES = ("beklemede", "reserve", "islemde")
+
+# /api/stream aboneleri (web event loop'undaki kuyruklar)
+_subscribers = set()
+_stream_loop = None
+STREAM_QUEUE_SIZE = 32
+STREAM_PING_SECONDS = 15
+
+
+def set_bot_state(changes):
+    """
+    bot_state'i guncelle ve surum numaralarini artir. Bot (ayni surec),
+    durum kanali ve acilis yuklemesi bot_state'e sadece bunun uzerinden yazar.
+    Canli akis (/api/stream) aboneleri varsa eski/yeni liste referanslarini
+    web loop'una verir; yama ve serialize orada bir kez yapilir (botun
+    tarama dongusu beklemez).
+    """
+    with _versions_lock:
+        base = _versions["withdrawals"]
+        # Bot her turda {durum}_count yazar: sadece degeri gercekten
+        # degisen liste/sayi/toplam surumu artirir (yoksa ETag hep degisir)
+        withdrawals_changed = any(
+            changes[key] is not bot_state.get(key) and changes[key] != bot_state.get(key)
+            for key in _WITHDRAWAL_KEYS.intersection(changes)
+        )
+        # Listeler yerinde degistirilmez: referanslar yeterli, yama _fan_out'ta
+        lists = None
+        if _subscribers and withdrawals_changed:
+            lists = _changed_lists(changes)
+        bot_state.update(changes)
+        _versions["state"] += 1
+        if withdrawals_changed:
+            _versions["withdrawals"] += 1
+            bot_state["withdrawals_scan"] = bot_state.get("last_scan")
+        if _subscribers and _stream_loop is not None:
+            event = {
+                "state": _versions["state"],
+                "withdrawals": _versions["withdrawals"],
+                "base": base,
+                "status": _status_body(),
+            }
+            _stream_loop.call_soon_threadsafe(_fan_out, event, lists)
+
+
+def _changed_lists(changes):
+    """Degisen durum listeleri: durum -> (eski liste, yeni liste)."""
+    lists = {}
+    for status in STREAM_STATUSES:
+        items = changes.get(f"{status}_items")
+        if items is None or items is bot_state.get(f"{status}_items"):
+            continue
+        lists[status] = (bot_state.get(f"{status}_items"), items)
+    return lists
+
+
+def _list_patches(lists):
+    """Degisen durum listeleri icin id bazli yama ({order, upsert} veya {full})."""
+    from bot.state_store import list_patch
+    patches = {}
+    for status, (old, items) in lists.items():
+        patch = list_patch(old, items)
+        patches[status] = patch if patch is not None else {"full": items}
+    return patches
+
+
+def _fan_out(event, lists=None):
+    """
+    Web event loop'unda: farki yamala, bir kez serialize et ve tum abonelere
+    ilet. Yetisemeyen abone kapatilir.
+    """
+    if not _subscribers:
+        return
+    event["lists"] = _list_patches(lists) if lists else None
+    message = "event: delta\ndata: " + _dumps_bytes(event).decode("utf-8") + "\n\n"
+    for queue in list(_subscribers):
+        try:
+            queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # Istemci yavas: baglantiyi kapat, yeniden baglaninca tam veri ceker
+            _subscribers.discard(queue)
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait(None)
+
+
+def _dumps_bytes(obj):
+    """JSON -> UTF-8 bytes (orjson varsa onunla)."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str)
+    return json.dumps(obj, ensure_ascii=False, default=str, separators=(",", ":")).encode("utf-8")
+
+
+def _encode_variants(body):
+    """Duz + (yeterince buyukse) gzip / br varyantlari."""
+    raw = _dumps_bytes(body)
+    variants = {"identity": raw}
+    if len(raw) >= COMPRESS_MIN_BYTES:
+        variants["gzip"] = gzip.compress(raw, compresslevel=6)
+        if brotli is not None:
+            variants["br"] = brotli.compress(raw, quality=5)
+    return variants
+
+
+def _negotiate(accept_encoding, variants):
+    """Accept-Encoding (q degerleriyle) -> br > gzip > identity."""
+    prefs = {}
+    for part in (accept_encoding or "").split(","):
+        token, _, params = part.partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        q = 1.0
+        params = params.strip().replace(" ", "")
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        prefs[token] = q
+    for encoding in ("br", "gzip"):
+        if encoding in variants and prefs.get(encoding, prefs.get("*", 0.0)) > 0:
+            return encoding
+    return "identity"
+
+
+def _etag(kind, version):
+    # Zayif ETag: ayni surumun gzip/br/duz halleri ayni icerik sayilir
+    return f'W/"{kind}-{_BOOT_ID}-{version}"'
+
+
+def _etag_matches(if_none_match, etag):
+    if not if_none_match:
+        return False
+    tags = [t.strip() for t in if_none_match.split(",")]
+    return "*" in tags or etag in tags or etag[2:] in tags
+
+
+def _cached_json(request, kind, build):
+    """
+    kind ("state" / "withdrawals") surumunun JSON yaniti. If-None-Match
+    eslesirse 304; degilse bu surum icin bir kez uretilmis byte'lar
+    (istemcinin kabul ettigi sikistirmayla) dogrudan Response olarak doner.
+    """
+    with _versions_lock:
+        version = _versions[kind]
+    if _etag_matches(request.headers.get("if-none-match"), _etag(kind, version)):
+        return Response(status_code=304, headers={
+            "ETag": _etag(kind, version), "Cache-Control": "no-cache", "Vary": "Accept-Encoding",
+        })
+
+    entry = _encoded.get(kind)
+    if entry is None or entry[0] < version:
+        with _encode_lock:
+            entry = _encoded.get(kind)
+            if entry is None or entry[0] < version:
+                with _versions_lock:
+                    version = _versions[kind]
+                    body = build(version)
+                entry = (version, _encode_variants(body))
+                _encoded[kind] = entry
+
+    version, variants = entry
+    encoding = _negotiate(request.headers.get("accept-encoding"), variants)
+    headers = {"ETag": _etag(kind, version), "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    return Response(content=variants[encoding], media_type="application/json", headers=headers)
+
 
 def load_bot_data():
-    """Disk'ten bot verisini yukle."""
-    if DATA_FILE.exists():
-        try:
-            with open(DATA_FILE, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                bot_state.update(data)
-        except Exception:
-            pass
+    """Disk'ten bot verisini yukle (snapshot + journal)."""
+    try:
+        from bot.state_store import load_state
+        set_bot_state(load_state(DATA_FILE))
+    except Exception:
+        pass
 
 
 def save_bot_data():
@@ -65,6 +266,8 @@ def save_bot_data():
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    global _stream_loop
+    _stream_loop = asyncio.get_running_loop()
     # Veritabani opsiyonel - yoksa sessizce atla
     try:
         from database.db import init_db
@@ -72,6 +275,15 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.info("Veritabani atlanıyor (opsiyonel): %s", e)
     load_bot_data()
+    # Bot ayri surecte (Procfile worker): her turun farki Postgres NOTIFY ile gelir.
+    # Bot ayni surecteyse (start_web_panel) durum zaten set_bot_state ile geliyor.
+    from config.settings import BOT_STATE_CHANNEL
+    if BOT_STATE_CHANNEL == "postgres" and not in_process_bot:
+        try:
+            from database.state_channel import PostgresStateListener
+            app.state.state_listener = PostgresStateListener(set_bot_state).start()
+        except Exception as e:
+            logger.warning("Durum kanali dinlenemiyor: %s", e)
     yield
 
 
@@ -85,8 +297,12 @@ def health():
 
 
 @app.get("/api/status")
-def api_status():
-    """Bot durumu ve ozet bilgi (3 durum dahil)."""
+def api_status(request: Request):
+    """Bot durumu ve ozet bilgi (3 durum dahil). If-None-Match destekler."""
+    return _cached_json(request, "state", lambda version: _status_body())
+
+
+def _status_body():
     return {
         "status": bot_state["bot_status"],
         "last_scan": bot_state["last_scan"],
@@ -104,13 +320,38 @@ def api_status():
             "count": bot_state.get("islemde_count", 0),
             "total": bot_state.get("islemde_total", 0),
         },
+        "scan_timing": bot_state.get("scan_timing"),
+        "last_delta": bot_state.get("last_delta"),
+        "scheduler": bot_state.get("scheduler"),
+        "browser": bot_state.get("browser"),
+        "startup": bot_state.get("startup"),
+        "failover": bot_state.get("failover"),
+        "io": bot_state.get("io"),
+    }
+
+
+@app.get("/api/changes")
+def api_changes(limit: int = 50):
+    """Son tarama turlarindaki degisiklikler (yeni/kalkan/durum degistiren)."""
+    return {
+        "last_delta": bot_state.get("last_delta"),
+        "changes": bot_state.get("changes", [])[:max(limit, 0)],
     }
 
 
 @app.get("/api/withdrawals")
-def api_withdrawals():
-    """Tum durumlardaki cekim listeleri."""
+def api_withdrawals(request: Request):
+    """
+    Tum durumlardaki cekim listeleri. Listeler degismedikce ETag ayni kalir,
+    If-None-Match ile 304 doner. last_scan: listelerin son degistigi tarama.
+    Yanit byte'lari surum basina bir kez uretilir (gzip/br dahil).
+    """
+    return _cached_json(request, "withdrawals", _withdrawals_body)
+
+
+def _withdrawals_body(version):
     return {
+        "version": version,
         "beklemede": {
             "count": bot_state.get("beklemede_count", 0),
             "total": bot_state.get("beklemede_total", 0),
@@ -126,10 +367,43 @@ def api_withdrawals():
             "total": bot_state.get("islemde_total", 0),
             "items": bot_state.get("islemde_items", []),
         },
-        "last_scan": bot_state["last_scan"],
+        "last_scan": bot_state.get("withdrawals_scan", bot_state["last_scan"]),
     }
 
 
+@app.get("/api/stream")
+async def api_stream(request: Request):
+    """
+    Server-Sent Events: her taramada "delta" olayi (durum ozeti + degisen
+    listelerin id bazli yamasi). Baglaninca "hello" ile surumler gelir;
+    istemci tam veriyi bir kez ceker, sonra yamalari uygular.
+    """
+    queue = asyncio.Queue(maxsize=STREAM_QUEUE_SIZE)
+    _subscribers.add(queue)
+
+    async def events():
+        try:
+            hello = {"state": _versions["state"], "withdrawals": _versions["withdrawals"]}
+            yield "retry: 3000\nevent: hello\ndata: " + json.dumps(hello) + "\n\n"
+            while not await request.is_disconnected():
+                try:
+                    message = await asyncio.wait_for(queue.get(), STREAM_PING_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": ping\n\n"
+                    continue
+                if message is None:
+                    break
+                yield message
+        finally:
+            _subscribers.discard(queue)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @app.get("/", response_class=HTMLResponse)
 def dashboard():
     """Ana panel sayfasi."""
@@ -409,6 +683,14 @@ HTML_TEMPLATE = """<!DOCTYPE html>
                 <div class="info-label">Tarama Sayisi</div>
                 <div class="info-value" id="scanCount">-</div>
             </div>
+            <div class="info-card">
+                <div class="info-label">Son Degisiklik</div>
+                <div class="info-value" id="lastDelta">-</div>
+            </div>
+            <div class="info-card">
+                <div class="info-label">Bellek (JS / Chrome)</div>
+                <div class="info-value" id="memory">-</div>
+            </div>
         </div>
 
         <!-- Tablo -->
@@ -538,59 +820,131 @@ HTML_TEMPLATE = """<!DOCTYPE html>
             renderTable(filtered);
         }
 
+        // ETag onbellegi: degismeyen yanit 304 doner, govde tekrar islenmez
+        const etags = {}, cached = {};
+        async function getJSON(url) {
+            const headers = etags[url] ? {'If-None-Match': etags[url]} : {};
+            const r = await fetch(url, {headers: headers, cache: 'no-store'});
+            if (r.status === 304) return [cached[url], false];
+            const body = await r.json();
+            etags[url] = r.headers.get('ETag');
+            cached[url] = body;
+            return [body, true];
+        }
+
         async function loadData() {
             try {
-                const sr = await fetch('/api/status');
-                const status = await sr.json();
-
-                const badge = document.getElementById('statusBadge');
-                if (status.status === 'calisiyor') {
-                    badge.textContent = 'Calisiyor';
-                    badge.className = 'status-badge status-ok';
-                } else if (status.status === 'hata') {
-                    badge.textContent = 'Hata';
-                    badge.className = 'status-badge status-err';
-                } else {
-                    badge.textContent = status.status || 'Bilinmiyor';
-                    badge.className = 'status-badge status-wait';
+                const [status, statusChanged] = await getJSON('/api/status');
+                if (statusChanged) renderStatus(status);
+
+                // Cekim listelerini al (degismediyse 304, tablo yeniden cizilmez)
+                const [data, listsChanged] = await getJSON('/api/withdrawals');
+                listsVersion = data.version;
+                if (listsChanged) {
+                    allData.beklemede = (data.beklemede || {}).items || [];
+                    allData.reserve = (data.reserve || {}).items || [];
+                    allData.islemde = (data.islemde || {}).items || [];
+
+                    // Aktif tab'i renderla (arama filtresi korunur)
+                    filterTable();
                 }
 
-                document.getElementById('scanCount').textContent = status.scan_count || 0;
-                document.getElementById('lastScan').textContent = status.last_scan ? formatTime(status.last_scan) : 'Henuz taranmadi';
+                document.getElementById('lastUpdate').textContent =
+                    'Son guncelleme: ' + new Date().toLocaleTimeString('tr-TR');
+            } catch(e) {
+                document.getElementById('statusBadge').textContent = 'Baglanti Hatasi';
+                document.getElementById('statusBadge').className = 'status-badge status-err';
+            }
+        }
 
-                // Durum kartlarini guncelle
-                const bek = status.beklemede || {};
-                const res = status.reserve || {};
-                const isl = status.islemde || {};
+        function renderStatus(status) {
+            const badge = document.getElementById('statusBadge');
+            if (status.status === 'calisiyor') {
+                badge.textContent = 'Calisiyor';
+                badge.className = 'status-badge status-ok';
+            } else if (status.status === 'hata') {
+                badge.textContent = 'Hata';
+                badge.className = 'status-badge status-err';
+            } else {
+                badge.textContent = status.status || 'Bilinmiyor';
+                badge.className = 'status-badge status-wait';
+            }
 
-                document.getElementById('bekCount').textContent = bek.count || 0;
-                document.getElementById('bekTotal').textContent = formatMoney(bek.total || 0);
-                document.getElementById('resCount').textContent = res.count || 0;
-                document.getElementById('resTotal').textContent = formatMoney(res.total || 0);
-                document.getElementById('islCount').textContent = isl.count || 0;
-                document.getElementById('islTotal').textContent = formatMoney(isl.total || 0);
+            document.getElementById('scanCount').textContent = status.scan_count || 0;
+            document.getElementById('lastScan').textContent = status.last_scan ? formatTime(status.last_scan) : 'Henuz taranmadi';
+            const ld = status.last_delta;
+            document.getElementById('lastDelta').textContent = ld
+                ? '+' + ld.added + ' / -' + ld.removed + ' / ' + ld.transitioned + ' gecis'
+                : '-';
+            const mem = ((status.browser || {}).memory || {}).last;
+            document.getElementById('memory').textContent = mem
+                ? (mem.js_heap_mb ?? '-') + ' / ' + (mem.rss_mb ?? '-') + ' MB'
+                : '-';
+
+            // Durum kartlarini guncelle
+            const bek = status.beklemede || {};
+            const res = status.reserve || {};
+            const isl = status.islemde || {};
+
+            document.getElementById('bekCount').textContent = bek.count || 0;
+            document.getElementById('bekTotal').textContent = formatMoney(bek.total || 0);
+            document.getElementById('resCount').textContent = res.count || 0;
+            document.getElementById('resTotal').textContent = formatMoney(res.total || 0);
+            document.getElementById('islCount').textContent = isl.count || 0;
+            document.getElementById('islTotal').textContent = formatMoney(isl.total || 0);
+        }
 
-                // Cekim listelerini al
-                const wr = await fetch('/api/withdrawals');
-                const data = await wr.json();
+        // Canli akis (SSE): her taramanin farki aninda uygulanir.
+        // EventSource yoksa / baglanti koparsa 10s'lik polling devreye girer.
+        let listsVersion = null;
+        let pollTimer = null;
 
-                allData.beklemede = (data.beklemede || {}).items || [];
-                allData.reserve = (data.reserve || {}).items || [];
-                allData.islemde = (data.islemde || {}).items || [];
+        function startPolling() {
+            if (!pollTimer) pollTimer = setInterval(loadData, 10000);
+        }
 
-                // Aktif tab'i renderla
-                renderTable(allData[currentTab] || []);
+        function stopPolling() {
+            if (pollTimer) { clearInterval(pollTimer); pollTimer = null; }
+        }
 
-                document.getElementById('lastUpdate').textContent =
-                    'Son guncelleme: ' + new Date().toLocaleTimeString('tr-TR');
-            } catch(e) {
-                document.getElementById('statusBadge').textContent = 'Baglanti Hatasi';
-                document.getElementById('statusBadge').className = 'status-badge status-err';
+        function applyListPatch(old, patch) {
+            if (patch.full) return patch.full;
+            const byId = {};
+            old.forEach(i => { byId[String(i.id)] = i; });
+            (patch.upsert || []).forEach(i => { byId[String(i.id)] = i; });
+            return patch.order.filter(id => id in byId).map(id => byId[id]);
+        }
+
+        async function onDelta(ev) {
+            const msg = JSON.parse(ev.data);
+            renderStatus(msg.status);
+            if (msg.lists) {
+                if (listsVersion !== msg.base) {
+                    // Arada kacan tur var: tam veriyi cek
+                    await loadData();
+                    return;
+                }
+                for (const key in msg.lists) {
+                    allData[key] = applyListPatch(allData[key] || [], msg.lists[key]);
+                }
+                filterTable();
             }
+            listsVersion = msg.withdrawals;
+            document.getElementById('lastUpdate').textContent =
+                'Son guncelleme: ' + new Date().toLocaleTimeString('tr-TR') + ' (canli)';
+        }
+
+        function connectStream() {
+            if (!window.EventSource) { startPolling(); return; }
+            const es = new EventSource('/api/stream');
+            es.addEventListener('hello', () => { stopPolling(); loadData(); });
+            es.addEventListener('delta', onDelta);
+            // EventSource kendisi yeniden baglanir; o arada polling
+            es.onerror = () => { startPolling(); };
         }
 
         loadData();
-        setInterval(loadData, 10000);
+        connectStream();
     </script>
 </body>
 </html>
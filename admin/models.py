@@ -1,7 +1,7 @@
 from datetime import datetime
 from decimal import Decimal
 
-from sqlalchemy import Boolean, DateTime, Integer, String, Text, Numeric
+from sqlalchemy import BigInteger, Boolean, DateTime, Integer, String, Text, Numeric
 from sqlalchemy.orm import Mapped, mapped_column
 from database.db import Base
 
@@ -34,3 +34,22 @@ class Settings(Base):
 
     key: Mapped[str] = mapped_column(String(255), primary_key=True)
     value: Mapped[str] = mapped_column(String(1024), nullable=False)
+
+
+# Panel durumunun son tam snapshot'i (tek satir, id=1) - database/state_channel.py
+class BotStateSnapshot(Base):
+    __tablename__ = "bot_state_snapshot"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    seq: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    data: Mapped[str] = mapped_column(Text, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+
+# Snapshot'tan sonraki tur farklari (journal satirlari)
+class BotStateLog(Base):
+    __tablename__ = "bot_state_log"
+
+    seq: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=False)
+    entry: Mapped[str] = mapped_column(Text, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
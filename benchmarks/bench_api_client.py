@@ -0,0 +1,67 @@
+"""
+CronosAPI connection pool benchmark'i.
+======================================
+Lokal sahte sunucuya karsi cagri basina gecikmeyi olcer:
+  once  -> her cagri icin yeni httpx client (eski davranis)
+  sonra -> tek, keep-alive pool'lu client
+
+Kullanim:
+    python -m benchmarks.bench_api_client [cagri_sayisi]
+"""
+import asyncio
+import statistics
+import sys
+import time
+
+from benchmarks.fake_cronos import start_fake_server
+from bot.api_client import CronosAPI
+
+
+def _report(label, samples):
+    samples = sorted(samples)
+    p95 = samples[int(len(samples) * 0.95) - 1]
+    print(
+        f"{label:<28} ort={statistics.mean(samples):6.2f}ms  "
+        f"p50={statistics.median(samples):6.2f}ms  p95={p95:6.2f}ms",
+        flush=True,
+    )
+
+
+async def _bench_fresh_client(base_url, calls):
+    """Eski davranis: her cagridan sonra pool kapatilir."""
+    api = CronosAPI("test-token", {}, base_url=base_url)
+    samples = []
+    for _ in range(calls):
+        t0 = time.perf_counter()
+        await api.get_withdrawals(0, per_page=50)
+        await api.aclose()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return samples
+
+
+async def _bench_pooled_client(base_url, calls):
+    """Yeni davranis: ayni client, baglantilar yeniden kullanilir."""
+    samples = []
+    async with CronosAPI("test-token", {}, base_url=base_url) as api:
+        for _ in range(calls):
+            t0 = time.perf_counter()
+            await api.get_withdrawals(0, per_page=50)
+            samples.append((time.perf_counter() - t0) * 1000)
+    return samples
+
+
+async def main(calls):
+    server, base_url = start_fake_server(items_per_status=200)
+    try:
+        # Isinma
+        await _bench_pooled_client(base_url, 10)
+
+        print(f"{calls} cagri, sunucu: {base_url}", flush=True)
+        _report("once (cagri basina client)", await _bench_fresh_client(base_url, calls))
+        _report("sonra (pool'lu client)", await _bench_pooled_client(base_url, calls))
+    finally:
+        server.should_exit = True
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 300))
@@ -0,0 +1,70 @@
+"""
+Toplu onay/red (CronosAPI.decide_many) benchmark'i.
+===================================================
+Lokal sahte sunucuya (istek basina gecikme + rastgele hata) karsi
+tek tek onaylama ile decide_many'yi karsilastirir ve rate limit'in
+gercekten uygulandigini kontrol eder.
+
+Kullanim:
+    python -m benchmarks.bench_bulk_decisions [karar_sayisi]
+"""
+import asyncio
+import sys
+import time
+
+from benchmarks.fake_cronos import start_fake_server
+from bot.api_client import CronosAPI
+
+
+def _decisions(n):
+    return [
+        {"id": 1_000_000 + i, "action": "approve" if i % 4 else "reject", "reason": "test"}
+        for i in range(n)
+    ]
+
+
+async def _sequential(api, decisions):
+    ok = 0
+    for d in decisions:
+        try:
+            if d["action"] == "approve":
+                await api.approve_withdrawal(d["id"])
+            else:
+                await api.reject_withdrawal(d["id"], d["reason"])
+            ok += 1
+        except Exception:
+            pass
+    return ok
+
+
+async def main(n):
+    server, base_url = start_fake_server(latency_ms=40, fail_rate=0.05)
+    try:
+        async with CronosAPI("test-token", {}, base_url=base_url) as api:
+            decisions = _decisions(n)
+
+            t0 = time.perf_counter()
+            ok = await _sequential(api, decisions)
+            seq_s = time.perf_counter() - t0
+            print(f"tek tek          : {n} karar, {ok} basarili, {seq_s:5.2f}s", flush=True)
+
+            for concurrency, rate in ((8, 0), (16, 0), (16, 100)):
+                t0 = time.perf_counter()
+                results = await api.decide_many(decisions, concurrency=concurrency, rate=rate)
+                elapsed = time.perf_counter() - t0
+                ok = sum(1 for r in results if r["ok"])
+                failed = {r["status_code"] for r in results if not r["ok"]}
+                avg = sum(r["latency_ms"] for r in results) / len(results)
+                limit = f"{rate:.0f}/s" if rate else "limitsiz"
+                print(
+                    f"decide_many c={concurrency:<2} {limit:<8}: {ok} basarili, "
+                    f"hata kodlari={sorted(c for c in failed if c) or '-'}, "
+                    f"{elapsed:5.2f}s ({n / elapsed:6.1f} karar/s, ort. {avg:.0f}ms)",
+                    flush=True,
+                )
+    finally:
+        server.should_exit = True
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 200))
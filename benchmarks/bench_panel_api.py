@@ -0,0 +1,129 @@
+"""
+Panel API yuk testi: /api/withdrawals istek/saniye.
+===================================================
+Durum basina N cekimle bot_state doldurulur, panel ayri bir surecte
+uvicorn ile calistirilir ve ayni anda C istemciyle T saniye boyunca
+ETag gondermeden (her istekte tam govde) yuklenir:
+
+  eski     -> dict dondurulur, FastAPI her istekte jsonable_encoder +
+              json.dumps yapar (onceki davranis, /bench/legacy)
+  yeni     -> surum basina bir kez uretilmis byte'lar (duz)
+  yeni+gzip / yeni+br -> ayni, onceden sikistirilmis varyant
+
+Kullanim:
+    python -m benchmarks.bench_panel_api [durum_basina_cekim] [saniye] [eszamanli]
+"""
+import asyncio
+import multiprocessing
+import socket
+import sys
+import time
+
+import httpx
+
+from benchmarks.bench_panel_state import STATUSES, _item
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _serve(port, n):
+    import uvicorn
+
+    from admin import app as panel
+
+    changes = {"bot_status": "calisiyor", "last_scan": "2026-10-18T12:00:00+03:00", "scan_count": 1}
+    for s, key in enumerate(STATUSES):
+        items = [_item(s * 1_000_000 + i, key) for i in range(n)]
+        changes[f"{key}_items"] = items
+        changes[f"{key}_count"] = n
+        changes[f"{key}_total"] = sum(x["amount"] for x in items)
+    panel.set_bot_state(changes)
+
+    @panel.app.get("/bench/legacy")
+    def legacy():
+        with panel._versions_lock:
+            return panel._withdrawals_body(panel._versions["withdrawals"])
+
+    uvicorn.run(panel.app, host="127.0.0.1", port=port, log_level="warning")
+
+
+async def _wait_ready(base_url):
+    async with httpx.AsyncClient() as client:
+        for _ in range(100):
+            try:
+                await client.get(base_url + "/api/status")
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(0.1)
+    raise RuntimeError("panel sunucusu baslamadi")
+
+
+async def _load(url, seconds, concurrency, accept_encoding):
+    headers = {"Accept-Encoding": accept_encoding}
+    done = 0
+    size = 0
+    encoding = None
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=30.0) as client:
+        # Isinma (yeni yolda ilk istek byte'lari uretir)
+        r = await client.get(url, headers=headers)
+        r.raise_for_status()
+        encoding = r.headers.get("content-encoding", "identity")
+        size = len(r.content) if encoding == "identity" else int(r.headers["content-length"])
+        deadline = time.perf_counter() + seconds
+
+        async def worker():
+            nonlocal done
+            while time.perf_counter() < deadline:
+                r = await client.get(url, headers=headers)
+                r.raise_for_status()
+                done += 1
+
+        t0 = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - t0
+    return done / elapsed, size, encoding
+
+
+async def _run(base_url, seconds, concurrency):
+    await _wait_ready(base_url)
+    cases = [
+        ("eski (dict -> FastAPI)", "/bench/legacy", "identity"),
+        ("yeni (hazir byte'lar)", "/api/withdrawals", "identity"),
+        ("yeni + gzip", "/api/withdrawals", "gzip"),
+        ("yeni + br", "/api/withdrawals", "br, gzip"),
+    ]
+    results = []
+    for label, path, accept in cases:
+        rps, size, encoding = await _load(base_url + path, seconds, concurrency, accept)
+        if accept.startswith("br") and encoding != "br":
+            print(f"{label:<24}: atlandi (brotli kurulu degil)", flush=True)
+            continue
+        results.append(rps)
+        print(f"{label:<24}: {rps:8.0f} istek/s  ({size / 1024:.0f} KB, {encoding})  "
+              f"{rps / results[0]:.1f}x", flush=True)
+
+
+def main(n, seconds, concurrency):
+    port = _free_port()
+    server = multiprocessing.Process(target=_serve, args=(port, n), daemon=True)
+    server.start()
+    try:
+        print(f"{n} cekim x {len(STATUSES)} durum, {concurrency} eszamanli istemci, "
+              f"test basina {seconds}s", flush=True)
+        asyncio.run(_run(f"http://127.0.0.1:{port}", seconds, concurrency))
+    finally:
+        server.terminate()
+        server.join(5)
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 1000,
+        float(sys.argv[2]) if len(sys.argv) > 2 else 5.0,
+        int(sys.argv[3]) if len(sys.argv) > 3 else 16,
+    )
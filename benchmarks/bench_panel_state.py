@@ -0,0 +1,117 @@
+"""
+Panel durumu yazma benchmark'i.
+===============================
+Durum basina N cekimlik listelerle eski update_panel yazimini (her turda
+bot_data.json oku + indent=2 ile tamamen yeniden yaz) PanelStateStore
+(bellek + journal satiri + periyodik atomik snapshot) ile karsilastirir.
+Her turda beklemede listesine 2 yeni cekim gelir, 2'si kalkar; diger
+durumlar degismez (ScanDiff'e gore dokunulmaz). Sonda snapshot + journal
+yeniden oynatilip bellekteki durumla ayni oldugu kontrol edilir.
+
+Kullanim:
+    python -m benchmarks.bench_panel_state [durum_basina_cekim] [tur_sayisi]
+"""
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from bot.state_store import PanelStateStore
+
+STATUSES = ("beklemede", "reserve", "islemde")
+
+
+def _item(i, status):
+    return {
+        "id": str(900000 + i),
+        "type": "Para Çekme",
+        "player_id": str(50000 + i),
+        "username": f"user{i}",
+        "full_name": f"Test Oyuncu {i}",
+        "amount": 1000.0 + i,
+        "currency": "TRY",
+        "payment_method": "Papara",
+        "note": "",
+        "status": status,
+        "created_at": "2026-10-18T12:00:00+03:00",
+    }
+
+
+def _initial(n):
+    state = {"bot_status": "calisiyor", "scan_count": 0}
+    for s, key in enumerate(STATUSES):
+        items = [_item(s * 1_000_000 + i, key) for i in range(n)]
+        state[f"{key}_items"] = items
+        state[f"{key}_count"] = n
+        state[f"{key}_total"] = sum(x["amount"] for x in items)
+    return state
+
+
+def _cycle_changes(state, cycle, n):
+    """Bir turun degisiklikleri: beklemede'de 2 yeni, 2 kalkan."""
+    items = state["beklemede_items"][2:] + [_item(5_000_000 + cycle * 2 + j, "beklemede") for j in range(2)]
+    return {
+        "bot_status": "calisiyor",
+        "last_scan": f"2026-10-18T12:{cycle % 60:02d}:00+03:00",
+        "scan_count": state.get("scan_count", 0) + 1,
+        "beklemede_count": n,
+        "beklemede_total": sum(x["amount"] for x in items),
+        "beklemede_items": items,
+        "pending_items": items,
+        "last_delta": {"cycle": cycle, "added": 2, "removed": 2, "changed": 0, "transitioned": 0},
+    }
+
+
+def _legacy(path, n, cycles):
+    state = _initial(n)
+    path.write_text(json.dumps(state, ensure_ascii=False, indent=2), encoding="utf-8")
+    t0 = time.perf_counter()
+    for cycle in range(1, cycles + 1):
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        data.update(_cycle_changes(data, cycle, n))
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2, default=str)
+    return time.perf_counter() - t0
+
+
+def _store(path, n, cycles, compact_every):
+    store = PanelStateStore(path, compact_every=compact_every)
+    store.load()
+    store.commit(_initial(n))
+    store.compact()
+    t0 = time.perf_counter()
+    for cycle in range(1, cycles + 1):
+        store.commit(_cycle_changes(store.state, cycle, n))
+    elapsed = time.perf_counter() - t0
+    journal_kb = store.journal_file.stat().st_size / 1024
+    # pending_items ayni liste nesnesi -> replay sonrasi esit olmali
+    expected = json.loads(json.dumps(store.state, default=str))
+
+    # Journal her satirda flush edilir: kapatmadan (kill -9 gibi) yeniden oku
+    t0 = time.perf_counter()
+    replayed = PanelStateStore(path).load()
+    load_s = time.perf_counter() - t0
+    assert replayed == expected, "replay sonucu bellekteki durumla ayni degil!"
+    store.close()
+    return elapsed, journal_kb, load_s
+
+
+def main(n, cycles):
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_s = _legacy(Path(tmp) / "legacy.json", n, cycles)
+        store_s, journal_kb, load_s = _store(Path(tmp) / "bot_data.json", n, cycles, compact_every=100)
+
+    print(f"{n} cekim x {len(STATUSES)} durum, {cycles} tur", flush=True)
+    print(f"eski (oku + indent=2 yaz)  : {legacy_s / cycles * 1000:8.2f}ms/tur", flush=True)
+    print(f"yeni (journal + snapshot)  : {store_s / cycles * 1000:8.2f}ms/tur  "
+          f"({legacy_s / store_s:.0f}x)", flush=True)
+    print(f"acilista snapshot + journal: {load_s * 1000:8.2f}ms (journal {journal_kb:.0f} KB)", flush=True)
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 1000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 250,
+    )
@@ -0,0 +1,149 @@
+"""
+Kaynak engelleme (BOT_BLOCK_RESOURCES) olcumu.
+==============================================
+Ayni sayfayi engellemesiz ve engellemeli (CronosBrowser.enable_resource_blocking)
+yeni sekmelerde yukler; her yuklemede Network.loadingFinished
+encodedDataLength toplamini (gercek aktarilan bayt), istek sayisini ve
+go_to suresini olcer. Tarayici cache'i kapalidir, her yukleme soguktur.
+Panelin kendi sayacindaki "bytes_saved_est" tahmindir; bu script olculmus
+farki verir.
+
+Varsayilan hedef: lokal fixture (N gorsel + font + kucuk bir script/XHR).
+Gercek panel icin oturum acik bir profil ve URL verilebilir.
+
+Kullanim:
+    python -m benchmarks.bench_resource_blocking [tekrar] [url] [profil_klasoru]
+"""
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from bot.browser import CronosBrowser
+
+IMAGES = 40
+IMAGE_BYTES = 25_000
+FONTS = 3
+FONT_BYTES = 50_000
+
+
+def _page():
+    images = "".join(f'<img src="/img/{i}.png" width="40" height="40">' for i in range(IMAGES))
+    fonts = "".join(
+        f"@font-face {{font-family: f{i}; src: url(/font/{i}.woff2);}} .f{i} {{font-family: f{i};}}"
+        for i in range(FONTS)
+    )
+    spans = "".join(f'<span class="f{i}">Cekim</span>' for i in range(FONTS))
+    return (
+        f"<html><head><style>{fonts}</style><script src=\"/app.js\"></script></head>"
+        f"<body>{spans}{images}</body></html>"
+    ).encode()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        path = self.path.split("?")[0]
+        if path == "/":
+            body, ctype = _page(), "text/html"
+        elif path == "/app.js":
+            body, ctype = b"fetch('/_api/ping').then(function(r){return r.text();});", "application/javascript"
+        elif path == "/_api/ping":
+            body, ctype = b'{"ok":true}', "application/json"
+        elif path.startswith("/img/"):
+            body, ctype = os.urandom(IMAGE_BYTES), "image/png"
+        elif path.startswith("/font/"):
+            body, ctype = os.urandom(FONT_BYTES), "font/woff2"
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _start_fixture():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/"
+
+
+async def _load(browser, url, blocking):
+    """Yeni sekmede bir soguk yukleme. Doner: (ms, bayt, istek sayisi)."""
+    tab = await browser._browser.new_tab("about:blank")
+    stats = {"bytes": 0, "requests": 0}
+
+    async def on_finished(event):
+        stats["bytes"] += event.get("params", {}).get("encodedDataLength") or 0
+        stats["requests"] += 1
+
+    try:
+        if blocking:
+            await browser.enable_resource_blocking(tab)
+        await tab.enable_network_events()
+        await tab._execute_command({"method": "Network.setCacheDisabled", "params": {"cacheDisabled": True}})
+        await tab.on("Network.loadingFinished", on_finished)
+        t0 = time.perf_counter()
+        await tab.go_to(url)
+        elapsed = (time.perf_counter() - t0) * 1000
+        # Gec biten XHR'lar da sayilsin
+        await asyncio.sleep(0.5)
+    finally:
+        await browser._close_tab(tab)
+    return elapsed, stats["bytes"], stats["requests"]
+
+
+async def main(runs, url, profile_dir):
+    server = None
+    if url is None:
+        server, url = _start_fixture()
+    with tempfile.TemporaryDirectory() as tmp:
+        browser = CronosBrowser(
+            profile_dir=profile_dir or os.path.join(tmp, "profile"),
+            session_file=os.path.join(tmp, "session.json"),
+            name="bench",
+        )
+        await browser.start(headless=True)
+        try:
+            # Isinma (DNS, baglanti, Chrome ic cache'leri)
+            await _load(browser, url, False)
+            results = {False: [], True: []}
+            for _ in range(runs):
+                for blocking in (False, True):
+                    results[blocking].append(await _load(browser, url, blocking))
+        finally:
+            await browser.close()
+    if server is not None:
+        server.shutdown()
+
+    print(f"{url} - mod basina {runs} soguk yukleme", flush=True)
+    base_ms = statistics.median(r[0] for r in results[False])
+    base_kb = statistics.mean(r[1] for r in results[False]) / 1024
+    for blocking, label in ((False, "engellemesiz"), (True, "engellemeli")):
+        ms = statistics.median(r[0] for r in results[blocking])
+        kb = statistics.mean(r[1] for r in results[blocking]) / 1024
+        requests = statistics.mean(r[2] for r in results[blocking])
+        print(
+            f"{label:<13}: yukleme p50 {ms:7.0f}ms ({ms / base_ms * 100:3.0f}%)  "
+            f"aktarilan {kb:8.0f} KB ({kb / base_kb * 100:3.0f}%)  {requests:5.0f} istek",
+            flush=True,
+        )
+    stats = browser.get_block_stats()
+    print(f"engellenen: {stats['blocked']} (panel tahmini ~{stats['bytes_saved_est'] / 1024:.0f} KB)", flush=True)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 5,
+        sys.argv[2] if len(sys.argv) > 2 else None,
+        sys.argv[3] if len(sys.argv) > 3 else None,
+    ))
@@ -0,0 +1,98 @@
+"""
+Playwright scraper mikro-benchmark'i.
+====================================
+Birkac bin satirlik statik HTML fixture uzerinde eski satir-satir okuma
+(satir basina ~9 IPC) ile tek evaluate_all cagrisini karsilastirir.
+
+Gereksinim: pip install playwright && playwright install chromium
+
+Kullanim:
+    python -m benchmarks.bench_scraper [satir_sayisi]
+"""
+import asyncio
+import re
+import sys
+import time
+from decimal import Decimal
+
+from playwright.async_api import async_playwright
+
+from bot.scraper import PENDING_ROW_SELECTOR, get_pending_withdrawals
+
+
+def build_fixture(n_rows):
+    """Panel tablosuna benzeyen statik HTML (her 10 satirdan biri Para Yatirma)."""
+    rows = []
+    for i in range(n_rows):
+        kind = "Para Yatırma" if i % 10 == 0 else "Para Çekme"
+        cells = [
+            f'<td><a href="/financial/{i}">{900000 + i}</a></td>',
+            f"<td>{kind}</td>",
+            f"<td>{50000 + i}</td>",
+            f'<td><a href="/customer-detail/{50000 + i}">user{i}</a></td>',
+            f"<td>Test Oyuncu{i}</td>",
+            f"<td>{1000 + i}.50 TRY</td>",
+            "<td></td>",
+            "<td>Papara</td>",
+            "<td></td>",
+            "<td><span>Beklemede</span></td>",
+            "<td></td>",
+            "<td>18.10.2026 12:00</td>",
+            '<td><a class="button i-green">Kabul et</a><a class="button i-red">Reddet</a></td>',
+        ]
+        rows.append("<tr>" + "".join(cells) + "</tr>")
+    return "<html><body><table><tbody>" + "".join(rows) + "</tbody></table></body></html>"
+
+
+async def legacy_get_pending_withdrawals(page):
+    """Eski uygulama: her satir icin ayri text_content/count cagrilari."""
+    result = []
+    rows = page.locator(PENDING_ROW_SELECTOR)
+    n = await rows.count()
+    for i in range(n):
+        row = rows.nth(i)
+        row_text = (await row.text_content()) or ""
+        if "Para Çekme" not in row_text:
+            continue
+        id_el = row.locator("td:nth-child(1) > a")
+        oyuncu_el = row.locator("td:nth-child(4) > a")
+        tutar_el = row.locator("td:nth-child(6)")
+        tarih_el = row.locator("td:nth-child(12)")
+        cekim_id = (await id_el.text_content() or "").strip() if await id_el.count() else ""
+        oyuncu = (await oyuncu_el.text_content() or "").strip() if await oyuncu_el.count() else ""
+        tutar_raw = (await tutar_el.text_content() or "").strip() if await tutar_el.count() else ""
+        tarih = (await tarih_el.text_content() or "").strip() if await tarih_el.count() else ""
+        tutar_val = tutar_raw
+        num_str = re.sub(r"[^\d,.\-]", "", tutar_raw).replace(",", ".")
+        if num_str:
+            try:
+                tutar_val = Decimal(num_str)
+            except Exception:
+                pass
+        result.append({"id": cekim_id, "oyuncu": oyuncu, "tutar": tutar_val, "tarih": tarih})
+    return result
+
+
+async def main(n_rows):
+    async with async_playwright() as p:
+        browser = await p.chromium.launch()
+        page = await browser.new_page()
+        await page.set_content(build_fixture(n_rows))
+
+        t0 = time.perf_counter()
+        new = await get_pending_withdrawals(page)
+        new_s = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        old = await legacy_get_pending_withdrawals(page)
+        old_s = time.perf_counter() - t0
+
+        assert old == new, "eski ve yeni sonuc farkli!"
+        print(f"{n_rows} satir, {len(new)} cekim", flush=True)
+        print(f"eski (satir basina IPC) : {old_s * 1000:8.0f}ms", flush=True)
+        print(f"yeni (evaluate_all)     : {new_s * 1000:8.0f}ms  ({old_s / new_s:.0f}x)", flush=True)
+        await browser.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 3000))
@@ -0,0 +1,120 @@
+"""
+Lokal sahte Cronos _api sunucusu (benchmark ve manuel deneme icin).
+====================================================================
+Gercek panele dokunmadan CronosAPI'yi calistirmak icin kullanilir.
+
+    from benchmarks.fake_cronos import start_fake_server
+    server, base_url = start_fake_server(items_per_status=1000)
+    api = CronosAPI("token", {}, base_url=base_url)
+
+Ortam degiskenleri ile davranis ayarlanabilir:
+    FAKE_LATENCY_MS  - her istege eklenen gecikme (varsayilan 0)
+    FAKE_FAIL_RATE   - approve/reject isteklerinin 500 donme orani (0-1)
+"""
+import asyncio
+import os
+import random
+import socket
+import threading
+import time
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+LATENCY_MS = float(os.environ.get("FAKE_LATENCY_MS", "0"))
+FAIL_RATE = float(os.environ.get("FAKE_FAIL_RATE", "0"))
+
+
+def make_items(status, count):
+    """Panelin _api yanitina benzeyen sahte islem listesi."""
+    base = 1_000_000 + status * 100_000
+    return [
+        {
+            "id": base + i,
+            "type": 2,
+            "status": status,
+            "amount": round(100 + (i * 37) % 5000 + 0.5, 2),
+            "customer": {"id": 50_000 + i, "username": f"user{i}", "name": "Test", "surname": f"Oyuncu{i}"},
+            "payment_method": {"name": "Withdraw - Papara"},
+            "note": "",
+            "manager_note": "",
+            "created_at": "2026-10-18T12:00:00+03:00",
+            "updated_at": "2026-10-18T12:00:00+03:00",
+        }
+        for i in range(count)
+    ]
+
+
+def create_app(items_per_status=100, latency_ms=None, fail_rate=None):
+    latency_ms = LATENCY_MS if latency_ms is None else latency_ms
+    fail_rate = FAIL_RATE if fail_rate is None else fail_rate
+    app = FastAPI()
+    data = {s: make_items(s, items_per_status) for s in (0, 1, 2, 3, 4)}
+    app.state.decisions = []
+
+    async def _delay():
+        if latency_ms:
+            await asyncio.sleep(latency_ms / 1000)
+
+    @app.get("/_api/financial/transactions")
+    async def transactions(status: int = 0, page: int = 1, per_page: int = 50):
+        await _delay()
+        rows = data.get(status, [])
+        start = (page - 1) * per_page
+        return {"data": rows[start:start + per_page], "total": len(rows), "page": page, "per_page": per_page}
+
+    async def _decide(request: Request, action: str):
+        await _delay()
+        body = await request.json()
+        if fail_rate and random.random() < fail_rate:
+            return JSONResponse({"error": "random failure"}, status_code=500)
+        if request.headers.get("authorization", "") != "Bearer test-token":
+            return JSONResponse({"error": "unauthorized"}, status_code=401)
+        app.state.decisions.append((action, body.get("id"), time.monotonic()))
+        return {"ok": True, "id": body.get("id"), "action": action}
+
+    @app.post("/_api/financial/withdrawal/approve")
+    async def approve(request: Request):
+        return await _decide(request, "approve")
+
+    @app.post("/_api/financial/withdrawal/reject")
+    async def reject(request: Request):
+        return await _decide(request, "reject")
+
+    return app
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_fake_server(items_per_status=100, port=None, **app_kwargs):
+    """
+    Sunucuyu arka plan thread'inde baslat. Doner: (server, base_url).
+    app_kwargs create_app'e gecer (latency_ms, fail_rate).
+    Alinan kararlar server.config.app.state.decisions listesinde tutulur.
+    """
+    import uvicorn
+
+    port = port or _free_port()
+    app = create_app(items_per_status, **app_kwargs)
+    config = uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning")
+    server = uvicorn.Server(config)
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 10
+    while not server.started and time.monotonic() < deadline:
+        time.sleep(0.05)
+    return server, f"http://127.0.0.1:{port}/_api"
+
+
+if __name__ == "__main__":
+    srv, url = start_fake_server(items_per_status=int(os.environ.get("FAKE_ITEMS", "100")))
+    print(f"Sahte Cronos _api: {url} (Ctrl+C ile durdur)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        srv.should_exit = True
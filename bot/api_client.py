@@ -1,17 +1,173 @@
 """
 Cronos panel API client.
 Bearer token + cookies ile _api endpoint'lerine istek atar.
+
+Hybrid modda (BOT_MODE=hybrid) token/cookie'ler Chrome'dan alinir,
+periyodik tarama Chrome yerine bu client ile yapilir.
 """
+import asyncio
+import time
+
 import httpx
 
-BASE_API_URL = "https://cronos.redlanegaming.com/_api"
+try:
+    import h2  # noqa: F401  (httpx HTTP/2 destegi icin gerekli)
+except ImportError:
+    h2 = None
+
+try:
+    import ijson  # opsiyonel: buyuk yanitlari parca parca parse etmek icin
+except ImportError:
+    ijson = None
+
+from config.settings import (
+    CRONOS_BASE_URL, CRONOS_API_TRANSACTIONS_PATH,
+    CRONOS_API_HTTP2, CRONOS_API_MAX_CONNECTIONS, CRONOS_API_MAX_KEEPALIVE, CRONOS_API_TIMEOUT,
+    CRONOS_BULK_CONCURRENCY, CRONOS_BULK_RATE,
+)
+from bot.transactions import (
+    _to_int, calc_total, dedupe_by_id, extract_items, first_of, normalize_withdrawals, select_statuses,
+)
+
+BASE_API_URL = f"{CRONOS_BASE_URL}/_api"
+
+# Token gecersiz/expired oldugunda panelin dondugu kodlar
+AUTH_ERROR_CODES = (401, 403, 419)
+
+# Stream modunda yanittan okunan sayfalama alanlari (ijson yolu -> meta anahtari).
+# Toplam: extract_items'in baktigi alanlar; cursor / next_page_url: normal yol ile ayni.
+_META_FIELDS = {
+    "total": "total",
+    "meta.total": "total",
+    "pagination.total": "total",
+    "recordsTotal": "total",
+    "next_cursor": "next_cursor",
+    "meta.next_cursor": "next_cursor",
+    "next_page_url": "next_page_url",
+}
+
+
+def _meta_prefixes(items_prefix):
+    """Sayfalama alanlarinin ijson yollari: kok + listeyi tutan nesne ("data.data.item" -> "data.total")."""
+    container = ".".join(items_prefix.split(".")[:-2])
+    prefixes = dict(_META_FIELDS)
+    if container:
+        prefixes.update({f"{container}.{path}": key for path, key in _META_FIELDS.items()})
+    return prefixes
+
+
+def _last_page(count, per_page, seen, total):
+    """Sayfalama bitti mi? Toplam biliniyorsa ona gore, yoksa kisa sayfa kurali."""
+    if not count:
+        return True
+    if total is not None:
+        return seen >= total
+    return count < per_page
+
+
+class TokenBucket:
+    """
+    Token bucket rate limiter: saniyede `rate` istek, en fazla `burst` birikim.
+    acquire() token yoksa bir sonraki token'a kadar bekler.
+    """
+
+    def __init__(self, rate: float, burst: int | None = None):
+        self.rate = float(rate)
+        self.capacity = float(burst if burst is not None else max(1, int(rate)))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        if self.rate <= 0:
+            return
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
 
 
 class CronosAPI:
-    def __init__(self, bearer_token: str, cookies: dict | list):
+    """
+    Uzun omurlu, connection pool'lu httpx client ile calisir.
+    Tum istekler ayni keep-alive baglantilarini kullanir; her cagri icin
+    yeni TCP+TLS el sikismasi yapilmaz.
+
+        async with CronosAPI(token, cookies) as api:
+            await api.get_withdrawals(0)
+
+    Context manager kullanilmazsa is bitince aclose() cagrilmali.
+    """
+
+    def __init__(
+        self,
+        bearer_token: str,
+        cookies: dict | list,
+        user_agent: str | None = None,
+        base_url: str | None = None,
+        http2: bool | None = None,
+        max_connections: int | None = None,
+        max_keepalive: int | None = None,
+        timeout: float | None = None,
+    ):
         self.token = bearer_token
         self.cookies = self._normalize_cookies(cookies)
-        self.base_url = BASE_API_URL
+        self.user_agent = user_agent
+        self.base_url = base_url or BASE_API_URL
+        self.auth_time = time.monotonic()
+
+        self.http2 = CRONOS_API_HTTP2 if http2 is None else http2
+        if self.http2 and h2 is None:
+            print("[!] HTTP/2 icin 'h2' paketi yok (pip install httpx[http2]), HTTP/1.1 kullaniliyor", flush=True)
+            self.http2 = False
+        self.limits = httpx.Limits(
+            max_connections=max_connections or CRONOS_API_MAX_CONNECTIONS,
+            max_keepalive_connections=max_keepalive or CRONOS_API_MAX_KEEPALIVE,
+            keepalive_expiry=60.0,
+        )
+        self.timeout = httpx.Timeout(timeout or CRONOS_API_TIMEOUT, connect=10.0)
+        self._client = None
+
+    async def __aenter__(self):
+        self._get_client()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Paylasilan client'i dondur (kapaliysa yeniden olustur)."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=self.timeout,
+                limits=self.limits,
+                http2=self.http2,
+                cookies=self.cookies,
+            )
+        return self._client
+
+    async def aclose(self):
+        """Connection pool'u kapat."""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+
+    def update_auth(self, bearer_token: str, cookies: dict | list, user_agent: str | None = None):
+        """Tarayicidan gelen yeni token/cookie'leri uygula (pool korunur)."""
+        self.token = bearer_token
+        self.cookies = self._normalize_cookies(cookies)
+        if user_agent:
+            self.user_agent = user_agent
+        if self._client is not None:
+            self._client.cookies.clear()
+            self._client.cookies.update(self.cookies)
+        self.auth_time = time.monotonic()
 
     @staticmethod
     def _normalize_cookies(cookies) -> dict:
@@ -26,6 +182,7 @@ class CronosAPI:
             "Authorization": f"Bearer {self.token}",
             "Content-Type": "application/json",
             "Accept": "application/json",
+            **({"User-Agent": self.user_agent} if self.user_agent else {}),
         }
 
     async def get_pending_withdrawals(self) -> list:
@@ -33,43 +190,270 @@ class CronosAPI:
         type=2 (çekim), status=1 (beklemede) ile bekleyen çekimleri döner.
         Bearer token + cookies ile istek atar, JSON parse eder.
         """
-        async with httpx.AsyncClient(base_url=self.base_url, timeout=30.0) as client:
-            # Yaygın desen: /financial/transactions veya /withdrawals
-            r = await client.get(
-                "/financial/transactions",
-                params={"type": 2, "status": 1},
-                headers=self._headers(),
-                cookies=self.cookies,
-            )
+        client = self._get_client()
+        # Yaygın desen: /financial/transactions veya /withdrawals
+        r = await client.get(
+            "/financial/transactions",
+            params={"type": 2, "status": 1},
+            headers=self._headers(),
+        )
+        r.raise_for_status()
+        data = r.json()
+        if isinstance(data, list):
+            return data
+        if isinstance(data, dict):
+            return data.get("data", data.get("items", data.get("list", [])))
+        return []
+
+    async def get_withdrawals(self, status: int, page: int = 1, per_page: int = 500) -> tuple[list, int | None]:
+        """
+        Tek durum + tek sayfa cekim listesi (panelin filtreleriyle ayni:
+        type=2 cekim, bonus=2 hayir). Doner: (ham liste, toplam sayi | None)
+        """
+        client = self._get_client()
+        r = await client.get(
+            CRONOS_API_TRANSACTIONS_PATH,
+            params={"type": 2, "bonus": 2, "status": status, "page": page, "per_page": per_page},
+            headers=self._headers(),
+        )
+        r.raise_for_status()
+        return extract_items(r.json())
+
+    async def iter_transactions(
+        self,
+        status: int | None = None,
+        tx_type: int = 2,
+        per_page: int = 200,
+        start_page: int = 1,
+        max_pages: int | None = None,
+        params: dict | None = None,
+        stream: bool = False,
+        items_prefix: str = "data.item",
+    ):
+        """
+        Islemleri sayfa sayfa gezip tek tek yield eden async generator.
+        Bellekte ayni anda en fazla bir sayfa tutulur; gunluk onaylanan/
+        reddedilen gibi buyuk gecmis pencereleri taramak icin.
+
+            async for tx in api.iter_transactions(status=1, params={"start_date": "2026-10-17"}):
+                ...
+
+        - Yanitta cursor varsa (next_cursor / meta.next_cursor) onunla,
+          yoksa page/per_page ile ilerler (stream modunda da).
+        - stream=True ve ijson kuruluysa govde indirilirken parse edilir
+          (items_prefix: ijson yolu, orn. "data.item").
+        - Yanitta toplam (total) varsa seen >= total olana veya bos sayfa
+          gelene kadar devam edilir: per_page'i kendi sinirina indiren sunucu
+          (200 istenip 100 donmesi) ilk sayfada kesilmez. Toplam yoksa
+          per_page'den az kayit donen sayfa son sayfa sayilir.
+        """
+        if stream and ijson is None:
+            print("[!] ijson yuklu degil, stream=False ile devam ediliyor", flush=True)
+            stream = False
+
+        client = self._get_client()
+        page = start_page
+        cursor = None
+        fetched_pages = 0
+        seen = 0
+
+        while max_pages is None or fetched_pages < max_pages:
+            query = {"type": tx_type, "per_page": per_page, **(params or {})}
+            if status is not None:
+                query["status"] = status
+            if cursor is not None:
+                query["cursor"] = cursor
+            else:
+                query["page"] = page
+
+            if stream:
+                count = 0
+                meta = {}
+                async for item in self._stream_items(client, query, items_prefix, meta):
+                    count += 1
+                    yield item
+                total = meta.get("total")
+                next_cursor = meta.get("next_cursor")
+                no_next_url = "next_page_url" in meta and not meta["next_page_url"]
+            else:
+                r = await client.get(CRONOS_API_TRANSACTIONS_PATH, params=query, headers=self._headers())
+                r.raise_for_status()
+                payload = r.json()
+                items, total = extract_items(payload)
+                count = len(items)
+                for item in items:
+                    yield item
+                is_dict = isinstance(payload, dict)
+                next_cursor = first_of(payload, "next_cursor", "meta.next_cursor") if is_dict else None
+                no_next_url = is_dict and "next_page_url" in payload and not payload["next_page_url"]
+
+            fetched_pages += 1
+            seen += count
+            if next_cursor:
+                if next_cursor == cursor:
+                    # Sunucu ayni cursor'i donduruyor: sonsuz donguye girme
+                    return
+                cursor = next_cursor
+                continue
+            if _last_page(count, per_page, seen, total) or no_next_url:
+                return
+            page += 1
+
+    async def _stream_items(self, client, query, items_prefix, meta=None):
+        """
+        Yaniti indirirken ijson ile parse et, elemanlari tek tek yield et.
+        meta verilirse sayfalama alanlari (total, next_cursor, next_page_url)
+        ayni akistan okunup meta'ya yazilir.
+        """
+        events = ijson.sendable_list()
+        parser = ijson.items_coro(events, items_prefix, use_float=True)
+        tokens = scanner = None
+        if meta is not None:
+            meta_prefixes = _meta_prefixes(items_prefix)
+            tokens = ijson.sendable_list()
+            scanner = ijson.parse_coro(tokens)
+
+        def scan_total():
+            for prefix, event, value in tokens:
+                key = meta_prefixes.get(prefix)
+                if key is None or event not in ("number", "string", "null"):
+                    continue
+                if key == "total":
+                    meta.setdefault("total", _to_int(value))
+                else:
+                    meta.setdefault(key, value)
+            del tokens[:]
+
+        async with client.stream(
+            "GET", CRONOS_API_TRANSACTIONS_PATH, params=query, headers=self._headers()
+        ) as r:
             r.raise_for_status()
-            data = r.json()
-            if isinstance(data, list):
-                return data
-            if isinstance(data, dict):
-                return data.get("data", data.get("items", data.get("list", [])))
-            return []
+            async for chunk in r.aiter_bytes():
+                parser.send(chunk)
+                if scanner is not None:
+                    scanner.send(chunk)
+                    scan_total()
+                for item in events:
+                    yield item
+                del events[:]
+        parser.close()
+        if scanner is not None:
+            scanner.close()
+            scan_total()
+        for item in events:
+            yield item
+
+    async def scan_all_statuses(
+        self, per_page: int = 500, max_pages: int = 20, statuses: list | None = None
+    ) -> dict:
+        """
+        Browser.scan_all_statuses ile ayni formatta sonuc dondur:
+        { "beklemede": [...], "beklemede_total_count": N, ... }
+        statuses verilirse sadece o durum anahtarlari taranir.
+        Yetki hatasinda httpx.HTTPStatusError firlatir (cagiran token yeniler).
+        """
+        result = {}
+        timing = {}
+        t_all = time.perf_counter()
+        for status, key, label in select_statuses(statuses):
+            t0 = time.perf_counter()
+            raw, total = await self.get_withdrawals(status, page=1, per_page=per_page)
+            raw = list(raw)
+            page = 1
+            while total is not None and len(raw) < total and page < max_pages:
+                page += 1
+                more, _ = await self.get_withdrawals(status, page=page, per_page=per_page)
+                if not more:
+                    break
+                raw.extend(more)
+
+            items = dedupe_by_id(normalize_withdrawals(raw))
+            result[key] = items
+            result[f"{key}_total_count"] = total if total is not None else len(items)
+            timing[key] = {"http_ms": (time.perf_counter() - t0) * 1000, "pages": page}
+            print(
+                f"  [{label}] {result[f'{key}_total_count']} cekim, "
+                f"{calc_total(items):,.0f} TRY (API)",
+                flush=True,
+            )
+
+        timing["total_ms"] = (time.perf_counter() - t_all) * 1000
+        result["timing"] = timing
+        return result
+
+    async def _post_decision(self, action: str, withdrawal_id: str | int, reason: str = "") -> httpx.Response:
+        """Onay/red POST'u. Ham yaniti dondurur (gercek status kodu icin)."""
+        if action == "approve":
+            # Örnek: POST /financial/withdrawal/approve veya /withdrawals/{id}/approve
+            path, body = "/financial/withdrawal/approve", {"id": withdrawal_id}
+        elif action == "reject":
+            path, body = "/financial/withdrawal/reject", {"id": withdrawal_id, "reason": reason}
+        else:
+            raise ValueError(f"bilinmeyen islem: {action!r}")
+        r = await self._get_client().post(path, json=body, headers=self._headers())
+        r.raise_for_status()
+        return r
 
     async def approve_withdrawal(self, withdrawal_id: str | int) -> dict:
         """Onay endpoint'ine POST atar."""
-        async with httpx.AsyncClient(base_url=self.base_url, timeout=30.0) as client:
-            # Örnek: POST /financial/withdrawal/approve veya /withdrawals/{id}/approve
-            r = await client.post(
-                "/financial/withdrawal/approve",
-                json={"id": withdrawal_id},
-                headers=self._headers(),
-                cookies=self.cookies,
-            )
-            r.raise_for_status()
-            return r.json() if r.content else {}
+        r = await self._post_decision("approve", withdrawal_id)
+        return r.json() if r.content else {}
 
     async def reject_withdrawal(self, withdrawal_id: str | int, reason: str) -> dict:
         """Red endpoint'ine POST atar (sebep ile)."""
-        async with httpx.AsyncClient(base_url=self.base_url, timeout=30.0) as client:
-            r = await client.post(
-                "/financial/withdrawal/reject",
-                json={"id": withdrawal_id, "reason": reason},
-                headers=self._headers(),
-                cookies=self.cookies,
-            )
-            r.raise_for_status()
-            return r.json() if r.content else {}
+        r = await self._post_decision("reject", withdrawal_id, reason)
+        return r.json() if r.content else {}
+
+    async def decide_many(
+        self,
+        decisions: list[dict],
+        concurrency: int | None = None,
+        rate: float | None = None,
+        burst: int | None = None,
+    ) -> list[dict]:
+        """
+        Toplu onay/red. decisions: [{"id": ..., "action": "approve"|"reject", "reason": ...}]
+        En fazla `concurrency` istek ayni anda, saniyede en fazla `rate` istek
+        (rate=0 -> limitsiz) gonderilir. Bir kaydin hatasi digerlerini durdurmaz.
+
+        Doner (ayni sirada):
+            [{"id", "action", "ok", "status_code", "latency_ms", "error", "response"}, ...]
+        """
+        semaphore = asyncio.Semaphore(concurrency or CRONOS_BULK_CONCURRENCY)
+        bucket = TokenBucket(CRONOS_BULK_RATE if rate is None else rate, burst)
+
+        async def run_one(decision):
+            wid = decision.get("id")
+            action = decision.get("action", "")
+            result = {
+                "id": wid,
+                "action": action,
+                "ok": False,
+                "status_code": None,
+                "latency_ms": None,
+                "error": None,
+                "response": None,
+            }
+            async with semaphore:
+                await bucket.acquire()
+                t0 = time.perf_counter()
+                r = None
+                try:
+                    r = await self._post_decision(action, wid, decision.get("reason", ""))
+                    # 2xx = islem yapildi; govde okunamasa da tekrar gonderilmemeli
+                    result["status_code"] = r.status_code
+                    result["ok"] = True
+                except httpx.HTTPStatusError as e:
+                    result["status_code"] = e.response.status_code
+                    result["error"] = f"HTTP {e.response.status_code}"
+                except Exception as e:
+                    result["error"] = f"{type(e).__name__}: {e}"
+                if r is not None:
+                    try:
+                        result["response"] = r.json() if r.content else {}
+                    except ValueError:
+                        result["response"] = {"raw": r.text[:500]}
+                result["latency_ms"] = (time.perf_counter() - t0) * 1000
+            return result
+
+        return await asyncio.gather(*(run_one(d) for d in decisions))
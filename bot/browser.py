@@ -13,20 +13,169 @@ sonra cekim sayfasinda INSAN GIBI:
 API KULLANMAZ - panelde ne goruyorsaniz aynen onu ceker.
 """
 import asyncio
+import base64
+import hashlib
 import json
 import os
+import time
+from collections import deque
 from pathlib import Path
+from urllib.parse import parse_qsl, urlparse
 
 from pydoll.browser.chromium import Chrome
 from pydoll.browser.options import ChromiumOptions
 from pydoll.commands.runtime_commands import RuntimeCommands
 
-from config.settings import CRONOS_BASE_URL, CRONOS_USERNAME, CRONOS_PASSWORD, CRONOS_2FA_SECRET
+from config.settings import (
+    CRONOS_BASE_URL, CRONOS_USERNAME, CRONOS_PASSWORD, CRONOS_2FA_SECRET,
+    BOT_FILTER_WAIT, BOT_FILTER_TIMEOUT, BOT_SCAN_ENGINE, BOT_DATA_SOURCE,
+    BOT_PAGE_SIZE, BOT_MAX_PAGES, BOT_CAPTURE_MATCH, BOT_MULTI_TAB,
+    BOT_BLOCK_RESOURCES, BOT_BLOCK_TYPES, BOT_BLOCK_URLS, BOT_BLOCK_ALLOW,
+    BOT_MEMORY_CHECK_EVERY, BOT_MAX_JS_HEAP_MB, BOT_MAX_RSS_MB, BOT_TAB_MAX_AGE_MIN,
+    BOT_TOKEN_REFRESH_LEAD,
+)
+from bot.transactions import (
+    calc_total, dedupe_by_id, extract_items, normalize_withdrawals, select_statuses,
+)
+from bot.io_writer import io_writer
 
 WITHDRAWALS_URL = f"{CRONOS_BASE_URL}/financial/financial-transactions"
 CHROME_PROFILE_DIR = str(Path.home() / ".cronos_bot_chrome_profile")
 CHROME_BIN = os.environ.get("CHROME_BIN", "")
 SESSION_FILE = Path(__file__).parent.parent / "session_data.json"
+# Yedek (standby) tarayicinin kendi session dosyasi
+STANDBY_SESSION_FILE = SESSION_FILE.with_name("session_data_standby.json")
+
+# Ucuncu parti izleme/analitik adresleri (CDP Fetch urlPattern formatinda).
+# BOT_BLOCK_RESOURCES=1 iken kaynak tipinden bagimsiz engellenir.
+TRACKER_URL_PATTERNS = [
+    "*google-analytics.com/*",
+    "*googletagmanager.com/*",
+    "*doubleclick.net/*",
+    "*connect.facebook.net/*",
+    "*hotjar.com/*",
+    "*clarity.ms/*",
+    "*mc.yandex.ru/*",
+    "*mixpanel.com/*",
+    "*segment.io/*",
+]
+
+# Engellenen istek basina ortalama boyut tahmini (byte) - tasarruf raporu icin.
+# Istek hic gitmedigi icin gercek boyut bilinemez; olculmus karsilastirma
+# icin: python -m benchmarks.bench_resource_blocking
+_BLOCK_SIZE_ESTIMATE = {
+    "Image": 25_000,
+    "Font": 40_000,
+    "Media": 250_000,
+    "Tracker": 30_000,
+}
+
+
+def _chrome_rss_bytes(root_pid=None):
+    """
+    root_pid (bir Chrome'un ana process'i) ve alt process'lerinin
+    (renderer'lar, GPU ...) toplam RSS'i. root_pid verilmezse bu Python
+    process'inin tum alt process'leri (BOT_STANDBY ile iki Chrome birden).
+    /proc okunamazsa (Linux disi) None doner.
+    """
+    try:
+        parents = {}
+        rss = {}
+        for entry in os.listdir("/proc"):
+            if not entry.isdigit():
+                continue
+            try:
+                with open(f"/proc/{entry}/stat", "r") as f:
+                    stat = f.read()
+                # comm parantez icinde bosluk icerebilir -> son ')' sonrasini bol
+                fields = stat.rpartition(")")[2].split()
+                parents[int(entry)] = int(fields[1])
+                rss[int(entry)] = int(fields[21]) * os.sysconf("SC_PAGE_SIZE")
+            except (OSError, IndexError, ValueError):
+                continue
+    except OSError:
+        return None
+
+    if root_pid and root_pid not in rss:
+        return None
+    root = root_pid or os.getpid()
+    total = rss.get(root, 0) if root_pid else 0
+    for pid in rss:
+        parent = parents.get(pid)
+        while parent and parent != root:
+            parent = parents.get(parent)
+        if parent == root:
+            total += rss[pid]
+    return total
+
+
+# Sayfa durumunu tek cagrida okuyan JS (kosul bazli beklemeler icin).
+# res: yuklenen kaynak sayisi (degismiyorsa ag sakin), pw/otp: login/2FA input'u var mi.
+_PAGE_STATE_JS = """
+return JSON.stringify({
+    title: document.title || '',
+    url: location.href,
+    ready: document.readyState !== 'loading',
+    res: performance.getEntriesByType('resource').length,
+    pw: !!document.querySelector('input[type=password]'),
+    otp: !!document.querySelector('input[autocomplete=one-time-code], input[name*=otp]') ||
+        /dogrulama|doğrulama|authenticator/i.test(document.body ? document.body.innerText.substring(0, 500) : ''),
+    rows: !!document.querySelector('table tbody tr')
+});
+"""
+
+
+# Storage.setCookies'in kabul ettigi alanlar (getCookies ciktisindan suzulur)
+_COOKIE_PARAM_KEYS = (
+    "name", "value", "domain", "path", "secure", "httpOnly", "sameSite",
+    "expires", "priority", "sourceScheme", "sourcePort", "partitionKey",
+)
+
+_SESSION_HOST = urlparse(CRONOS_BASE_URL).hostname or ""
+
+
+def _is_session_cookie_domain(domain):
+    """Cookie panel alan adina (veya ust alan adina) mi ait?"""
+    domain = (domain or "").lstrip(".")
+    return bool(domain) and (_SESSION_HOST == domain or _SESSION_HOST.endswith("." + domain))
+
+
+def _to_cookie_param(cookie):
+    """Kaydedilmis cookie'yi Storage.setCookies parametresine cevir."""
+    if not isinstance(cookie, dict) or not cookie.get("name"):
+        return None
+    param = {k: v for k, v in cookie.items() if k in _COOKIE_PARAM_KEYS}
+    if param.get("expires", -1) in (-1, None):
+        # Session cookie: expires verilmez
+        param.pop("expires", None)
+    return param
+
+
+def _session_digest(data):
+    """
+    Snapshot icerik ozeti. Cookie'lerde sadece ad/deger/alan/yol dikkate
+    alinir; sure uzamasi tek basina dosya yazdirmaz.
+    """
+    cookies = sorted(
+        (c.get("name"), c.get("value"), c.get("domain"), c.get("path"))
+        for c in data.get("cookies", []) if isinstance(c, dict)
+    )
+    blob = json.dumps(
+        {"ls": data.get("localStorage", {}), "cookies": cookies},
+        sort_keys=True, ensure_ascii=False, default=str,
+    )
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def jwt_exp(token):
+    """JWT access_token'in 'exp' alanini (unix saniye) dondur; JWT degilse None."""
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        exp = json.loads(base64.urlsafe_b64decode(payload)).get("exp")
+        return float(exp) if exp else None
+    except (AttributeError, IndexError, ValueError, TypeError):
+        return None
 
 
 def _extract_cdp_value(response):
@@ -41,24 +190,382 @@ def _extract_cdp_value(response):
     return response
 
 
+def _request_params(request):
+    """CDP istek nesnesinden sorgu + govde (JSON / form) parametreleri."""
+    params = dict(parse_qsl(urlparse(request.get("url", "")).query))
+    body = request.get("postData")
+    if body:
+        try:
+            data = json.loads(body)
+        except ValueError:
+            data = dict(parse_qsl(body))
+        if isinstance(data, dict):
+            params.update(data)
+    return params
+
+
+def _capture_matches(meta, generation, expect):
+    """Yakalanan yanit bu tetiklemeye (ve beklenen status/page'e) mi ait?"""
+    if meta.get("generation") is not None and meta["generation"] != generation:
+        return False
+    params = meta.get("params") or {}
+    for key, value in (expect or {}).items():
+        if key in params and str(params[key]) != str(value):
+            return False
+    return True
+
+
+# Tablo satirlarini okuyan JS govdesi (DOM scraping).
+# Hem _read_table hem de window._finReadTable bunu kullanir.
+_READ_TABLE_JS = """
+    var rows = document.querySelectorAll('table tbody tr');
+    var items = [];
+
+    for (var i = 0; i < rows.length; i++) {
+        var row = rows[i];
+        var tds = row.querySelectorAll('td');
+        if (tds.length < 10) continue;
+
+        var cells = [];
+        for (var j = 0; j < tds.length; j++) {
+            cells.push(tds[j].textContent.trim());
+        }
+
+        var userLink = row.querySelector('a[href*="customer-detail"]');
+        var playerHref = userLink ? userLink.getAttribute('href') : '';
+        var playerIdMatch = playerHref.match(/customer-detail\\/(\\d+)/);
+        var playerId = playerIdMatch ? playerIdMatch[1] : cells[2];
+
+        var statusSpan = row.querySelector('td:nth-child(10) span');
+        var status = statusSpan ? statusSpan.textContent.trim() : cells[9];
+
+        var hasAccept = row.innerHTML.indexOf('Kabul et') !== -1;
+        var hasReject = row.innerHTML.indexOf('Reddet') !== -1;
+
+        items.push({
+            id: cells[0] || '',
+            type: cells[1] || '',
+            player_id: playerId || '',
+            username: cells[3] || '',
+            full_name: cells[4] || '',
+            amount: cells[5] || '',
+            extra: cells[6] || '',
+            payment_method: (cells[7] || '').replace('edit', '').trim(),
+            note: cells[8] || '',
+            status: status || '',
+            manager_note: cells[10] || '',
+            created_at: cells[11] || '',
+            updated_at: cells[12] || '',
+            manager: cells[13] || '',
+            has_accept_btn: hasAccept,
+            has_reject_btn: hasReject
+        });
+    }
+
+    return items;
+"""
+
+# Sayfaya bir kez enjekte edilen yardimci JS fonksiyonlari.
+# window._finSetFilters(status, pageSize): filtreyi set eder, sayfayi 1'e
+#   ceker, pageSize > 0 ise component'in sayfa boyutunu buyutur.
+# window._finLoad(timeoutMs): getData() cagirir, veri geldiginde resolve
+#   olan bir Promise dondurur (polling yok).
+# window._finFetch(status, timeoutMs, pageSize): _finSetFilters + _finLoad.
+# window._finReadTable(): tablodaki satirlari dondurur.
+# window._finReadItems(source): source='vue' ise $data.financial_list'in ham
+#   kopyasini, component yoksa (veya source='dom') tablo satirlarini dondurur.
+# window._finGoPage(page, load): sayfa numarasini set eder, load ise
+#   getData() cagirir (beklemez; network capture modu yaniti yakalar).
+# window._finNextPages(source, timeoutMs, have, maxPages): 2. sayfadan
+#   itibaren toplam sayiya ulasana kadar sayfalari gezip ek satirlari dondurur.
+# window._finRefresh(source, timeoutMs, maxPages): filtreye dokunmadan veriyi
+#   yeniler, tum sayfalari okur (durum basina sabit sekme modu icin).
+# window._finScanAll(statuses, timeoutMs, source, pageSize, maxPages): tum
+#   durumlari sirayla tarar, listeleri + toplamlari + faz sureleri tek
+#   sonucta dondurur.
+_FIN_HELPERS_JS = """
+    if (window._finHelpers === 6) return true;
+
+    // Sayfalama anahtarlari component'e gore degisebilir
+    window._finPager = function(c) {
+        var pageKeys = ['page', 'current_page', 'currentPage'];
+        var sizeKeys = ['per_page', 'perPage', 'limit', 'page_size', 'itemsPerPage'];
+        var targets = [c.$data];
+        if (c.$data.options && typeof c.$data.options === 'object') targets.push(c.$data.options);
+        if (c.$data.pagination && typeof c.$data.pagination === 'object') targets.push(c.$data.pagination);
+        var pager = {obj: null, pageKey: null, sizeKey: null};
+        for (var t = 0; t < targets.length; t++) {
+            for (var i = 0; i < pageKeys.length && !pager.pageKey; i++) {
+                if (pageKeys[i] in targets[t]) { pager.obj = targets[t]; pager.pageKey = pageKeys[i]; }
+            }
+            if (pager.pageKey) {
+                for (var j = 0; j < sizeKeys.length; j++) {
+                    if (sizeKeys[j] in targets[t]) { pager.sizeKey = sizeKeys[j]; break; }
+                }
+                break;
+            }
+        }
+        return pager;
+    };
+
+    window._finSetFilters = function(status, pageSize) {
+        var c = window._finComp;
+        if (!c) return false;
+
+        c.$set(c.$data, 'type', '2');
+        c.$set(c.$data, 'bonus', '2');
+        c.$set(c.$data, 'status', String(status));
+
+        var pager = window._finPager(c);
+        if (pager.pageKey) c.$set(pager.obj, pager.pageKey, 1);
+        if (pager.sizeKey && pageSize > 0) {
+            var cur = pager.obj[pager.sizeKey];
+            c.$set(pager.obj, pager.sizeKey, typeof cur === 'string' ? String(pageSize) : pageSize);
+        }
+
+        var selects = document.querySelectorAll('select');
+        if (selects[0]) selects[0].value = '2';
+        if (selects[1]) selects[1].value = '2';
+        if (selects[3]) selects[3].value = String(status);
+        return true;
+    };
+
+    window._finLoad = function(timeoutMs) {
+        var c = window._finComp;
+        if (!c) return Promise.resolve(null);
+
+        return new Promise(function(resolve) {
+            var t0 = performance.now();
+            var done = false, started = false;
+            var unwatchLoading = null, unwatchList = null, timer = null;
+
+            function finish(reason) {
+                if (done) return;
+                done = true;
+                if (unwatchLoading) unwatchLoading();
+                if (unwatchList) unwatchList();
+                clearTimeout(timer);
+                resolve({
+                    status: c.$data.status,
+                    total: c.$data.total,
+                    loading: c.$data.loading,
+                    reason: reason,
+                    ms: performance.now() - t0
+                });
+            }
+
+            unwatchLoading = c.$watch('loading', function(v) {
+                if (v) { started = true; }
+                else if (started) { c.$nextTick(function() { finish('loading'); }); }
+            });
+            unwatchList = c.$watch('financial_list', function() {
+                if (!c.$data.loading) c.$nextTick(function() { finish('list'); });
+            });
+            timer = setTimeout(function() { finish('timeout'); }, timeoutMs || 15000);
+
+            var ret;
+            try {
+                ret = c.getData();
+            } catch (e) {
+                finish('error');
+                return;
+            }
+            if (c.$data.loading) started = true;
+
+            if (ret && typeof ret.then === 'function') {
+                ret.then(
+                    function() { c.$nextTick(function() { finish('promise'); }); },
+                    function() { finish('error'); }
+                );
+            } else if (!started) {
+                // getData senkron bitti ve loading hic acilmadi
+                c.$nextTick(function() { if (!c.$data.loading) finish('sync'); });
+            }
+        });
+    };
+
+    window._finFetch = function(status, timeoutMs, pageSize) {
+        if (!window._finSetFilters(status, pageSize || 0)) return Promise.resolve(null);
+        return window._finLoad(timeoutMs);
+    };
+
+    window._finReadTable = function() {
+""" + _READ_TABLE_JS + """
+    };
+
+    window._finReadItems = function(source) {
+        var c = window._finComp;
+        if (source === 'vue' && c && c.$data && Array.isArray(c.$data.financial_list)) {
+            return {source: 'vue', items: JSON.parse(JSON.stringify(c.$data.financial_list))};
+        }
+        return {source: 'dom', items: window._finReadTable()};
+    };
+
+    window._finGoPage = function(page, load) {
+        var c = window._finComp;
+        if (!c) return false;
+        var pager = window._finPager(c);
+        if (!pager.pageKey) return false;
+        c.$set(pager.obj, pager.pageKey, page);
+        if (load) c.getData();
+        return true;
+    };
+
+    window._finNextPages = async function(source, timeoutMs, have, maxPages) {
+        var c = window._finComp;
+        var out = {items: [], pages: 0, ms: 0, complete: true};
+        if (!c) return out;
+        var pager = window._finPager(c);
+        var total = c.$data.total || 0;
+        if (!pager.pageKey || have >= total) return out;
+
+        var t0 = performance.now();
+        var page = Number(pager.obj[pager.pageKey]) || 1;
+        while (have < total && out.pages < (maxPages || 20)) {
+            page += 1;
+            c.$set(pager.obj, pager.pageKey, page);
+            var st = await window._finLoad(timeoutMs);
+            if (!st || st.reason === 'timeout' || st.reason === 'error') { out.complete = false; break; }
+            var read = window._finReadItems(source);
+            if (!read.items.length) break;
+            out.items = out.items.concat(read.items);
+            out.source = read.source;
+            out.pages += 1;
+            have += read.items.length;
+            total = c.$data.total || total;
+        }
+        if (have < total) out.complete = false;
+        // Sonraki filtre degisimi sayfa 1'den baslasin
+        c.$set(pager.obj, pager.pageKey, 1);
+        out.ms = performance.now() - t0;
+        return out;
+    };
+
+    window._finRefresh = async function(source, timeoutMs, maxPages) {
+        var c = window._finComp;
+        if (!c) return null;
+        var t0 = performance.now();
+        var pager = window._finPager(c);
+        if (pager.pageKey) c.$set(pager.obj, pager.pageKey, 1);
+        var st = await window._finLoad(timeoutMs);
+        var read = st ? window._finReadItems(source) : {source: null, items: []};
+        var more = {items: [], pages: 0, complete: true};
+        if (st && read.items.length < (st.total || 0)) {
+            more = await window._finNextPages(source, timeoutMs, read.items.length, maxPages);
+        }
+        return {
+            ok: !!st && st.reason !== 'timeout' && st.reason !== 'error',
+            source: read.source,
+            items: read.items.concat(more.items),
+            total: st ? st.total : null,
+            complete: more.complete,
+            status: c.$data.status,
+            ms: performance.now() - t0
+        };
+    };
+
+    window._finScanAll = async function(statuses, timeoutMs, source, pageSize, maxPages) {
+        var t0 = performance.now();
+        var out = {results: {}, timing: {}};
+        for (var i = 0; i < statuses.length; i++) {
+            var s = String(statuses[i]);
+            var tFetch = performance.now();
+            var st = await window._finFetch(s, timeoutMs, pageSize);
+            var tRead = performance.now();
+            var read = st ? window._finReadItems(source) : {source: null, items: []};
+            var tPages = performance.now();
+            var more = {items: [], pages: 0, complete: true};
+            if (st && read.items.length < (st.total || 0)) {
+                more = await window._finNextPages(source, timeoutMs, read.items.length, maxPages);
+            }
+            var tEnd = performance.now();
+            out.results[s] = {
+                ok: !!st && st.reason !== 'timeout' && st.reason !== 'error',
+                source: read.source,
+                items: read.items.concat(more.items),
+                total: st ? st.total : null,
+                complete: more.complete
+            };
+            out.timing[s] = {
+                fetch_ms: tRead - tFetch,
+                read_ms: tPages - tRead,
+                pages_ms: tEnd - tPages,
+                extra_pages: more.pages,
+                wait: st ? st.reason : null
+            };
+        }
+        out.timing.total_ms = performance.now() - t0;
+        return out;
+    };
+
+    window._finHelpers = 6;
+    return true;
+"""
+
+
 class CronosBrowser:
-    def __init__(self):
+    def __init__(self, profile_dir=None, session_file=None, name="ana"):
+        """
+        profile_dir / session_file: yedek (standby) tarayici icin ayri Chrome
+        profili ve session dosyasi. Verilmezse varsayilanlar kullanilir.
+        """
+        self.name = name
+        self._profile_dir = profile_dir or CHROME_PROFILE_DIR
+        self._session_file = Path(session_file) if session_file else SESSION_FILE
         self._browser = None
         self._tab = None
         self._filters_set = False
 
+        # Network capture (BOT_SCAN_ENGINE=network)
+        self._capture_enabled = False
+        self._capture_pending = {}
+        self._capture_requests = {}
+        self._capture_generation = 0
+        self._capture_queue = asyncio.Queue()
+
+        # Durum basina sabit sekmeler (BOT_MULTI_TAB): key -> tab
+        self._status_tabs = {}
+
+        # Kaynak engelleme (BOT_BLOCK_RESOURCES): tab id'leri + sayaclar
+        self._blocking_tabs = set()
+        self._block_stats = {"blocked": {}, "allowed": 0, "bytes_saved_est": 0, "since": None}
+
+        # Bellek izleme / sekme yenileme
+        self._tab_born = time.monotonic()
+        self._perf_tabs = set()
+        self._memory_series = deque(maxlen=120)
+        self._memory_cycles = 0
+        self._tab_recycles = 0
+        self._browser_restarts = 0
+        # Son RSS kaynakli islem ("recycle" / "restart"); RSS sinirin altina inince sifirlanir
+        self._rss_action = None
+        self._headless = False
+
+        # Token suresi takibi + arka planda sessiz yenileme
+        self._token_exp = None
+        self._token_refresh_task = None
+        self._token_refreshes = 0
+        self._token_refresh_error = None
+        self._token_retry_at = 0.0
+        self.token_refreshed_at = 0.0      # time.monotonic(), son basarili yenileme
+        # Ana sekme degisimi (yenileme/relogin) tarama ortasinda olmasin
+        self._tab_lock = asyncio.Lock()
+
+        # session_data.json icerik ozeti (degismediyse yeniden yazilmaz)
+        self._session_hash = None
+
     # ── JS Helper (sadece basit string/bool donduren sorgular icin) ──
 
-    async def _js(self, script):
+    async def _js(self, script, tab=None):
         """Basit JS calistir (string/bool/number donduren sorgular icin)."""
         try:
-            raw = await self._tab.execute_script(script, return_by_value=True)
+            raw = await (tab or self._tab).execute_script(script, return_by_value=True)
             return _extract_cdp_value(raw)
         except Exception as e:
             print(f"[!] JS hata: {e}", flush=True)
             return None
 
-    async def _js_json(self, script):
+    async def _js_json(self, script, tab=None):
         """
         JS calistir, JSON string dondur, Python dict'e cevir.
         Script icinde 'return VALUE' olmali (IIFE icinde).
@@ -74,7 +581,7 @@ class CronosBrowser:
                 expression=expression,
                 return_by_value=True,
             )
-            raw = await self._tab._execute_command(command)
+            raw = await (tab or self._tab)._execute_command(command)
             val = _extract_cdp_value(raw)
 
             if val is None or not val or val == "null" or val == "undefined":
@@ -88,6 +595,131 @@ class CronosBrowser:
             print(f"[!] _js_json: {type(e).__name__}: {e}", flush=True)
             return None
 
+    async def _js_await(self, script, tab=None):
+        """
+        Async JS calistir, Promise'in sonucunu tek CDP cagrisinda al.
+        Script async IIFE icinde calisir, 'return' ile deger dondurmeli.
+        Runtime.evaluate(awaitPromise=True) sayesinde polling gerekmez.
+        """
+        expression = (
+            "(async function() { " + script + " })()"
+            ".then(function(v) { return JSON.stringify(v); })"
+        )
+        try:
+            command = RuntimeCommands.evaluate(
+                expression=expression,
+                return_by_value=True,
+                await_promise=True,
+            )
+            raw = await (tab or self._tab)._execute_command(command)
+            val = _extract_cdp_value(raw)
+
+            if val is None or not val or val == "null" or val == "undefined":
+                return None
+
+            return json.loads(val)
+        except json.JSONDecodeError as e:
+            print(f"[!] JSON parse: {e}", flush=True)
+            return None
+        except Exception as e:
+            print(f"[!] _js_await: {type(e).__name__}: {e}", flush=True)
+            return None
+
+    # ── Kosul Bazli Bekleme (sabit sleep yerine) ────────────────
+
+    async def _wait_until(self, check, timeout=10.0, interval=0.25):
+        """
+        check() (async) truthy donene kadar bekle, en fazla timeout saniye.
+        Doner: check'in truthy degeri, zaman asiminda None.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                value = await check()
+            except Exception:
+                value = None
+            if value:
+                return value
+            if time.monotonic() >= deadline:
+                return None
+            await asyncio.sleep(interval)
+
+    async def _page_state(self, tab=None):
+        """
+        Sayfanin tek CDP cagrisiyla ozeti. Navigasyon sirasinda (context
+        yok) sessizce None doner. Doner: {title, url, ready, res, pw, otp, rows}
+        """
+        try:
+            raw = await (tab or self._tab).execute_script(_PAGE_STATE_JS, return_by_value=True)
+            val = _extract_cdp_value(raw)
+            return json.loads(val) if isinstance(val, str) else None
+        except Exception:
+            return None
+
+    def _classify_page(self, state):
+        """Sayfa durumu: 'challenge' | 'login' | '2fa' | 'panel' | None (yukleniyor)."""
+        if not state or not state.get("ready"):
+            return None
+        title = (state.get("title") or "").lower()
+        url = (state.get("url") or "").lower()
+        if "just a moment" in title or "checking" in title or "dakika" in title:
+            return "challenge"
+        if "2fa" in url or "otp" in url or state.get("otp"):
+            return "2fa"
+        if self._is_login_page(state.get("title"), url):
+            return "login"
+        if not title:
+            return None
+        return "panel"
+
+    async def wait_for_page(self, accept, timeout=15.0, tab=None, settle=0.0):
+        """
+        Sayfa durumu accept icindekilerden biri olana kadar bekle.
+        settle > 0 ise 'panel' durumu icin ag sakinligi de beklenir: yuklenen
+        kaynak sayisi settle saniye degismemeli (SPA token gecersizse bu
+        surede login'e yonlendirir).
+        Doner: ulasilan durum, zaman asiminda None.
+        """
+        accept = set(accept)
+        last = {"res": None, "since": 0.0}
+
+        async def check():
+            state = await self._page_state(tab)
+            kind = self._classify_page(state)
+            if kind not in accept:
+                last["res"] = None
+                return None
+            if kind != "panel" or settle <= 0:
+                return kind
+            now = time.monotonic()
+            if state.get("res") != last["res"]:
+                last["res"], last["since"] = state.get("res"), now
+                return None
+            return kind if now - last["since"] >= settle else None
+
+        return await self._wait_until(check, timeout)
+
+    async def _wait_withdrawals_table(self, tab=None, timeout=20.0):
+        """Cekim tablosunda satir gorunene kadar bekle."""
+        return await self._wait_until(lambda: self._rows_state(tab), timeout) is not None
+
+    async def _rows_state(self, tab=None):
+        state = await self._page_state(tab)
+        return state if state and state.get("rows") else None
+
+    async def _vue_idle(self, tab=None):
+        """Vue component yuklemede degilse True."""
+        state = await self._js_json(
+            "var c = window._finComp; return c ? {idle: !c.$data.loading} : null;", tab=tab
+        )
+        return bool(state and state.get("idle"))
+
+    async def _wait_vue_component(self, tab=None, timeout=20.0):
+        """Vue financial component'i mount olana kadar bekle (helpers da kurulur)."""
+        return bool(await self._wait_until(
+            lambda: self._ensure_vue_component(tab=tab), timeout
+        ))
+
     # ── Browser Lifecycle ────────────────────────────────────────
 
     async def start(self, headless=False):
@@ -103,17 +735,36 @@ class CronosBrowser:
         options.add_argument("--disable-infobars")
         options.add_argument("--start-maximized")
         options.add_argument("--lang=tr-TR")
-        options.add_argument(f"--user-data-dir={CHROME_PROFILE_DIR}")
+        options.add_argument(f"--user-data-dir={self._profile_dir}")
+
+        if BOT_MULTI_TAB:
+            # Arka plandaki durum sekmeleri yavaslatilmasin
+            options.add_argument("--disable-background-timer-throttling")
+            options.add_argument("--disable-renderer-backgrounding")
+            options.add_argument("--disable-backgrounding-occluded-windows")
 
         # Railway'de Chromium binary path
         if CHROME_BIN:
             options.binary_location = CHROME_BIN
 
+        # Yeniden baslatmada (ayni nesne) eski sekmelere bagli durum kalmasin
+        self._headless = headless
+        self._filters_set = False
+        self._capture_enabled = False
+        self._capture_pending.clear()
+        self._capture_requests.clear()
+        self._status_tabs.clear()
+        self._blocking_tabs.clear()
+        self._perf_tabs.clear()
+
         self._browser = Chrome(options=options)
         await self._browser.__aenter__()
         self._tab = await self._browser.start()
+        self._tab_born = time.monotonic()
 
-        print(f"[+] Chrome baslatildi (profil: {CHROME_PROFILE_DIR})", flush=True)
+        print(f"[+] Chrome baslatildi ({self.name}, profil: {self._profile_dir})", flush=True)
+        if BOT_BLOCK_RESOURCES:
+            await self.enable_resource_blocking()
         return self
 
     async def bypass_cloudflare(self, timeout=60):
@@ -132,7 +783,7 @@ class CronosBrowser:
             print(f"[!] Cloudflare bypass hatasi: {e}", flush=True)
             try:
                 await self._tab.go_to(CRONOS_BASE_URL)
-                await asyncio.sleep(3)
+                await self.wait_for_page({"login", "panel"}, timeout=10)
             except Exception:
                 pass
             return False
@@ -143,6 +794,16 @@ class CronosBrowser:
             await self.save_session()
         except Exception:
             pass
+        if self._blocking_tabs:
+            stats = self.get_block_stats()
+            print(
+                f"[Engelleme] {stats['blocked_total']} istek engellendi "
+                f"(tahmini ~{stats['bytes_saved_est'] / 1_048_576:.1f} MB tasarruf) {stats['blocked']}",
+                flush=True,
+            )
+        for tab in list(self._status_tabs.values()):
+            await self._close_tab(tab)
+        self._status_tabs.clear()
         try:
             if self._browser:
                 await self._browser.__aexit__(None, None, None)
@@ -154,43 +815,117 @@ class CronosBrowser:
     def tab(self):
         return self._tab
 
+    async def get_auth(self):
+        """
+        API icin kimlik bilgilerini tarayicidan topla:
+        localStorage.access_token, cookie'ler (cf_clearance dahil) ve
+        User-Agent (Cloudflare clearance UA'ya bagli).
+        """
+        try:
+            info = await self._js_json(
+                "return {token: localStorage.getItem('access_token'), ua: navigator.userAgent};"
+            )
+            if not info or not info.get("token"):
+                return None
+            cookies = await self._tab.get_cookies()
+            return {"token": info["token"], "cookies": cookies, "user_agent": info.get("ua")}
+        except Exception as e:
+            print(f"[!] Auth bilgisi alinamadi: {e}", flush=True)
+            return None
+
     # ── Session Persistence ───────────────────────────────────────
 
-    async def save_session(self):
-        """localStorage verisini dosyaya kaydet (yedek)."""
+    async def _session_cookies(self):
+        """Panel ve Cloudflare cookie'leri (Storage.getCookies, httpOnly dahil)."""
+        cookies = await self._browser.get_cookies()
+        return [c for c in cookies if _is_session_cookie_domain(c.get("domain", ""))]
+
+    async def save_session(self, tab=None):
+        """
+        localStorage + cookie'leri (cf_clearance dahil) tek snapshot olarak
+        dosyaya kaydet. Icerik degismediyse dosya yeniden yazilmaz.
+        access_token JWT ise bitis zamani (exp) da guncellenir.
+        """
         try:
             data = await self._js_json(
-                "return {localStorage: Object.assign({}, localStorage)}"
+                "return {localStorage: Object.assign({}, localStorage)}", tab=tab
             )
-            if data and data.get("localStorage"):
-                SESSION_FILE.write_text(
-                    json.dumps(data, ensure_ascii=False, indent=2),
-                    encoding="utf-8",
-                )
-                print("[+] Session kaydedildi", flush=True)
+            if not data or not data.get("localStorage"):
+                return False
+            self._update_token_exp(data["localStorage"].get("access_token"))
+            try:
+                data["cookies"] = [
+                    {k: v for k, v in c.items() if k in _COOKIE_PARAM_KEYS}
+                    for c in await self._session_cookies()
+                ]
+            except Exception as e:
+                print(f"[!] Cookie'ler alinamadi: {e}", flush=True)
+
+            digest = _session_digest(data)
+            if self._session_hash is None and self._session_file.exists():
+                try:
+                    self._session_hash = _session_digest(
+                        json.loads(self._session_file.read_text(encoding="utf-8"))
+                    )
+                except (OSError, ValueError):
+                    pass
+            if digest == self._session_hash:
+                return False
+
+            # Dosya yazimi event loop disinda (yazici baslatilmadiysa hemen)
+            text = json.dumps(data, ensure_ascii=False, indent=2)
+            path = self._session_file
+            io_writer.submit(lambda: path.write_text(text, encoding="utf-8"), key=str(path))
+            self._session_hash = digest
+            print(f"[+] Session kaydedildi ({len(data.get('cookies', []))} cookie)", flush=True)
+            return True
         except Exception as e:
             print(f"[!] Session kaydetme hatasi: {e}", flush=True)
-
-    async def restore_session(self):
-        """Kaydedilmis localStorage verisini Chrome'a yukle."""
-        if not SESSION_FILE.exists():
             return False
+
+    def _load_session_file(self):
+        path = self._session_file
+        if not path.exists():
+            # Yedek tarayicinin henuz kendi dosyasi yok: ana session ile tohumla
+            path = SESSION_FILE
+        if not path.exists():
+            return None
         try:
-            raw = SESSION_FILE.read_text(encoding="utf-8")
-            data = json.loads(raw)
-            ls = data.get("localStorage", {})
-            if not ls or not ls.get("access_token"):
-                return False
+            return json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            print(f"[!] Session dosyasi okunamadi: {e}", flush=True)
+            return None
 
-            # localStorage'a yaz
-            for key, value in ls.items():
-                safe_key = key.replace("'", "\\'")
-                safe_val = str(value).replace("'", "\\'").replace("\n", "\\n")
-                await self._js(
-                    "localStorage.setItem('" + safe_key + "', '" + safe_val + "')"
-                )
+    async def restore_cookies(self, data=None):
+        """Kaydedilmis cookie'leri tek Storage.setCookies cagrisiyla yukle."""
+        data = data if data is not None else self._load_session_file()
+        cookies = [_to_cookie_param(c) for c in (data or {}).get("cookies", [])]
+        cookies = [c for c in cookies if c]
+        if not cookies:
+            return 0
+        await self._browser.set_cookies(cookies)
+        return len(cookies)
 
-            print("[+] Session restore edildi (localStorage)", flush=True)
+    async def restore_session(self):
+        """
+        Kaydedilmis session'i Chrome'a yukle: cookie'ler Storage.setCookies,
+        localStorage tek bir evaluate ile (JSON literal, elle escape yok).
+        """
+        data = self._load_session_file()
+        if not data:
+            return False
+        ls = data.get("localStorage", {})
+        if not ls or not ls.get("access_token"):
+            return False
+        try:
+            n_cookies = await self.restore_cookies(data)
+            payload = json.dumps({str(k): str(v) for k, v in ls.items()}, ensure_ascii=False)
+            await self._js(
+                "var d = " + payload + "; "
+                "for (var k in d) localStorage.setItem(k, d[k]); "
+                "return Object.keys(d).length;"
+            )
+            print(f"[+] Session restore edildi ({len(ls)} localStorage, {n_cookies} cookie)", flush=True)
             return True
         except Exception as e:
             print(f"[!] Session restore hatasi: {e}", flush=True)
@@ -205,55 +940,50 @@ class CronosBrowser:
         """
         print("[*] Session kontrol ediliyor...", flush=True)
 
+        # Profil silindiyse (orn. yeni deploy) kayitli cookie'leri sayfa
+        # acilmadan yukle: cf_clearance varsa challenge'a hic girilmez
+        try:
+            names = {c.get("name") for c in await self._session_cookies()}
+            if "cf_clearance" not in names:
+                n = await self.restore_cookies()
+                if n:
+                    print(f"[+] {n} cookie snapshot'tan yuklendi", flush=True)
+        except Exception as e:
+            print(f"[!] Cookie restore hatasi: {e}", flush=True)
+
         # Chrome profili Cloudflare cookie'lerini sakliyor,
         # bu yuzden bypass denemeden direkt sayfaya git
         await self._tab.go_to(CRONOS_BASE_URL)
-        await asyncio.sleep(5)
+        kind = await self.wait_for_page({"challenge", "login", "panel"}, timeout=15)
 
         # Cloudflare challenge'a takildi mi?
-        title = await self._js("return document.title") or ""
-        t = title.lower()
-        if "checking" in t or "just a moment" in t or "dakika" in t:
+        if kind == "challenge":
             print("[*] Cloudflare challenge, bypass deneniyor...", flush=True)
             await self.bypass_cloudflare()
-            await asyncio.sleep(3)
-
-        # Vue.js SPA yukleniyor - sayfa yonlendirme yapabilir
-        # Birden fazla kontrol yap cunku SPA ilk basta Dashboard
-        # gosteriyor sonra token gecersizse login'e yonlendiriyor
-        for i in range(5):
-            await asyncio.sleep(2)
-            title = await self._js("return document.title") or ""
-            url = await self._js("return window.location.href") or ""
-            print(f"[*] Session kontrol ({i+1}/5): title={title}, url={url}", flush=True)
-
-            if self._is_login_page(title, url):
-                print("[*] Login sayfasina yonlendirildi.", flush=True)
-                break
 
-            # Dashboard veya baska panel sayfasindaysa
-            if "dashboard" in title.lower() or "cronos" in title.lower():
-                if not self._is_login_page(title, url):
-                    # Gercekten paneldeyiz, session gecerli
-                    print("[+] Session gecerli! Login atlaniyor.", flush=True)
-                    await self.save_session()
-                    return True
-        else:
-            # 5 kontrol sonunda hala login degilse, gecerli say
-            if not self._is_login_page(title, url):
-                print("[+] Session gecerli! Login atlaniyor.", flush=True)
-                await self.save_session()
-                return True
+        # Vue.js SPA ilk basta Dashboard gosterip token gecersizse login'e
+        # yonlendirebilir: panel durumu ancak ag sakinlesince kabul edilir
+        kind = await self.wait_for_page({"login", "panel"}, timeout=12, settle=1.0)
+        state = await self._page_state() or {}
+        if kind is None and self._classify_page(state) == "panel":
+            # Ag hic sakinlesmedi (polling yapan sayfa) ama login'e de donmedi: gecerli say
+            kind = "panel"
+        print(f"[*] Session kontrol: {kind}, title={state.get('title')}, url={state.get('url')}", flush=True)
+
+        if kind == "panel":
+            print("[+] Session gecerli! Login atlaniyor.", flush=True)
+            await self.save_session()
+            return True
+        if kind == "login":
+            print("[*] Login sayfasina yonlendirildi.", flush=True)
 
         # Chrome profili yetmedi, localStorage backup dene
         print("[*] Session gecersiz, localStorage backup deneniyor...", flush=True)
         restored = await self.restore_session()
         if restored:
             await self._tab.go_to(CRONOS_BASE_URL)
-            await asyncio.sleep(8)
-            title = await self._js("return document.title") or ""
-            url = await self._js("return window.location.href") or ""
-            if not self._is_login_page(title, url):
+            kind = await self.wait_for_page({"login", "panel"}, timeout=15, settle=1.0)
+            if kind == "panel":
                 print("[+] localStorage ile session kurtarildi!", flush=True)
                 return True
 
@@ -282,29 +1012,33 @@ class CronosBrowser:
             return True
         return False
 
-    async def auto_login(self):
+    async def auto_login(self, tab=None, save=True):
         """
         Otomatik login: username + password gir, submit et.
         2FA varsa TOTP koduyla gir.
         Headless modda (Railway) kullanilir.
+        tab verilirse login o sekmede yapilir (arka planda token yenileme).
+        save=False: basarida session kaydedilmez, token bitisi guncellenmez
+        (ayri context'teki login; ana profile yazmak cagirana kalir).
         """
+        tab = tab or self._tab
         if not CRONOS_USERNAME or not CRONOS_PASSWORD:
             print("[!] CRONOS_USERNAME/PASSWORD env degiskenleri ayarlanmamis!", flush=True)
             return False
 
         print(f"[*] Otomatik login deneniyor ({CRONOS_USERNAME})...", flush=True)
 
-        # Login sayfasina git
-        await self._tab.go_to(f"{CRONOS_BASE_URL}/login")
-        await asyncio.sleep(5)
+        # Login sayfasina git, (varsa Cloudflare challenge sonrasi) form gelene kadar bekle
+        await tab.go_to(f"{CRONOS_BASE_URL}/login")
 
-        # Cloudflare challenge varsa bekle
-        for _ in range(15):
-            title = await self._js("return document.title") or ""
-            if "just a moment" in title.lower() or "checking" in title.lower():
-                await asyncio.sleep(2)
-            else:
-                break
+        async def form_ready():
+            state = await self._page_state(tab)
+            kind = self._classify_page(state)
+            if kind == "login" and state.get("pw"):
+                return kind
+            return kind if kind in ("panel", "2fa") else None
+
+        await self._wait_until(form_ready, timeout=30)
 
         # Username ve password inputlarini bul ve doldur
         login_result = await self._js_json("""
@@ -336,7 +1070,7 @@ class CronosBrowser:
             passInput.dispatchEvent(new Event('change', {bubbles: true}));
 
             return {ok: true, user: userInput.value.substring(0, 3) + '***'};
-        """)
+        """, tab=tab)
 
         if not login_result or login_result.get("error"):
             print(f"[!] Login inputlari bulunamadi: {login_result}", flush=True)
@@ -355,50 +1089,34 @@ class CronosBrowser:
                     break;
                 }
             }
-        """)
+        """, tab=tab)
 
         print("[*] Login butonu tiklandi, yanit bekleniyor...", flush=True)
-        await asyncio.sleep(5)
-
-        # 2FA sayfasi geldi mi kontrol et
-        for attempt in range(10):
-            title = await self._js("return document.title") or ""
-            url = await self._js("return window.location.href") or ""
-            page_text = await self._js("return document.body ? document.body.innerText.substring(0, 500) : ''") or ""
-
-            # 2FA / OTP sayfasi
-            if "2fa" in url.lower() or "otp" in url.lower() or "dogrulama" in page_text.lower() or "authenticator" in page_text.lower():
-                print("[*] 2FA sayfasi algilandi...", flush=True)
-                ok = await self._handle_2fa()
-                if ok:
-                    await asyncio.sleep(3)
-                    break
-                else:
-                    print("[!] 2FA basarisiz!", flush=True)
-                    return False
-
-            # Login basarili - panel sayfasindayiz
-            if not self._is_login_page(title, url):
-                if "just a moment" not in title.lower() and "checking" not in title.lower():
-                    print(f"[+] Login basarili! Title: {title}", flush=True)
-                    await self.save_session()
-                    return True
-
-            await asyncio.sleep(2)
-
-        # Son kontrol
-        title = await self._js("return document.title") or ""
-        url = await self._js("return window.location.href") or ""
-        if not self._is_login_page(title, url):
+
+        # 2FA sayfasi mi, panel mi? (hangisi once gelirse)
+        kind = await self.wait_for_page({"2fa", "panel"}, timeout=25, tab=tab)
+        if kind == "2fa":
+            print("[*] 2FA sayfasi algilandi...", flush=True)
+            ok = await self._handle_2fa(tab)
+            if not ok:
+                print("[!] 2FA basarisiz!", flush=True)
+                return False
+            kind = await self.wait_for_page({"panel"}, timeout=20, tab=tab)
+
+        # Login basarili - panel sayfasindayiz
+        if kind == "panel":
+            title = await self._js("return document.title", tab=tab) or ""
             print(f"[+] Login basarili! Title: {title}", flush=True)
-            await self.save_session()
+            if save:
+                await self.save_session(tab)
             return True
 
         print("[!] Login basarisiz - hala login sayfasinda!", flush=True)
         return False
 
-    async def _handle_2fa(self):
+    async def _handle_2fa(self, tab=None):
         """TOTP 2FA kodunu gir."""
+        tab = tab or self._tab
         if not CRONOS_2FA_SECRET:
             print("[!] CRONOS_2FA_SECRET ayarlanmamis! 2FA gecilemez.", flush=True)
             return False
@@ -436,7 +1154,7 @@ class CronosBrowser:
             otpInput.dispatchEvent(new Event('input', {bubbles: true}));
             otpInput.dispatchEvent(new Event('change', {bubbles: true}));
             return {ok: true};
-        """)
+        """, tab=tab)
 
         if not result or result.get("error"):
             print(f"[!] OTP input bulunamadi: {result}", flush=True)
@@ -454,10 +1172,10 @@ class CronosBrowser:
                     break;
                 }
             }
-        """)
+        """, tab=tab)
 
         print("[*] 2FA kodu gonderildi...", flush=True)
-        await asyncio.sleep(3)
+        await self.wait_for_page({"panel", "login"}, timeout=10, tab=tab)
         return True
 
     async def wait_for_login(self, max_wait=600):
@@ -503,7 +1221,7 @@ class CronosBrowser:
                 continue
 
             print(f"[+] Panel acildi! Title: {title}", flush=True)
-            await asyncio.sleep(2)
+            await self.wait_for_page({"panel"}, timeout=5, settle=0.5)
             await self.save_session()
             return True
 
@@ -644,20 +1362,10 @@ class CronosBrowser:
             arama_clicked = True
 
         # Tablonun yuklenmesini bekle
-        await asyncio.sleep(3)
-
-        for _ in range(15):
-            try:
-                td_el = await self._tab.query(
-                    "table tbody tr td", timeout=1, raise_exc=False
-                )
-                if td_el:
-                    self._filters_set = True
-                    print("[+] Filtreler uygulandi, tablo yuklendi!", flush=True)
-                    return True
-            except Exception:
-                pass
-            await asyncio.sleep(1)
+        if await self._wait_withdrawals_table(timeout=18):
+            self._filters_set = True
+            print("[+] Filtreler uygulandi, tablo yuklendi!", flush=True)
+            return True
 
         # Bos sonuc olabilir
         self._filters_set = True
@@ -694,7 +1402,11 @@ class CronosBrowser:
                     }
                 """)
 
-            await asyncio.sleep(3)
+            # Vue component varsa istegin bitmesini bekle, yoksa tabloyu
+            if await self._ensure_vue_component():
+                await self._wait_until(self._vue_idle, timeout=15)
+            else:
+                await self._wait_withdrawals_table(timeout=15)
             print("[+] Cekim sayfasi yenilendi!", flush=True)
             return True
         else:
@@ -703,21 +1415,10 @@ class CronosBrowser:
             await self._tab.go_to(WITHDRAWALS_URL)
 
             # Sayfanin yuklenmesini bekle
-            for _ in range(20):
-                await asyncio.sleep(1)
-                try:
-                    tr = await self._tab.query(
-                        "table tbody tr", timeout=1, raise_exc=False
-                    )
-                    if tr:
-                        await asyncio.sleep(2)
-                        print("[+] Cekim sayfasi yuklendi!", flush=True)
-                        break
-                except Exception:
-                    pass
-            else:
+            if not await self._wait_withdrawals_table(timeout=20):
                 print("[!] Cekim sayfasi yuklenemedi!", flush=True)
                 return False
+            print("[+] Cekim sayfasi yuklendi!", flush=True)
 
             # Filtreleri ayarla
             self._filters_set = False
@@ -739,69 +1440,53 @@ class CronosBrowser:
 
     async def _read_table(self):
         """Sayfadaki tabloyu oku, satirlari dict listesi olarak dondur."""
-        items = await self._js_json("""
-            var rows = document.querySelectorAll('table tbody tr');
-            var items = [];
-
-            for (var i = 0; i < rows.length; i++) {
-                var row = rows[i];
-                var tds = row.querySelectorAll('td');
-                if (tds.length < 10) continue;
-
-                var cells = [];
-                for (var j = 0; j < tds.length; j++) {
-                    cells.push(tds[j].textContent.trim());
-                }
+        items = await self._js_json(_READ_TABLE_JS)
+        return items or []
 
-                var userLink = row.querySelector('a[href*="customer-detail"]');
-                var playerHref = userLink ? userLink.getAttribute('href') : '';
-                var playerIdMatch = playerHref.match(/customer-detail\\/(\\d+)/);
-                var playerId = playerIdMatch ? playerIdMatch[1] : cells[2];
-
-                var statusSpan = row.querySelector('td:nth-child(10) span');
-                var status = statusSpan ? statusSpan.textContent.trim() : cells[9];
-
-                var hasAccept = row.innerHTML.indexOf('Kabul et') !== -1;
-                var hasReject = row.innerHTML.indexOf('Reddet') !== -1;
-
-                items.push({
-                    id: cells[0] || '',
-                    type: cells[1] || '',
-                    player_id: playerId || '',
-                    username: cells[3] || '',
-                    full_name: cells[4] || '',
-                    amount: cells[5] || '',
-                    extra: cells[6] || '',
-                    payment_method: (cells[7] || '').replace('edit', '').trim(),
-                    note: cells[8] || '',
-                    status: status || '',
-                    manager_note: cells[10] || '',
-                    created_at: cells[11] || '',
-                    updated_at: cells[12] || '',
-                    manager: cells[13] || '',
-                    has_accept_btn: hasAccept,
-                    has_reject_btn: hasReject
-                });
-            }
+    async def _read_items(self):
+        """
+        Aktif filtredeki cekimleri oku.
+        BOT_DATA_SOURCE=vue ise Vue modelindeki ham objeler (sayisal tutar,
+        ISO tarih, gercek ID) normalize edilir; component bulunamazsa
+        DOM tablosu okunur.
+        """
+        if BOT_DATA_SOURCE != "vue":
+            return await self._read_table()
 
-            return items;
-        """)
-        return items or []
+        payload = await self._js_json(
+            "return window._finReadItems ? window._finReadItems('vue') : null;"
+        )
+        if not payload:
+            return await self._read_table()
+        if payload.get("source") == "vue":
+            return normalize_withdrawals(payload.get("items"))
+        return payload.get("items") or []
+
+    async def _read_next_pages(self, have):
+        """
+        Aktif filtrenin 2. sayfasindan itibaren kalan satirlari oku.
+        Sayfalar sayfa icinde sirayla yuklenir, tek CDP cagrisi yapilir.
+        """
+        more = await self._js_await(
+            "if (!window._finNextPages) return null; "
+            "return await window._finNextPages('" + BOT_DATA_SOURCE + "', "
+            + str(int(BOT_FILTER_TIMEOUT * 1000)) + ", " + str(int(have)) + ", "
+            + str(BOT_MAX_PAGES) + ");"
+        )
+        if not more:
+            return []
+        if not more.get("complete", True):
+            print("  [!] Tum sayfalar okunamadi", flush=True)
+        items = more.get("items") or []
+        if more.get("source") == "vue":
+            items = normalize_withdrawals(items)
+        return items
 
     def _calc_total(self, items):
         """Cekim listesinin toplam tutarini hesapla."""
-        total = 0
-        for item in items:
-            try:
-                amt_str = item.get("amount", "0")
-                amt_clean = amt_str.replace("TRY", "").replace("TL", "").strip()
-                amt_clean = amt_clean.replace(".", "").replace(",", ".")
-                total += float(amt_clean)
-            except (ValueError, AttributeError):
-                pass
-        return total
+        return calc_total(items)
 
-    async def _ensure_vue_component(self):
+    async def _ensure_vue_component(self, tab=None):
         """
         Vue financial component'ini bul ve window._finComp'a ata.
         Sayfa yuklendiginde bir kez cagrilir, sonra her filtrede kullanilir.
@@ -825,15 +1510,39 @@ class CronosBrowser:
                 }
             } catch(e) {}
             return null;
-        """)
-        return comp is not None
+        """, tab=tab)
+        if comp is None:
+            return False
+
+        # Yardimci fonksiyonlari enjekte et (sayfa yenilenince tekrar gerekir)
+        await self._js_json(_FIN_HELPERS_JS, tab=tab)
+        return True
 
     async def _set_status_filter(self, status_value, label):
         """
         Vue component data'sini dogrudan set edip getData() cagir.
         DOM select manipulasyonu yerine Vue reactivity kullanir.
         getData() API cagrisi yapar, total degismesini bekleriz.
+
+        BOT_FILTER_WAIT=event ise window._finFetch'in dondurdugu Promise
+        tek CDP cagrisiyla beklenir; veri gelir gelmez doner.
+        Basarisiz olursa eski polling yontemine duser.
         """
+        if BOT_FILTER_WAIT == "event":
+            state = await self._js_await(
+                "if (!window._finFetch) return null; "
+                "return await window._finFetch('" + str(status_value) + "', "
+                + str(int(BOT_FILTER_TIMEOUT * 1000)) + ", " + str(BOT_PAGE_SIZE) + ");"
+            )
+            if state and state.get("reason") not in ("timeout", "error"):
+                print(
+                    f"  [OK] Tur=Para Cekme, Bonus=Hayir, Durum={label} "
+                    f"(value={status_value}, {state.get('ms', 0):.0f}ms)",
+                    flush=True,
+                )
+                return True
+            print(f"  [!] {label}: event bekleme basarisiz ({state}), polling'e geciliyor", flush=True)
+
         # Onceki total'i oku
         prev_state = await self._js_json("""
             var c = window._finComp;
@@ -842,19 +1551,25 @@ class CronosBrowser:
         """)
         prev_total = prev_state["total"] if prev_state else None
 
-        # Vue component data'sini dogrudan set et
+        # Vue component data'sini dogrudan set et. _finNextPages component'i
+        # 1. sayfadan ileri tasimis olabilir: sayfa 1 + BOT_PAGE_SIZE de set edilir.
         result = await self._js_json("""
             var c = window._finComp;
             if (!c) return null;
 
-            c.$set(c.$data, 'type', '2');
-            c.$set(c.$data, 'bonus', '2');
-            c.$set(c.$data, 'status', '""" + str(status_value) + """');
-
-            var selects = document.querySelectorAll('select');
-            if (selects[0]) selects[0].value = '2';
-            if (selects[1]) selects[1].value = '2';
-            if (selects[3]) selects[3].value = '""" + str(status_value) + """';
+            if (window._finSetFilters) {
+                window._finSetFilters('""" + str(status_value) + """', """ + str(BOT_PAGE_SIZE) + """);
+            } else {
+                c.$set(c.$data, 'type', '2');
+                c.$set(c.$data, 'bonus', '2');
+                c.$set(c.$data, 'status', '""" + str(status_value) + """');
+                if ('page' in c.$data) c.$set(c.$data, 'page', 1);
+
+                var selects = document.querySelectorAll('select');
+                if (selects[0]) selects[0].value = '2';
+                if (selects[1]) selects[1].value = '2';
+                if (selects[3]) selects[3].value = '""" + str(status_value) + """';
+            }
 
             return {status: c.$data.status, type: c.$data.type, bonus: c.$data.bonus};
         """)
@@ -900,7 +1615,6 @@ class CronosBrowser:
         if not ok:
             return []
 
-        await asyncio.sleep(1)
         items = await self._read_table()
 
         count = len(items)
@@ -918,48 +1632,47 @@ class CronosBrowser:
 
         return items
 
-    async def scan_all_statuses(self):
+    async def scan_all_statuses(self, statuses=None):
         """
         3 durum icin sirayla filtrele ve tabloyu oku.
+        statuses verilirse (orn. ["beklemede"]) sadece o durumlar taranir.
         Vue component'inin data'sini dogrudan set ederek filtreler.
         getData() ile API cagrisi yapar, total degismesini bekler.
         Sonuc: { "beklemede": [...], "reserve": [...], "islemde": [...] }
+        Okunamayan durumlar "failed" listesine eklenir (diff bunlari silinmis saymaz).
+
+        BOT_SCAN_ENGINE=script ise tum durumlar tek bir Runtime.evaluate
+        ile taranir (window._finScanAll); sonuca "timing" eklenir.
+        BOT_MULTI_TAB=1 ise her durum kendi sekmesinde ayni anda taranir.
         """
-        # Durum select option degerleri (DOM'dan dogrulanmis):
-        #   0=Beklemede, 1=Onaylandi, 2=Reddedildi, 3=Islemde, 4=Reserve Edildi
-        statuses = [
-            (0, "beklemede", "Beklemede"),
-            (4, "reserve", "Reserve Edildi"),
-            (3, "islemde", "Islemde"),
-        ]
+        async with self._tab_lock:
+            return await self._scan_all_statuses(select_statuses(statuses))
 
-        # Cekim sayfasina git (ilk seferde veya farkli sayfadaysak)
-        current_url = await self._js("return window.location.href") or ""
-        if "/financial/financial-transactions" not in current_url:
-            print("[*] Cekim sayfasina gidiliyor...", flush=True)
-            await self._tab.go_to(WITHDRAWALS_URL)
-            for _ in range(20):
-                await asyncio.sleep(1)
-                try:
-                    tr = await self._tab.query(
-                        "table tbody tr", timeout=1, raise_exc=False
-                    )
-                    if tr:
-                        await asyncio.sleep(2)
-                        print("[+] Cekim sayfasi yuklendi!", flush=True)
-                        break
-                except Exception:
-                    pass
-            else:
-                print("[!] Cekim sayfasi yuklenemedi!", flush=True)
-                return None
+    async def _scan_all_statuses(self, statuses):
+        if BOT_MULTI_TAB:
+            result = await self._scan_all_tabs(statuses)
+            if result is not None:
+                return result
+            print("[!] Cok sekmeli tarama basarisiz, tek sekmede taraniyor...", flush=True)
 
-        # Vue component'ini bul (sayfa yuklendikten sonra)
-        vue_ok = await self._ensure_vue_component()
-        if not vue_ok:
-            print("[!] Vue component bulunamadi!", flush=True)
+        if not await self.ensure_withdrawals_page():
             return None
 
+        if BOT_SCAN_ENGINE == "script":
+            result = await self._scan_all_script(statuses)
+            if result is not None:
+                return result
+            print("[!] Tek-cagri tarama basarisiz, adim adim taraniyor...", flush=True)
+        elif BOT_SCAN_ENGINE == "network":
+            result = await self._scan_all_network(statuses)
+            if result is not None:
+                return result
+            print("[!] Network capture tarama basarisiz, adim adim taraniyor...", flush=True)
+
+        return await self._scan_all_steps(statuses)
+
+    async def _scan_all_steps(self, statuses):
+        """Her durum icin ayri ayri filtrele, tabloyu ve total'i oku."""
         result = {}
 
         for filter_val, key, label in statuses:
@@ -969,11 +1682,11 @@ class CronosBrowser:
                 print(f"  [!] {label} filtrelemesi basarisiz!", flush=True)
                 result[key] = []
                 result[f"{key}_total_count"] = 0
+                result.setdefault("failed", []).append(key)
                 continue
 
-            # Tabloyu oku
-            items = await self._read_table()
-            total = self._calc_total(items)
+            # Satirlari oku (Vue modeli veya tablo)
+            items = await self._read_items()
 
             # Total'i Vue component'tan oku (en guvenilir)
             vue_total = await self._js_json("""
@@ -982,12 +1695,749 @@ class CronosBrowser:
             """)
             real_count = vue_total["total"] if vue_total else len(items)
 
+            # Tek sayfaya sigmadiysa kalan sayfalari da oku
+            if real_count and len(items) < real_count:
+                items = dedupe_by_id(items + await self._read_next_pages(len(items)))
+
+            total = self._calc_total(items)
+
             result[key] = items
             result[f"{key}_total_count"] = real_count
             print(f"  [{label}] {real_count} cekim ({len(items)} gorunen), {total:,.0f} TRY", flush=True)
 
         return result
 
+    def _apply_scan_entry(self, result, key, label, entry):
+        """Sayfa icinden donen durum sonucunu (items/total/source) result'a yaz."""
+        entry = entry or {}
+        if not entry.get("ok"):
+            print(f"  [!] {label} filtrelemesi basarisiz!", flush=True)
+            result[key] = []
+            result[f"{key}_total_count"] = 0
+            result.setdefault("failed", []).append(key)
+            return False
+
+        items = entry.get("items") or []
+        if entry.get("source") == "vue":
+            items = normalize_withdrawals(items)
+        items = dedupe_by_id(items)
+        if not entry.get("complete", True):
+            print(f"  [!] {label}: tum sayfalar okunamadi", flush=True)
+        real_count = entry.get("total")
+        if real_count is None:
+            real_count = len(items)
+        result[key] = items
+        result[f"{key}_total_count"] = real_count
+        total = self._calc_total(items)
+        print(f"  [{label}] {real_count} cekim ({len(items)} gorunen), {total:,.0f} TRY", flush=True)
+        return True
+
+    async def _scan_all_script(self, statuses):
+        """
+        Tum durumlari tek CDP cagrisinda tara (window._finScanAll).
+        Donen sonuca faz bazli sure dokumu eklenir:
+          timing = {beklemede: {fetch_ms, read_ms, pages_ms, extra_pages, wait},
+                    ..., total_ms, cdp_ms}
+        """
+        values = ", ".join(str(v) for v, _, _ in statuses)
+        t0 = time.perf_counter()
+        payload = await self._js_await(
+            "if (!window._finScanAll) return null; "
+            "return await window._finScanAll([" + values + "], "
+            + str(int(BOT_FILTER_TIMEOUT * 1000)) + ", '" + BOT_DATA_SOURCE + "', "
+            + str(BOT_PAGE_SIZE) + ", " + str(BOT_MAX_PAGES) + ");"
+        )
+        cdp_ms = (time.perf_counter() - t0) * 1000
+        if not payload or not isinstance(payload.get("results"), dict):
+            return None
+
+        results = payload["results"]
+        js_timing = payload.get("timing", {})
+        result = {}
+        timing = {"total_ms": js_timing.get("total_ms"), "cdp_ms": cdp_ms}
+
+        for filter_val, key, label in statuses:
+            self._apply_scan_entry(result, key, label, results.get(str(filter_val)))
+            timing[key] = js_timing.get(str(filter_val))
+
+        print(
+            f"  [Sure] toplam {timing['total_ms'] or 0:.0f}ms (CDP dahil {cdp_ms:.0f}ms)",
+            flush=True,
+        )
+        result["timing"] = timing
+        return result
+
+    # ── Durum Basina Sekme (BOT_MULTI_TAB) ───────────────────────
+
+    async def _close_tab(self, tab):
+        self._blocking_tabs.discard(id(tab))
+        try:
+            await tab.close()
+        except Exception:
+            pass
+
+    async def _open_ready_tab(self, label):
+        """
+        Cekim sayfasinda yeni sekme ac (ayni Chrome profili = ayni session)
+        ve Vue component'i hazir olana kadar bekle. Olmazsa sekmeyi kapatir.
+        """
+        tab = None
+        try:
+            if BOT_BLOCK_RESOURCES:
+                # Bos sekme -> engelleme -> sayfa: ilk yukleme de filtrelenir
+                tab = await self._browser.new_tab("about:blank")
+                await self.enable_resource_blocking(tab)
+                await tab.go_to(WITHDRAWALS_URL)
+            else:
+                tab = await self._browser.new_tab(WITHDRAWALS_URL)
+        except Exception as e:
+            print(f"[!] {label} sekmesi acilamadi: {e}", flush=True)
+            if tab is not None:
+                await self._close_tab(tab)
+            return None
+
+        if await self._wait_vue_component(tab=tab, timeout=20):
+            return tab
+
+        print(f"[!] {label} sekmesinde Vue component bulunamadi", flush=True)
+        await self._close_tab(tab)
+        return None
+
+    async def _open_status_tab(self, filter_val, label):
+        """Durum icin hazir sekme ac ve filtreyi bir kez set et."""
+        tab = await self._open_ready_tab(label)
+        if tab is None:
+            return None
+
+        ok = await self._js_json(
+            "return window._finSetFilters ? window._finSetFilters('"
+            + str(filter_val) + "', " + str(BOT_PAGE_SIZE) + ") : null;",
+            tab=tab,
+        )
+        if not ok:
+            await self._close_tab(tab)
+            return None
+
+        print(f"[+] {label} sekmesi hazir", flush=True)
+        return tab
+
+    async def _scan_status_tab(self, filter_val, key, label):
+        """Durumun kendi sekmesinde veriyi yenile ve oku (filtre degismez)."""
+        tab = self._status_tabs.get(key)
+        if tab is None:
+            tab = await self._open_status_tab(filter_val, label)
+            if tab is None:
+                return None
+            self._status_tabs[key] = tab
+
+        entry = await self._js_await(
+            "if (!window._finRefresh) return null; "
+            "return await window._finRefresh('" + BOT_DATA_SOURCE + "', "
+            + str(int(BOT_FILTER_TIMEOUT * 1000)) + ", " + str(BOT_MAX_PAGES) + ");",
+            tab=tab,
+        )
+        if entry is None or str(entry.get("status")) != str(filter_val):
+            # Sekme bozulmus (sayfa yenilendi, session dustu...) -> sonraki turda yeniden ac
+            print(f"[!] {label} sekmesi gecersiz, yeniden acilacak", flush=True)
+            self._status_tabs.pop(key, None)
+            await self._close_tab(tab)
+            return None
+        return entry
+
+    async def _scan_all_tabs(self, statuses):
+        """
+        Her durumu kendi sekmesinde asyncio.gather ile ayni anda tara.
+        Tur suresi uc durumun toplami yerine en yavas durum kadar olur.
+        """
+        t0 = time.perf_counter()
+        entries = await asyncio.gather(
+            *(self._scan_status_tab(v, k, label) for v, k, label in statuses)
+        )
+        if all(entry is None for entry in entries):
+            return None
+
+        result = {}
+        timing = {}
+        for (_, key, label), entry in zip(statuses, entries):
+            self._apply_scan_entry(result, key, label, entry)
+            timing[key] = {"tab_ms": entry.get("ms")} if entry else None
+        timing["total_ms"] = (time.perf_counter() - t0) * 1000
+        print(f"  [Sure] toplam {timing['total_ms']:.0f}ms ({len(entries)} sekme paralel)", flush=True)
+        result["timing"] = timing
+        return result
+
+    # ── Bellek Izleme + Sekme Yenileme ───────────────────────────
+
+    async def sample_memory(self, tab=None):
+        """
+        JS heap (CDP Performance.getMetrics) ve bu ornegin Chrome surec
+        agacinin RSS'ini (/proc) olc; yedek tarayicinin Chrome'u dahil degil. Doner: {"time", "js_heap_mb", "js_heap_total_mb", "nodes",
+        "listeners", "rss_mb", "tab_age_min"}
+        """
+        tab = tab or self._tab
+        metrics = {}
+        try:
+            if id(tab) not in self._perf_tabs:
+                await tab._execute_command({"method": "Performance.enable", "params": {}})
+                self._perf_tabs.add(id(tab))
+            raw = await tab._execute_command({"method": "Performance.getMetrics", "params": {}})
+            for m in (raw or {}).get("result", {}).get("metrics", []):
+                metrics[m.get("name")] = m.get("value")
+        except Exception as e:
+            print(f"[!] Performance.getMetrics: {e}", flush=True)
+
+        mb = 1024 * 1024
+        rss = _chrome_rss_bytes(self._chrome_pid())
+        heap = metrics.get("JSHeapUsedSize")
+        heap_total = metrics.get("JSHeapTotalSize")
+        return {
+            "time": time.time(),
+            "js_heap_mb": None if heap is None else round(heap / mb, 1),
+            "js_heap_total_mb": None if heap_total is None else round(heap_total / mb, 1),
+            "nodes": metrics.get("Nodes"),
+            "listeners": metrics.get("JSEventListeners"),
+            "rss_mb": None if rss is None else round(rss / mb, 1),
+            "tab_age_min": round((time.monotonic() - self._tab_born) / 60, 1),
+        }
+
+    def _chrome_pid(self):
+        """Bu ornegin Chrome ana process PID'i (pydoll process yoneticisinden)."""
+        manager = getattr(self._browser, "_browser_process_manager", None)
+        process = getattr(manager, "_process", None)
+        return getattr(process, "pid", None)
+
+    async def memory_watchdog(self):
+        """
+        Her BOT_MEMORY_CHECK_EVERY turda bir bellek ornegi al; JS heap,
+        RSS veya sekme yasi siniri asildiysa sekmeyi yenile.
+
+        RSS tum Chrome surec agacidir; tek sekmeyi yenilemek onu sinirin
+        altina indirmeyebilir. Sekme yenilemeden sonraki ornekte RSS hala
+        sinirin ustundeyse Chrome yeniden baslatilir; o da yetmezse RSS
+        sinirin altina inene kadar RSS kaynakli yenileme yapilmaz (her
+        kontrolde yenileme dongusu olmasin).
+        Doner: yeni ornek (olculmediyse None).
+        """
+        self._memory_cycles += 1
+        if BOT_MEMORY_CHECK_EVERY <= 0 or self._memory_cycles % BOT_MEMORY_CHECK_EVERY:
+            return None
+
+        sample = await self.sample_memory()
+        self._memory_series.append(sample)
+
+        rss_high = bool(BOT_MAX_RSS_MB) and (sample["rss_mb"] or 0) > BOT_MAX_RSS_MB
+        if not rss_high:
+            self._rss_action = None
+
+        reason = None
+        action = "recycle"
+        if BOT_MAX_JS_HEAP_MB and (sample["js_heap_mb"] or 0) > BOT_MAX_JS_HEAP_MB:
+            reason = f"JS heap {sample['js_heap_mb']}MB > {BOT_MAX_JS_HEAP_MB}MB"
+        elif rss_high and self._rss_action != "restart":
+            reason = f"RSS {sample['rss_mb']}MB > {BOT_MAX_RSS_MB}MB"
+            if self._rss_action == "recycle":
+                action = "restart"
+            self._rss_action = action
+        elif BOT_TAB_MAX_AGE_MIN and sample["tab_age_min"] > BOT_TAB_MAX_AGE_MIN:
+            reason = f"sekme yasi {sample['tab_age_min']}dk > {BOT_TAB_MAX_AGE_MIN}dk"
+
+        if reason and action == "restart":
+            print(f"[Bellek] {reason}, sekme yenileme yetmedi -> Chrome yeniden baslatiliyor", flush=True)
+            if await self.restart_browser():
+                sample["restarted"] = reason
+        elif reason:
+            print(f"[Bellek] {reason} -> sekme yenileniyor", flush=True)
+            if await self.recycle_tab():
+                sample["recycled"] = reason
+        elif rss_high:
+            sample["rss_suppressed"] = True
+        return sample
+
+    async def recycle_tab(self):
+        """
+        Yeni sekme acip Vue component'i hazir olunca ana sekme ile degistir,
+        eskisini kapat. Session ayni profilde oldugu icin login korunur.
+        Yeni sekme hazir olmazsa eski sekme ile devam edilir.
+        """
+        t0 = time.perf_counter()
+        new_tab = await self._open_ready_tab("Yeni ana")
+        if new_tab is None:
+            print("[!] Sekme yenileme basarisiz, eski sekme ile devam", flush=True)
+            return False
+
+        await self._swap_main_tab(new_tab)
+        self._tab_recycles += 1
+        print(f"[+] Sekme yenilendi ({(time.perf_counter() - t0) * 1000:.0f}ms)", flush=True)
+        return True
+
+    async def restart_browser(self):
+        """
+        Chrome'u ayni profille kapatip yeniden baslat ve cekim sayfasina don.
+        Session profilde/session dosyasinda kaldigi icin login gerekmez;
+        gerekirse False doner ve sonraki tur runner'in kurtarma yoluna duser.
+        """
+        t0 = time.perf_counter()
+        async with self._tab_lock:
+            await self.close()
+            await self.start(headless=self._headless)
+        self._browser_restarts += 1
+        ok = await self.check_and_restore_session() and await self.ensure_withdrawals_page()
+        print(
+            f"[+] Chrome yeniden baslatildi ({(time.perf_counter() - t0) * 1000:.0f}ms"
+            f"{'' if ok else ', session/sayfa hazir degil'})",
+            flush=True,
+        )
+        return ok
+
+    async def _swap_main_tab(self, new_tab):
+        """Hazir sekmeyi ana sekme yap, eskisini ve durum sekmelerini kapat."""
+        async with self._tab_lock:
+            old_tab = self._tab
+            self._tab = new_tab
+            self._tab_born = time.monotonic()
+            # Sekmeye bagli durumlar yeni sekmede yeniden kurulur
+            self._filters_set = False
+            self._capture_enabled = False
+            self._capture_pending.clear()
+            self._capture_requests.clear()
+            await self._close_tab(old_tab)
+            self._perf_tabs.discard(id(old_tab))
+
+            # Durum sekmeleri de ayni yasta; bir sonraki taramada yeniden acilirlar
+            for tab in list(self._status_tabs.values()):
+                await self._close_tab(tab)
+            self._status_tabs.clear()
+
+    def get_memory_stats(self):
+        """Panel icin bellek serisi ve sekme yenileme sayisi."""
+        return {
+            "series": list(self._memory_series),
+            "last": self._memory_series[-1] if self._memory_series else None,
+            "tab_recycles": self._tab_recycles,
+            "browser_restarts": self._browser_restarts,
+            "limits": {
+                "js_heap_mb": BOT_MAX_JS_HEAP_MB,
+                "rss_mb": BOT_MAX_RSS_MB,
+                "tab_age_min": BOT_TAB_MAX_AGE_MIN,
+            },
+        }
+
+    def get_panel_stats(self):
+        """Panelin "browser" alanina yazilan tarayici sayaclari."""
+        return {
+            "resource_block": self.get_block_stats(),
+            "memory": self.get_memory_stats(),
+            "session": self.get_session_stats(),
+        }
+
+    # ── Token Suresi + Sessiz Yenileme ───────────────────────────
+
+    def _update_token_exp(self, token):
+        exp = jwt_exp(token)
+        if exp and exp != self._token_exp:
+            self._token_exp = exp
+            left = exp - time.time()
+            print(f"[Session] Token bitisine {left / 60:.0f} dk var", flush=True)
+
+    def token_expires_in(self):
+        """Token bitisine kalan saniye (JWT degilse / bilinmiyorsa None)."""
+        if self._token_exp is None:
+            return None
+        return self._token_exp - time.time()
+
+    def schedule_token_refresh(self):
+        """
+        Token bitisine BOT_TOKEN_REFRESH_LEAD saniyeden az kaldiysa arka
+        planda sessiz yenilemeyi baslat (tarama dongusunu bekletmez).
+        Doner: yenileme baslatildiysa True.
+        """
+        left = self.token_expires_in()
+        if left is None or BOT_TOKEN_REFRESH_LEAD <= 0 or left > BOT_TOKEN_REFRESH_LEAD:
+            return False
+        if self._token_refresh_task is not None and not self._token_refresh_task.done():
+            return False
+        if time.monotonic() < self._token_retry_at:
+            return False
+        if not CRONOS_USERNAME or not CRONOS_PASSWORD:
+            if self._token_refresh_error != "no_credentials":
+                print("[!] Token bitiyor ama CRONOS_USERNAME/PASSWORD yok, yenilenemez", flush=True)
+                self._token_refresh_error = "no_credentials"
+            return False
+        print(f"[Session] Token {left:.0f}s icinde bitiyor, arka planda yenileniyor...", flush=True)
+        self._token_refresh_task = asyncio.create_task(self._silent_relogin())
+        return True
+
+    async def _silent_relogin(self):
+        """
+        Token'i ana sekmenin depolamasina dokunmadan yenile. localStorage ayni
+        profildeki tum sekmelerce paylasildigi icin login ayri bir browser
+        context'te (Target.createBrowserContext: kendi localStorage'i ve
+        cookie'leri) yapilir; ana sekme bu sure boyunca eski token'la taramaya
+        devam eder. Yeni token alininca ana profile yazilir, yeni token'la
+        acilan sekme hazir olunca ana sekmeyle degistirilir.
+        Basarisizlikta ana profilde hicbir sey degismez.
+        """
+        t0 = time.perf_counter()
+        old_token = await self._js("return localStorage.getItem('access_token')")
+        context_id = None
+        try:
+            context_id = await self._browser.create_browser_context()
+            # Cloudflare clearance vb. cookie'ler tasinir; access_token tasinmaz,
+            # SPA bu context'te dogrudan login sayfasini acar
+            cookies = [c for c in map(_to_cookie_param, await self._session_cookies()) if c]
+            if cookies:
+                await self._browser.set_cookies(cookies, browser_context_id=context_id)
+            tab = await self._browser.new_tab(browser_context_id=context_id)
+
+            # save=False: _token_exp ancak yeni token ana profile yazilinca
+            # guncellenir, aksi halde bir hata yenilemenin tekrarini engeller
+            ok = await self.auto_login(tab=tab, save=False)
+            data = await self._js_json(
+                "return {localStorage: Object.assign({}, localStorage)}", tab=tab
+            )
+            storage = (data or {}).get("localStorage") or {}
+            new_token = storage.get("access_token")
+            if not ok or not new_token or new_token == old_token:
+                raise RuntimeError("yeni token alinamadi")
+            new_cookies = [
+                c for c in map(_to_cookie_param, await self._browser.get_cookies(context_id))
+                if c and _is_session_cookie_domain(c.get("domain", ""))
+            ]
+        except Exception as e:
+            self._token_refresh_error = str(e)
+            self._token_retry_at = time.monotonic() + 60
+            print(f"[!] Sessiz token yenileme basarisiz: {e}", flush=True)
+            return False
+        finally:
+            if context_id is not None:
+                try:
+                    await self._browser.delete_browser_context(context_id)
+                except Exception:
+                    pass
+
+        # Yeni token var: simdi ana profile yaz, sonra sekmeyi degistir
+        try:
+            if new_cookies:
+                await self._browser.set_cookies(new_cookies)
+            payload = json.dumps({str(k): str(v) for k, v in storage.items()}, ensure_ascii=False)
+            await self._js("var d = " + payload + "; for (var k in d) localStorage.setItem(k, d[k]);")
+        except Exception as e:
+            self._token_refresh_error = str(e)
+            self._token_retry_at = time.monotonic() + 60
+            print(f"[!] Yeni token ana profile yazilamadi: {e}", flush=True)
+            return False
+        self._update_token_exp(new_token)
+
+        new_tab = await self._open_ready_tab("Yenilenen")
+        if new_tab is not None:
+            await self._swap_main_tab(new_tab)
+        else:
+            # Token profilde; ana sekme bir sonraki yenilemede onu alir
+            print("[!] Yeni token yazildi ama yeni sekme hazir olmadi, ana sekme korunuyor", flush=True)
+        await self.save_session()
+        self._token_refreshes += 1
+        self._token_refresh_error = None
+        self.token_refreshed_at = time.monotonic()
+        print(f"[+] Token sessizce yenilendi ({time.perf_counter() - t0:.1f}s)", flush=True)
+        return True
+
+    def get_session_stats(self):
+        """Panel icin token bitis bilgisi ve yenileme sayaclari."""
+        left = self.token_expires_in()
+        task = self._token_refresh_task
+        return {
+            "token_exp": self._token_exp,
+            "expires_in_s": None if left is None else round(left),
+            "refreshes": self._token_refreshes,
+            "refreshing": task is not None and not task.done(),
+            "last_error": self._token_refresh_error,
+        }
+
+    # ── Kaynak Engelleme (CDP Fetch domain) ──────────────────────
+
+    async def enable_resource_blocking(self, tab=None):
+        """
+        Gorsel, font, medya ve izleme isteklerini CDP Fetch ile engelle.
+        Sadece bu desenlere uyan istekler durdurulur (XHR/script/CSS
+        hic Python'a ugramaz). BOT_BLOCK_ALLOW'daki adresler (Cloudflare
+        challenge vb.) her zaman gecer.
+        """
+        tab = tab or self._tab
+        if id(tab) in self._blocking_tabs:
+            return True
+
+        patterns = [
+            {"urlPattern": "*", "resourceType": rtype, "requestStage": "Request"}
+            for rtype in BOT_BLOCK_TYPES
+        ]
+        patterns += [
+            {"urlPattern": pattern, "requestStage": "Request"}
+            for pattern in TRACKER_URL_PATTERNS + BOT_BLOCK_URLS
+        ]
+
+        async def on_paused(event):
+            await self._on_request_paused(tab, event)
+
+        try:
+            await tab.on("Fetch.requestPaused", on_paused)
+            await tab._execute_command({"method": "Fetch.enable", "params": {"patterns": patterns}})
+        except Exception as e:
+            print(f"[!] Kaynak engelleme acilamadi: {e}", flush=True)
+            return False
+
+        self._blocking_tabs.add(id(tab))
+        if self._block_stats["since"] is None:
+            self._block_stats["since"] = time.time()
+        print(f"[+] Kaynak engelleme aktif ({', '.join(BOT_BLOCK_TYPES)} + izleyiciler)", flush=True)
+        return True
+
+    async def _on_request_paused(self, tab, event):
+        """Durdurulan istegi engelle ya da (allowlist) devam ettir."""
+        params = event.get("params", {})
+        request_id = params.get("requestId")
+        url = params.get("request", {}).get("url", "")
+        try:
+            if any(allowed in url for allowed in BOT_BLOCK_ALLOW):
+                self._block_stats["allowed"] += 1
+                await tab._execute_command(
+                    {"method": "Fetch.continueRequest", "params": {"requestId": request_id}}
+                )
+                return
+
+            rtype = params.get("resourceType", "Other")
+            kind = rtype if rtype in BOT_BLOCK_TYPES else "Tracker"
+            blocked = self._block_stats["blocked"]
+            blocked[kind] = blocked.get(kind, 0) + 1
+            self._block_stats["bytes_saved_est"] += _BLOCK_SIZE_ESTIMATE.get(kind, 10_000)
+            await tab._execute_command({
+                "method": "Fetch.failRequest",
+                "params": {"requestId": request_id, "errorReason": "BlockedByClient"},
+            })
+        except Exception:
+            # Sekme kapandiysa istek zaten dusmustur
+            pass
+
+    def get_block_stats(self):
+        """Session boyunca engellenen istek sayilari ve tahmini tasarruf."""
+        stats = self._block_stats
+        blocked = dict(stats["blocked"])
+        return {
+            "enabled": bool(self._blocking_tabs),
+            "blocked": blocked,
+            "blocked_total": sum(blocked.values()),
+            "allowed": stats["allowed"],
+            "bytes_saved_est": stats["bytes_saved_est"],
+            "since": stats["since"],
+        }
+
+    # ── Network Capture (CDP Network domain) ─────────────────────
+
+    async def enable_network_capture(self):
+        """
+        CDP Network domain'ini ac, panelin _api yanitlarini dinle.
+        getData()'nin yaptigi XHR bittiginde govde Network.getResponseBody
+        ile alinip kuyruga konur; DOM'a hic dokunulmaz.
+        """
+        if self._capture_enabled:
+            return True
+        try:
+            await self._tab.enable_network_events()
+            await self._tab.on("Network.requestWillBeSent", self._on_capture_request)
+            await self._tab.on("Network.responseReceived", self._on_capture_response)
+            await self._tab.on("Network.loadingFinished", self._on_capture_finished)
+            self._capture_enabled = True
+            print(f"[+] Network capture aktif ({BOT_CAPTURE_MATCH})", flush=True)
+            return True
+        except Exception as e:
+            print(f"[!] Network capture acilamadi: {e}", flush=True)
+            return False
+
+    async def _on_capture_request(self, event):
+        """
+        Eslesen istegi gonderildigi tetikleme (generation) ve istek
+        parametreleriyle (status, page ...) kaydet.
+        """
+        params = event.get("params", {})
+        request = params.get("request", {})
+        if BOT_CAPTURE_MATCH not in request.get("url", ""):
+            return
+        self._capture_requests[params.get("requestId")] = {
+            "generation": self._capture_generation,
+            "params": _request_params(request),
+        }
+
+    async def _on_capture_response(self, event):
+        """Eslesen XHR yanitinin meta bilgisini sakla (govde henuz hazir degil)."""
+        params = event.get("params", {})
+        response = params.get("response", {})
+        url = response.get("url", "")
+        if BOT_CAPTURE_MATCH not in url:
+            return
+        request_id = params.get("requestId")
+        request = self._capture_requests.pop(request_id, None)
+        self._capture_pending[request_id] = {
+            "url": url,
+            "status": response.get("status"),
+            "timing": response.get("timing") or {},
+            "generation": request["generation"] if request else None,
+            "params": request["params"] if request else _request_params({"url": url}),
+        }
+
+    async def _on_capture_finished(self, event):
+        """Yanit tamamlaninca govdeyi al, parse edip kuyruga koy."""
+        params = event.get("params", {})
+        request_id = params.get("requestId")
+        meta = self._capture_pending.pop(request_id, None)
+        if meta is None:
+            return
+        try:
+            body = await self._tab.get_network_response_body(request_id)
+            payload = json.loads(body)
+        except Exception as e:
+            print(f"[!] Yanit govdesi okunamadi ({meta['url']}): {e}", flush=True)
+            return
+
+        timing = meta.pop("timing")
+        request_time = timing.get("requestTime")
+        finished = params.get("timestamp")
+        meta["network_ms"] = (finished - request_time) * 1000 if request_time and finished else None
+        meta["ttfb_ms"] = timing.get("receiveHeadersEnd")
+        meta["bytes"] = params.get("encodedDataLength")
+        meta["payload"] = payload
+        self._capture_queue.put_nowait(meta)
+
+    async def _capture_trigger(self, script, expect=None):
+        """
+        Script'i calistir (getData tetikler), ardindan gelen ilk liste
+        yanitini bekle. Doner: meta + items + total, ya da None.
+
+        Onceki (zaman asimina ugramis) bir tetiklemenin gec gelen yaniti
+        kabul edilmez: istek bu tetiklemeden once gonderildiyse veya
+        expect'teki parametreler (status, page) istekte olup farkliysa atlanir.
+        """
+        while not self._capture_queue.empty():
+            self._capture_queue.get_nowait()
+        self._capture_generation += 1
+        generation = self._capture_generation
+
+        if not await self._js_json(script):
+            return None
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + BOT_FILTER_TIMEOUT
+        while True:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return None
+            try:
+                meta = await asyncio.wait_for(self._capture_queue.get(), remaining)
+            except asyncio.TimeoutError:
+                return None
+            if not _capture_matches(meta, generation, expect):
+                print(f"  [!] Eski/baska filtreye ait yanit atlandi: {meta['url']}", flush=True)
+                continue
+            items, total = extract_items(meta["payload"])
+            if items or total is not None:
+                meta["items"] = items
+                meta["total"] = total
+                return meta
+
+    async def _scan_all_network(self, statuses):
+        """
+        Durumlari Vue uzerinden tetikle, sonuclari network yanitlarindan oku.
+        Sonuc DOM motoruyla ayni formatta; "timing" icinde her durum icin
+        ag suresi (network_ms), ilk bayt (ttfb_ms) ve boyut (bytes) bulunur.
+        """
+        if not await self.enable_network_capture():
+            return None
+
+        t_all = time.perf_counter()
+        result = {}
+        timing = {}
+        any_ok = False
+        timeout_ms = int(BOT_FILTER_TIMEOUT * 1000)
+
+        for filter_val, key, label in statuses:
+            t0 = time.perf_counter()
+            meta = await self._capture_trigger(
+                "if (!window._finFetch) return null; "
+                "window._finFetch('" + str(filter_val) + "', " + str(timeout_ms) + ", "
+                + str(BOT_PAGE_SIZE) + "); return true;",
+                expect={"status": filter_val, "page": 1},
+            )
+            if meta is None:
+                print(f"  [!] {label}: API yaniti yakalanamadi!", flush=True)
+                result[key] = []
+                result[f"{key}_total_count"] = 0
+                result.setdefault("failed", []).append(key)
+                timing[key] = None
+                continue
+
+            any_ok = True
+            raw_items = list(meta["items"])
+            real_count = meta["total"] if meta["total"] is not None else len(raw_items)
+            pages = 1
+            network_ms = meta["network_ms"] or 0
+            size = meta["bytes"] or 0
+
+            # Tek sayfaya sigmadiysa sonraki sayfalari da yakala
+            while len(raw_items) < real_count and pages <= BOT_MAX_PAGES:
+                more = await self._capture_trigger(
+                    "return window._finGoPage ? window._finGoPage(" + str(pages + 1) + ", true) : false;",
+                    expect={"status": filter_val, "page": pages + 1},
+                )
+                if not more or not more["items"]:
+                    print(f"  [!] {label}: tum sayfalar okunamadi", flush=True)
+                    break
+                raw_items.extend(more["items"])
+                pages += 1
+                network_ms += more["network_ms"] or 0
+                size += more["bytes"] or 0
+            if pages > 1:
+                await self._js("window._finGoPage && window._finGoPage(1, false)")
+
+            items = dedupe_by_id(normalize_withdrawals(raw_items))
+            result[key] = items
+            result[f"{key}_total_count"] = real_count
+            timing[key] = {
+                "wait_ms": (time.perf_counter() - t0) * 1000,
+                "network_ms": network_ms,
+                "ttfb_ms": meta["ttfb_ms"],
+                "bytes": size,
+                "pages": pages,
+            }
+            total = self._calc_total(items)
+            print(f"  [{label}] {real_count} cekim ({len(items)} okunan), {total:,.0f} TRY", flush=True)
+
+        if not any_ok:
+            return None
+
+        timing["total_ms"] = (time.perf_counter() - t_all) * 1000
+        print(f"  [Sure] toplam {timing['total_ms']:.0f}ms (network capture)", flush=True)
+        result["timing"] = timing
+        return result
+
+    async def ensure_withdrawals_page(self):
+        """
+        Ana sekme cekim sayfasinda ve Vue component hazir mi? Degilse sayfaya
+        git ve bekle. Yedek tarayici da bununla taramaya hazir tutulur.
+        """
+        # Cekim sayfasina git (ilk seferde veya farkli sayfadaysak)
+        current_url = await self._js("return window.location.href") or ""
+        if "/financial/financial-transactions" not in current_url:
+            print("[*] Cekim sayfasina gidiliyor...", flush=True)
+            await self._tab.go_to(WITHDRAWALS_URL)
+            if not await self._wait_withdrawals_table(timeout=20):
+                print("[!] Cekim sayfasi yuklenemedi!", flush=True)
+                return False
+            print("[+] Cekim sayfasi yuklendi!", flush=True)
+
+        # Vue component'ini bul (tablo geldiyse mount olmustur, birkac deneme yeter)
+        if not await self._wait_vue_component(timeout=5):
+            print("[!] Vue component bulunamadi!", flush=True)
+            return False
+        return True
+
     async def refresh_withdrawals_page(self):
         """Cekim sayfasini yenile."""
         try:
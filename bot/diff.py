@@ -0,0 +1,211 @@
+"""
+Tarama turlari arasi fark (diff) motoru.
+=========================================
+Her turda gelen durum listelerini (beklemede/reserve/islemde) bir onceki
+tur ile cekim ID'si uzerinden karsilastirir ve sadece degisiklikleri uretir:
+
+    added        - ilk kez gorulen cekim
+    removed      - artik hicbir durumda olmayan cekim (onaylandi/reddedildi)
+    changed      - ayni durumda kalan ama alanlari degisen cekim
+    transitioned - durum degistiren cekim (orn. beklemede -> reserve)
+
+Sadece guncel snapshot (id -> durum, kayit) ve son tur farki tutulur;
+panel, DB ve bildirimler butun listeyi degil sadece degisiklikleri isler.
+
+Kismi turlarda (zamanlayici sadece zamani gelen durumlari tarar) bir
+durumdan kaybolan cekim hemen 'removed' sayilmaz: taranmamis bir duruma
+gecmis olabilir. Kalan durumlar da eksiksiz taranana kadar bekletilir
+(pending), sonra 'transitioned' ya da 'removed' olarak cozulur. Cozum
+icin taranmasi gereken durumlar delta["unresolved"]'da doner.
+"""
+from bot.transactions import SCAN_STATUSES
+
+STATUS_KEYS = tuple(key for _, key, _ in SCAN_STATUSES)
+
+# Karsilastirmada dikkate alinmayan alanlar (her turda degisebilen/turetilmis)
+IGNORED_FIELDS = frozenset({"has_accept_btn", "has_reject_btn"})
+
+
+def _item_id(item):
+    if not isinstance(item, dict):
+        return ""
+    return str(item.get("id", "") or "")
+
+
+def _changed_fields(old, new):
+    """Iki kayit arasinda degisen alan adlari (sirali)."""
+    keys = (set(old) | set(new)) - IGNORED_FIELDS
+    return sorted(k for k in keys if old.get(k) != new.get(k))
+
+
+def _is_complete(result, key):
+    """
+    Durum listesinin tamami okundu mu?
+    Basarisiz veya eksik sayfali durumlarda gorunmeyen kayitlar
+    'removed' sayilmaz (sadece okunamamis olabilirler).
+    """
+    if key not in result or key in result.get("failed", ()):
+        return False
+    items = result.get(key) or []
+    total = result.get(f"{key}_total_count")
+    return total is None or len(items) >= total
+
+
+class ScanDiff:
+    """
+    ID bazli tur-arasi fark motoru.
+
+        diff = ScanDiff()
+        delta = diff.apply(scan_result)
+        delta["added"], delta["removed"], delta["changed"], delta["transitioned"]
+    """
+
+    def __init__(self, status_keys=STATUS_KEYS, max_pending_cycles=50):
+        """
+        max_pending_cycles: bir durum hic eksiksiz okunamazsa bekleyen
+        kayit bu kadar tur sonra 'removed' sayilir (sinirsiz birikmesin).
+        """
+        self.status_keys = tuple(status_keys)
+        self.max_pending_cycles = max_pending_cycles
+        self._snapshot = {}     # id -> (durum anahtari, kayit)
+        self._pending = {}      # id -> (durum, kayit, kontrol edilmemis durumlar, tur)
+        self.cycle = 0
+        self.last_delta = None
+
+    @property
+    def snapshot(self):
+        """Guncel durum: {id: (durum, kayit)} (salt okunur kullanin)."""
+        return self._snapshot
+
+    @property
+    def pending(self):
+        """Kayboldugu durumdan sonra henuz bulunamayan cekimler: {id: (durum, kayit)}."""
+        return {item_id: (key, item) for item_id, (key, item, _, _) in self._pending.items()}
+
+    def reset(self):
+        self._snapshot = {}
+        self._pending = {}
+        self.cycle = 0
+        self.last_delta = None
+
+    def apply(self, result):
+        """
+        Yeni tarama sonucunu snapshot'a uygula ve farki dondur.
+
+        Returns:
+            {
+              "cycle": int, "first": bool, "empty": bool,
+              "added":        [{"status": key, "item": {...}}],
+              "removed":      [{"status": key, "item": {...}}],
+              "changed":      [{"status": key, "item": {...}, "fields": [...]}],
+              "transitioned": [{"from": key, "to": key, "item": {...}, "fields": [...]}],
+              "counts": {"added": n, "removed": n, "changed": n, "transitioned": n},
+              "pending": n, "unresolved": [key, ...], "vanished": [key, ...],
+            }
+        """
+        first = self.cycle == 0
+        self.cycle += 1
+        old = self._snapshot
+        pending = self._pending
+        new = {}
+        added, removed, changed, transitioned = [], [], [], []
+
+        for key in self.status_keys:
+            if key not in result or key in result.get("failed", ()):
+                continue
+            for item in result.get(key) or []:
+                item_id = _item_id(item)
+                if not item_id or item_id in new:
+                    continue
+                new[item_id] = (key, item)
+                prev = old.get(item_id)
+                if prev is None and item_id in pending:
+                    prev = pending[item_id][:2]
+                if prev is None:
+                    added.append({"status": key, "item": item})
+                    continue
+                prev_key, prev_item = prev
+                if prev_item is item and prev_key == key:
+                    continue
+                fields = _changed_fields(prev_item, item)
+                if prev_key != key:
+                    transitioned.append({"from": prev_key, "to": key, "item": item, "fields": fields})
+                elif fields:
+                    changed.append({"status": key, "item": item, "fields": fields})
+
+        complete = {key: _is_complete(result, key) for key in self.status_keys}
+        still_pending = {}
+        vanished = set()
+        for item_id, (prev_key, prev_item, unchecked, since) in pending.items():
+            if item_id in new:
+                continue
+            unchecked = {key for key in unchecked if not complete[key]}
+            if not unchecked or self.cycle - since >= self.max_pending_cycles:
+                removed.append({"status": prev_key, "item": prev_item})
+            else:
+                still_pending[item_id] = (prev_key, prev_item, unchecked, since)
+
+        for item_id, (prev_key, prev_item) in old.items():
+            if item_id in new:
+                continue
+            if not complete[prev_key]:
+                # Durum okunamadi/eksik okundu: kaydi oldugu gibi koru
+                new[item_id] = (prev_key, prev_item)
+                continue
+            unchecked = {key for key in self.status_keys if key != prev_key and not complete[key]}
+            if unchecked:
+                # Bu turda taranmayan bir duruma gecmis olabilir
+                still_pending[item_id] = (prev_key, prev_item, unchecked, self.cycle)
+                vanished.add(prev_key)
+            else:
+                removed.append({"status": prev_key, "item": prev_item})
+
+        self._snapshot = new
+        self._pending = still_pending
+        unresolved = set()
+        for _, _, unchecked, _ in still_pending.values():
+            unresolved |= unchecked
+        counts = {
+            "added": len(added),
+            "removed": len(removed),
+            "changed": len(changed),
+            "transitioned": len(transitioned),
+        }
+        delta = {
+            "cycle": self.cycle,
+            "first": first,
+            "empty": not any(counts.values()),
+            "added": added,
+            "removed": removed,
+            "changed": changed,
+            "transitioned": transitioned,
+            "counts": counts,
+            "pending": len(still_pending),
+            "unresolved": [key for key in self.status_keys if key in unresolved],
+            "vanished": [key for key in self.status_keys if key in vanished],
+        }
+        self.last_delta = delta
+        return delta
+
+
+def delta_events(delta, limit=None):
+    """
+    Farki panel/bildirim icin duz olay listesine cevir (en yeni once).
+        [{"event": "added", "id": ..., "status": ..., "from": ..., "fields": [...]}]
+    """
+    events = []
+    for kind in ("transitioned", "added", "changed", "removed"):
+        for entry in delta.get(kind, ()):
+            item = entry["item"]
+            events.append({
+                "event": kind,
+                "id": _item_id(item),
+                "status": entry.get("to", entry.get("status")),
+                "from": entry.get("from"),
+                "fields": entry.get("fields", []),
+                "username": item.get("username", ""),
+                "amount": item.get("amount"),
+            })
+            if limit is not None and len(events) >= limit:
+                return events
+    return events
@@ -0,0 +1,217 @@
+"""
+Sicak yedek (warm standby) tarayici ile devralma.
+=================================================
+Ana Chrome cokerse veya session duserse try_recover_session / 600s
+wait_for_login boyunca hic veri gelmiyordu. BOT_STANDBY=1 ile ikinci bir
+CronosBrowser ayri profilde acilir, login olur ve cekim sayfasinda hazir
+bekler:
+
+  - Ana tarayici turda basarisiz olursa (session dustu / CDP hatasi) yedek
+    ayni turda taramayi devralir
+  - Devreden cikan tarayici arka planda toparlanir (sayfa yenileme, olmazsa
+    Chrome yeniden baslatma) ve yeni yedek olur
+  - Yedek her BOT_STANDBY_CHECK_EVERY turda saglik kontrolunden gecer
+
+Yedek ilk acilista ana tarayicinin session_data.json snapshot'ini yukler
+(ayni token), bu yuzden ayri bir login gerektirmez. Iki Chrome = yaklasik
+iki kat bellek.
+"""
+import asyncio
+import time
+from datetime import datetime, timezone
+
+
+class BrowserFailover:
+    """
+    Aktif + yedek tarayici ciftini yonetir.
+
+        fo = BrowserFailover(browser, lambda: CronosBrowser(profile_dir=..., name="yedek"))
+        fo.start()
+        ok = await run_cycle(fo.active)
+        if not ok and await fo.take_over("session dustu"):
+            ok = await run_cycle(fo.active)
+        if ok:
+            fo.scan_succeeded()
+            await fo.maintain()
+    """
+
+    def __init__(self, primary, make_standby, headless=False, check_every=10,
+                 health_timeout=10.0):
+        self.active = primary
+        self.standby = None
+        self._make_standby = make_standby      # () -> baslatilmamis CronosBrowser
+        self._headless = headless
+        self.check_every = max(int(check_every), 1)
+        self.health_timeout = health_timeout
+        self._ready = False
+        self._task = None                      # yedek hazirlama / kurtarma gorevi
+        self._cycles = 0
+        self._failover_t0 = None
+        self.failovers = 0
+        self.last_failover_ms = None
+        self.last_failover_at = None
+        self.last_reason = None
+        self.last_error = None
+
+    @property
+    def standby_ready(self):
+        return self.standby is not None and self._ready
+
+    def start(self):
+        """Yedek tarayiciyi arka planda ac ve hazirla."""
+        self._spawn(self._prepare_standby())
+
+    def _spawn(self, coro):
+        self._task = asyncio.create_task(coro)
+
+    def _busy(self):
+        return self._task is not None and not self._task.done()
+
+    async def _warm(self, browser):
+        """Session'i dogrula (gerekirse login) ve cekim sayfasinda hazir beklet."""
+        ok = await browser.check_and_restore_session()
+        if not ok:
+            if self._headless:
+                ok = await browser.auto_login()
+            else:
+                print(f"[Yedek] {browser.name}: tarayicida giris bekleniyor...", flush=True)
+                ok = await browser.wait_for_login(max_wait=600)
+        if not ok:
+            return False
+        return await browser.ensure_withdrawals_page()
+
+    async def _prepare_standby(self):
+        browser = self._make_standby()
+        t0 = time.monotonic()
+        try:
+            await browser.start(headless=self._headless)
+            ok = await self._warm(browser)
+        except Exception as e:
+            self.last_error = f"{type(e).__name__}: {e}"
+            ok = False
+        if not ok:
+            print(f"[Yedek] Yedek tarayici hazirlanamadi ({self.last_error or 'login yok'})", flush=True)
+            try:
+                await browser.close()
+            except Exception:
+                pass
+        # Basarisizsa da tutulur: ayni profille sonra yeniden denenir
+        self.standby, self._ready = browser, ok
+        if not ok:
+            return
+        print(f"[Yedek] {browser.name} hazir ({time.monotonic() - t0:.1f}s)", flush=True)
+
+    async def _recover(self, browser):
+        """
+        Devreden cikan tarayiciyi toparla: once sayfa yenileme + session,
+        olmazsa Chrome'u ayni profille yeniden baslat. Basarida yeni yedek olur.
+        """
+        print(f"[Yedek] {browser.name} arka planda toparlaniyor...", flush=True)
+        ok = False
+        try:
+            await browser.bypass_cloudflare()
+            ok = await self._warm(browser)
+        except Exception as e:
+            self.last_error = f"{type(e).__name__}: {e}"
+        if not ok:
+            print(f"[Yedek] {browser.name} yeniden baslatiliyor...", flush=True)
+            try:
+                await browser.close()
+            except Exception:
+                pass
+            try:
+                await browser.start(headless=self._headless)
+                ok = await self._warm(browser)
+            except Exception as e:
+                self.last_error = f"{type(e).__name__}: {e}"
+                ok = False
+        if not ok:
+            print(f"[Yedek] {browser.name} toparlanamadi, {self.check_every} tur sonra tekrar", flush=True)
+            try:
+                await browser.close()
+            except Exception:
+                pass
+        self.standby, self._ready = browser, ok
+        if not ok:
+            return
+        print(f"[Yedek] {browser.name} toparlandi, yedek olarak bekliyor", flush=True)
+
+    async def take_over(self, reason=""):
+        """
+        Aktif tarayici basarisiz: hazir yedek varsa aktif yap, eskisini arka
+        planda toparla. Doner: devralma yapildiysa True.
+        """
+        if not self.standby_ready:
+            return False
+        failed, self.active = self.active, self.standby
+        # Eski aktif yedek yuvasina gecer, toparlanana kadar hazir degil
+        self.standby, self._ready = failed, False
+        self._failover_t0 = time.monotonic()
+        self.last_reason = reason
+        print(f"[Yedek] Devralma: {failed.name} -> {self.active.name} ({reason})", flush=True)
+        self._spawn(self._recover(failed))
+        return True
+
+    def scan_succeeded(self):
+        """Basarili tur: devralma sonrasi ilk basarili taramaysa sureyi kaydet."""
+        if self._failover_t0 is None:
+            return
+        self.last_failover_ms = round((time.monotonic() - self._failover_t0) * 1000)
+        self.last_failover_at = datetime.now(timezone.utc).isoformat()
+        self.failovers += 1
+        self._failover_t0 = None
+        print(f"[Yedek] Devralma tamam: {self.last_failover_ms}ms icinde veri geldi", flush=True)
+
+    async def maintain(self):
+        """
+        Her tur sonrasi cagrilir (her check_every turda bir is yapar): hazir
+        olmayan yedegi yeniden dene, hazirsa saglik kontrolu yap (login +
+        token yenileme zamanlamasi). Profil sabit kalir (iki Chrome ayni
+        profili paylasamaz).
+        """
+        self._cycles += 1
+        if self._busy() or self._cycles % self.check_every:
+            return
+        if self.standby is None:
+            self.start()
+            return
+        if not self._ready:
+            # Onceki hazirlama/kurtarma basarisiz: ayni profille yeniden dene
+            self._spawn(self._recover(self.standby))
+            return
+        try:
+            ok = await asyncio.wait_for(self.standby.is_logged_in(), self.health_timeout)
+        except Exception:
+            ok = False
+        if ok:
+            self.standby.schedule_token_refresh()
+            return
+        print(f"[Yedek] {self.standby.name} saglik kontrolunden gecemedi", flush=True)
+        self._ready = False
+        self._spawn(self._recover(self.standby))
+
+    def snapshot(self):
+        """Panel / status API icin devralma durumu."""
+        return {
+            "active": self.active.name,
+            "standby": self.standby.name if self.standby is not None else None,
+            "standby_ready": self.standby_ready,
+            "recovering": self._busy(),
+            "failovers": self.failovers,
+            "last_failover_ms": self.last_failover_ms,
+            "last_failover_at": self.last_failover_at,
+            "last_reason": self.last_reason,
+            "last_error": self.last_error,
+        }
+
+    async def close(self):
+        """Arka plan gorevini durdur, yedek tarayiciyi kapat (aktif disarida kapanir)."""
+        if self._busy():
+            self._task.cancel()
+            try:
+                await self._task
+            except BaseException:
+                pass
+        if self.standby is not None:
+            await self.standby.close()
+            self.standby = None
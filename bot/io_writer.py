@@ -0,0 +1,322 @@
+"""
+Event loop disi disk/konsol yazimi + loop gecikmesi olcumu.
+============================================================
+Tarama dongusu async ama panel journal/snapshot yazimi, session dosyasi
+ve print(..., flush=True) loglari event loop uzerinde senkron calisiyordu;
+disk yavasken CDP mesajlari da bekliyordu.
+
+  IOWriter        - tek thread'li yazici kuyrugu. Anahtarli isler birlesir
+                    (coalescing): kuyrukta bekleyen ayni anahtarli isin
+                    yerine sadece en yenisi calisir (orn. panel snapshot'i,
+                    session dosyasi). Anahtarsiz isler sirayla calisir;
+                    kuyruk max_pending'i asarsa submit beklemez (loop
+                    thread'inden cagrilir): yeni isler kuyrugun sonundaki
+                    tek bir toplu ise eklenir, o da max_overflow'u asarsa
+                    is atilir ve submit False doner.
+  AsyncStream     - sys.stdout/sys.stderr yerine: write() sadece tampona
+                    ekler, arka plan thread'i gercek akisa yazar. Tampon
+                    doluysa yazilan metin atilir ve sayilir.
+  LoopLagMonitor  - asyncio.sleep(interval) ne kadar gec uyaniyor?
+                    Loop'u bloklayan her sey burada gorunur.
+
+Yazici baslatilmadan (io_writer.start()) submit edilen isler hemen,
+cagiran thread'de calisir (benchmark / web paneli gibi kullanimlar icin).
+"""
+import asyncio
+import atexit
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+
+
+class _Batch(list):
+    """Kuyruk doluyken biriken anahtarsiz isler (tek kuyruk yeri, sirali)."""
+
+
+class IOWriter:
+    """
+    Event loop'tan disk islerini alan tek thread'li yazici.
+
+        io_writer.start()
+        io_writer.submit(lambda: path.write_text(text), key=str(path))
+        io_writer.flush()        # kapanista bekleyenleri bitir
+    """
+
+    def __init__(self, max_pending=1000, max_overflow=10_000, name="io-writer"):
+        self.max_pending = max_pending
+        self.max_overflow = max_overflow
+        self.name = name
+        self._jobs = OrderedDict()       # anahtar -> fn (sirali)
+        self._cond = threading.Condition()
+        self._thread = None
+        self._busy = False
+        self._seq = 0
+        self._overflow = 0               # toplu islerde bekleyen is sayisi
+        self.written = 0
+        self.coalesced = 0
+        self.batched = 0
+        self.dropped = 0
+        self.errors = 0
+        self.last_error = None
+        self.max_pending_seen = 0
+        self.last_job_ms = 0.0
+        self.max_job_ms = 0.0
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return self
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+        atexit.register(self.flush, 5.0)
+        return self
+
+    def submit(self, fn, key=None):
+        """
+        fn'i yazici thread'ine ver. key verilirse kuyrukta bekleyen ayni
+        anahtarli isin yerini alir (siradaki yeri korunur).
+        Hicbir zaman beklemez. Doner: is atildiysa False.
+        """
+        if not self.running:
+            self._call(fn)
+            return True
+        with self._cond:
+            if key is not None and key in self._jobs:
+                self._jobs[key] = fn
+                self.coalesced += 1
+                return True
+            if key is None and len(self._jobs) >= self.max_pending:
+                # Disk yetismiyor: loop'u bekletme. Sira korunsun diye sadece
+                # kuyrugun en sonundaki toplu ise eklenir; yoksa yenisi acilir.
+                if self._overflow >= self.max_overflow:
+                    self.dropped += 1
+                    self.last_error = "kuyruk dolu, is atildi"
+                    return False
+                last = next(reversed(self._jobs))
+                if isinstance(last, tuple) and last[0] == "_batch":
+                    self._jobs[last].append(fn)
+                else:
+                    self._seq += 1
+                    self._jobs[("_batch", self._seq)] = _Batch([fn])
+                self._overflow += 1
+                self.batched += 1
+                self.max_pending_seen = max(self.max_pending_seen, len(self._jobs) + self._overflow)
+                self._cond.notify_all()
+                return True
+            if key is None:
+                self._seq += 1
+                key = ("_seq", self._seq)
+            self._jobs[key] = fn
+            self.max_pending_seen = max(self.max_pending_seen, len(self._jobs))
+            self._cond.notify_all()
+            return True
+
+    def _call(self, fn):
+        t0 = time.perf_counter()
+        try:
+            fn()
+            self.written += 1
+        except Exception as e:
+            self.errors += 1
+            self.last_error = f"{type(e).__name__}: {e}"
+        self.last_job_ms = (time.perf_counter() - t0) * 1000
+        self.max_job_ms = max(self.max_job_ms, self.last_job_ms)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._jobs:
+                    self._busy = False
+                    self._cond.notify_all()
+                    self._cond.wait()
+                _, fn = self._jobs.popitem(last=False)
+                if isinstance(fn, _Batch):
+                    self._overflow -= len(fn)
+                self._busy = True
+                self._cond.notify_all()
+            if isinstance(fn, _Batch):
+                for job in fn:
+                    self._call(job)
+            else:
+                self._call(fn)
+
+    def pending(self):
+        with self._cond:
+            return len(self._jobs) + self._overflow
+
+    def flush(self, timeout=None):
+        """Kuyruk bosalana ve calisan is bitene kadar bekle. Doner: bosaldiysa True."""
+        if not self.running:
+            return True
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._jobs or self._busy:
+                left = None if deadline is None else deadline - time.monotonic()
+                if left is not None and left <= 0:
+                    return False
+                self._cond.wait(left)
+        return True
+
+    def stats(self):
+        return {
+            "running": self.running,
+            "pending": self.pending(),
+            "written": self.written,
+            "coalesced": self.coalesced,
+            "batched": self.batched,
+            "dropped": self.dropped,
+            "errors": self.errors,
+            "last_error": self.last_error,
+            "max_pending_seen": self.max_pending_seen,
+            "last_job_ms": round(self.last_job_ms, 2),
+            "max_job_ms": round(self.max_job_ms, 2),
+        }
+
+
+class AsyncStream:
+    """
+    Tamponlu konsol akisi: write() loop'u bloklamaz, thread gercek akisa
+    yazar. Tampon max_chars'i asarsa yazilan metin atilir; atlanan miktar
+    bir sonraki yazimda tek satirla bildirilir.
+    """
+
+    def __init__(self, raw, max_chars=1_000_000, name="async-stdout"):
+        self.raw = raw
+        self.max_chars = max_chars
+        self._buf = []
+        self._size = 0
+        self._cond = threading.Condition()
+        self._writing = False
+        self._dropped = 0
+        self.dropped_chars = 0
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def write(self, s):
+        if not s:
+            return 0
+        with self._cond:
+            if self._size >= self.max_chars:
+                # Konsol yetismiyor: loop'u bekletmek yerine logu at
+                self._dropped += len(s)
+                self.dropped_chars += len(s)
+                return len(s)
+            self._buf.append(s)
+            self._size += len(s)
+            self._cond.notify_all()
+        return len(s)
+
+    def flush(self):
+        # print(..., flush=True) bloklamasin: thread zaten hemen yaziyor
+        pass
+
+    def drain(self, timeout=2.0):
+        """Tampon gercek akisa yazilana kadar bekle (kapanis)."""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while (self._buf or self._writing) and time.monotonic() < deadline:
+                self._cond.wait(0.05)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._buf:
+                    self._writing = False
+                    self._cond.notify_all()
+                    self._cond.wait()
+                chunk = "".join(self._buf)
+                if self._dropped:
+                    chunk = f"[IO] konsol tamponu dolu, {self._dropped} karakter log atlandi\n" + chunk
+                    self._dropped = 0
+                self._buf.clear()
+                self._size = 0
+                self._writing = True
+                self._cond.notify_all()
+            try:
+                self.raw.write(chunk)
+                self.raw.flush()
+            except Exception:
+                pass
+
+    def __getattr__(self, name):
+        # encoding, isatty, fileno ... gercek akistan
+        return getattr(self.raw, name)
+
+
+def install_async_stdout():
+    """sys.stdout / sys.stderr'i AsyncStream ile sar (bir kez)."""
+    streams = []
+    for attr in ("stdout", "stderr"):
+        current = getattr(sys, attr)
+        if isinstance(current, AsyncStream) or current is None:
+            continue
+        stream = AsyncStream(current, name=f"async-{attr}")
+        setattr(sys, attr, stream)
+        streams.append(stream)
+    for stream in streams:
+        atexit.register(stream.drain)
+    return streams
+
+
+class LoopLagMonitor:
+    """
+    Event loop gecikmesi: her interval'de uyanip beklenenden ne kadar gec
+    uyandigini olcer. warn_ms'i asan gecikmeler 'stall' sayilir ve loglanir.
+    """
+
+    def __init__(self, interval=0.1, warn_ms=100.0, window=600):
+        self.interval = interval
+        self.warn_ms = warn_ms
+        self._samples = deque(maxlen=window)
+        self._task = None
+        self.stalls = 0
+        self.max_ms = 0.0
+        self.last_stall = None
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        return self
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            t0 = loop.time()
+            await asyncio.sleep(self.interval)
+            lag_ms = max(0.0, (loop.time() - t0 - self.interval) * 1000)
+            self._samples.append(lag_ms)
+            self.max_ms = max(self.max_ms, lag_ms)
+            if self.warn_ms and lag_ms >= self.warn_ms:
+                self.stalls += 1
+                self.last_stall = {"ms": round(lag_ms), "at": time.strftime("%H:%M:%S")}
+                print(f"[IO] Event loop {lag_ms:.0f}ms bloklandi", flush=True)
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+
+    def stats(self):
+        samples = sorted(self._samples)
+
+        def pct(p):
+            if not samples:
+                return None
+            return round(samples[min(len(samples) - 1, int(len(samples) * p))], 1)
+
+        return {
+            "interval_ms": round(self.interval * 1000),
+            "p50_ms": pct(0.50),
+            "p99_ms": pct(0.99),
+            "window_max_ms": round(samples[-1], 1) if samples else None,
+            "max_ms": round(self.max_ms, 1),
+            "stalls": self.stalls,
+            "last_stall": self.last_stall,
+        }
+
+
+# Surec genelinde tek yazici (runner baslatir; baslatilmazsa isler senkron calisir)
+io_writer = IOWriter()
@@ -6,16 +6,19 @@ kullanici 1 kere login yapar, sonra cekim sayfasini
 DOM scraping ile okuyarak surekli tarar.
 Web panel (FastAPI) ile ayni anda calisir.
 
-API KULLANMAZ - panelde ne goruyorsaniz aynen onu ceker.
+Varsayilan modda API KULLANMAZ - panelde ne goruyorsaniz aynen onu ceker.
+BOT_MODE=hybrid ise Chrome sadece Cloudflare + session icin acik tutulur,
+periyodik tarama CronosAPI (httpx) ile yapilir.
 
 Kullanim:
     python -m bot.runner
 """
 import asyncio
-import json
 import os
 import sys
 import threading
+import time
+from collections import ChainMap
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
 
@@ -27,32 +30,104 @@ if sys.platform == "win32":
     sys.stdout.reconfigure(encoding="utf-8", errors="replace")
     sys.stderr.reconfigure(encoding="utf-8", errors="replace")
 
-from config.settings import BOT_SCAN_INTERVAL
+from config.settings import (
+    BOT_SCAN_INTERVAL, BOT_MODE, BOT_API_SCAN_INTERVAL, BOT_AUTH_REFRESH_SECONDS,
+    BOT_PAGE_SIZE, BOT_MAX_PAGES,
+    BOT_STATUS_INTERVALS, BOT_ADAPTIVE_SCAN, BOT_MIN_SCAN_INTERVAL, BOT_SCAN_BACKOFF_MAX,
+    BOT_STANDBY, BOT_STANDBY_PROFILE_DIR, BOT_STANDBY_CHECK_EVERY,
+    BOT_PANEL_SNAPSHOT_EVERY, BOT_ASYNC_IO, BOT_LOOP_LAG_WARN_MS, BOT_STATE_CHANNEL,
+)
+from bot.transactions import calc_total
+from bot.diff import ScanDiff, delta_events
+from bot.scheduler import ScanScheduler, parse_status_intervals
+from bot.state_store import PanelStateStore
+from bot.io_writer import io_writer, install_async_stdout, LoopLagMonitor
 
 DATA_FILE = Path("bot_data.json")
 
+# Turlar arasi fark motoru (id -> durum snapshot'i)
+_scan_diff = ScanDiff()
 
-def _calc_total(items):
-    """Cekim listesinin toplam tutarini hesapla."""
-    total = 0
-    for r in items:
-        try:
-            amt = r.get("amount", "0")
-            clean = str(amt).replace("TRY", "").replace("TL", "").replace("\u20ba", "").strip()
-            clean = clean.replace(".", "").replace(",", ".")
-            total += float(clean) if clean else 0
-        except (ValueError, TypeError):
-            pass
-    return total
+# Tarama zamanlayicisi (main() icinde kurulur)
+_scheduler = None
+
+# Sicak yedek tarayici yoneticisi (BOT_STANDBY, main() icinde kurulur)
+_failover = None
+
+# Acilis sureleri (saniye): chrome, session, login, ilk basarili tarama
+_startup = {}
+
+# Panelde tutulan son degisiklik olayi sayisi
+MAX_CHANGE_EVENTS = 100
+
+# Panel durumu: bellek + journal + atomik snapshot (ilk update_panel'de yuklenir)
+_store = None
+_panel_synced = False
+
+# Event loop gecikme olcumu (BOT_ASYNC_IO, main() icinde baslar)
+_lag_monitor = None
+
+
+def _get_store():
+    global _store
+    if _store is None:
+        _store = PanelStateStore(
+            DATA_FILE, compact_every=BOT_PANEL_SNAPSHOT_EVERY, writer=io_writer,
+            channel=_state_channel(),
+        )
+        _store.load()
+        if _store.channel is not None:
+            # Ayri web sureci durumu bastan kursun (seq sifirlanmis olabilir)
+            _store.compact(reset=True)
+    return _store
+
+
+def _state_channel():
+    """BOT_STATE_CHANNEL=postgres ise web sureci icin yayinci (yoksa None)."""
+    if BOT_STATE_CHANNEL != "postgres":
+        return None
+    try:
+        from database.state_channel import PostgresStatePublisher
+        return PostgresStatePublisher().start()
+    except Exception as e:
+        print(f"[!] Durum kanali baslatilamadi: {e}", flush=True)
+        return None
+
+
+def _touched_statuses(delta):
+    """Farkta degisiklik olan durum anahtarlari."""
+    keys = set()
+    for kind in ("added", "removed", "changed"):
+        keys.update(e["status"] for e in delta[kind])
+    for e in delta["transitioned"]:
+        keys.update((e["from"], e["to"]))
+    # Kaybolup henuz cozulmeyen (pending) cekimlerin durum listesi de degisti
+    keys.update(delta.get("vanished", ()))
+    return keys
 
 
-def update_panel(pending=None, status_data=None, status="calisiyor", error=None, login_user=None):
-    """Web panel icin verileri guncelle (disk'e yaz)."""
+def _calc_total(items):
+    """Cekim listesinin toplam tutarini hesapla."""
+    return calc_total(items)
+
+
+def update_panel(pending=None, status_data=None, status="calisiyor", error=None, login_user=None,
+                 delta=None, browser_stats=None):
+    """
+    Web panel icin verileri guncelle. Bellekteki durum (PanelStateStore)
+    dogruluk kaynagidir; diske sadece degisen anahtarlar journal satiri
+    olarak eklenir, periyodik olarak atomik snapshot alinir.
+    delta (ScanDiff.apply sonucu) verilirse sadece degisen durumlarin
+    listesi/toplami yeniden yazilir ve olaylar "changes" akisina eklenir.
+    browser_stats: tarayici sayaclari (kaynak engelleme vb.) paneldeki
+    "browser" alanina yazilir.
+    """
+    global _panel_synced
     try:
-        data = {}
-        if DATA_FILE.exists():
-            with open(DATA_FILE, "r", encoding="utf-8") as f:
-                data = json.load(f)
+        store = _get_store()
+        # Yazilanlar changes'e gider, okumalar eski duruma duser
+        data = ChainMap({}, store.state)
+        changes = data.maps[0]
 
         data["bot_status"] = status
         data["last_scan"] = datetime.now(TZ_TR).isoformat()
@@ -63,19 +138,60 @@ def update_panel(pending=None, status_data=None, status="calisiyor", error=None,
 
         # Durum bazli veri (scan_all_statuses sonucu)
         if status_data is not None:
+            touched = _touched_statuses(delta) if delta is not None else None
             for key in ("beklemede", "reserve", "islemde"):
+                if key not in status_data:
+                    # Bu turda taranmayan durum (zamanlayici): eski veri kalsin
+                    continue
                 items = status_data.get(key, [])
                 # Gercek toplam: sayfalamadan gelen sayi (50+ olabilir)
                 real_count = status_data.get(f"{key}_total_count", len(items))
+                if touched is not None and key in status_data.get("failed", ()):
+                    # Okunamayan durum: son bilinen veri kalsin
+                    continue
                 data[f"{key}_count"] = real_count
+                if touched is not None and key not in touched and f"{key}_items" in data:
+                    continue
                 data[f"{key}_total"] = _calc_total(items)
                 data[f"{key}_items"] = items
 
             # Geriye uyumluluk: beklemede = pending
-            bek = status_data.get("beklemede", [])
-            data["pending_count"] = status_data.get("beklemede_total_count", len(bek))
-            data["pending_total"] = _calc_total(bek)
-            data["pending_items"] = bek
+            if "beklemede" in status_data:
+                data["pending_count"] = data.get("beklemede_count", 0)
+                data["pending_total"] = data.get("beklemede_total", 0)
+                if "beklemede_items" in changes:
+                    data["pending_items"] = changes["beklemede_items"]
+
+            # Tek-cagri motorunun faz sureleri (varsa)
+            if status_data.get("timing"):
+                data["scan_timing"] = status_data["timing"]
+
+        # Tur farki: ozet + son olaylar (ilk tur hepsi "added" oldugu icin akisa yazilmaz)
+        if delta is not None:
+            now = datetime.now(TZ_TR).isoformat()
+            data["last_delta"] = {"cycle": delta["cycle"], "time": now, **delta["counts"]}
+            if not delta["first"] and not delta["empty"]:
+                events = delta_events(delta, limit=MAX_CHANGE_EVENTS)
+                for event in events:
+                    event["time"] = now
+                data["changes"] = (events + data.get("changes", []))[:MAX_CHANGE_EVENTS]
+
+        if _scheduler is not None:
+            data["scheduler"] = _scheduler.snapshot()
+
+        if _startup:
+            data["startup"] = dict(_startup)
+
+        if _failover is not None:
+            data["failover"] = _failover.snapshot()
+
+        if _lag_monitor is not None:
+            data["io"] = {"loop_lag": _lag_monitor.stats(), "writer": io_writer.stats()}
+            if store.channel is not None:
+                data["io"]["state_channel"] = store.channel.stats()
+
+        if browser_stats is not None:
+            data["browser"] = browser_stats
 
         # Eski tek-durum uyumlulugu
         if pending is not None and status_data is None:
@@ -84,16 +200,16 @@ def update_panel(pending=None, status_data=None, status="calisiyor", error=None,
             data["pending_items"] = pending
 
         if error:
-            errors = data.get("errors", [])
-            errors.insert(0, {"time": datetime.now(TZ_TR).isoformat(), "msg": str(error)})
-            data["errors"] = errors[:20]
+            entry = {"time": datetime.now(TZ_TR).isoformat(), "msg": str(error)}
+            data["errors"] = ([entry] + data.get("errors", []))[:20]
 
-        with open(DATA_FILE, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2, default=str)
+        store.commit(changes)
 
         try:
-            from admin.app import bot_state
-            bot_state.update(data)
+            from admin.app import set_bot_state
+            # Ilk seferde tum durum, sonra sadece degisenler
+            set_bot_state(changes if _panel_synced else store.state)
+            _panel_synced = True
         except Exception:
             pass
     except Exception as e:
@@ -104,6 +220,10 @@ def start_web_panel():
     """Web paneli ayri thread'de baslat."""
     try:
         import uvicorn
+
+        import admin.app
+        # Durum bu surecten geliyor: panel ayrica Postgres kanalini dinlemesin
+        admin.app.in_process_bot = True
         port = int(os.environ.get("PORT", "8001"))
         print(f"[Web] Panel baslatiliyor: http://localhost:{port}", flush=True)
         uvicorn.run(
@@ -116,8 +236,11 @@ def start_web_panel():
         print(f"[!] Web panel hatasi: {e}", flush=True)
 
 
-async def run_cycle(browser):
-    """Tek tarama dongusu - 3 durumu sirayla tarayip panele gonder."""
+async def run_cycle(browser, statuses=None):
+    """
+    Tek tarama dongusu - durumlari tarayip panele gonder.
+    statuses: zamanlayicinin sectigi durum anahtarlari (None = hepsi).
+    """
     # Session hala gecerli mi?
     logged_in = await browser.is_logged_in()
     if not logged_in:
@@ -127,33 +250,116 @@ async def run_cycle(browser):
 
     # 3 durumu sirayla tara
     print("[*] Durum bazli tarama yapiliyor...", flush=True)
-    result = await browser.scan_all_statuses()
+    result = await browser.scan_all_statuses(statuses)
 
     if result is None:
         print("[!] Tarama basarisiz!", flush=True)
         return False
 
-    # Ozet log
+    _log_summary(result)
+    delta = _apply_diff(result)
+    await browser.memory_watchdog()
+    browser.schedule_token_refresh()
+
+    # Panel'e durum bazli veri gonder
+    update_panel(
+        status_data=result, status="calisiyor", delta=delta,
+        browser_stats=browser.get_panel_stats(),
+    )
+
+    # Session'i periyodik kaydet
+    await browser.save_session()
+    return True
+
+
+def _log_summary(result):
+    """Tarama sonucunun ozet logu."""
     for key, label in [("beklemede", "Beklemede"), ("reserve", "Reserve"), ("islemde", "Islemde")]:
+        if key not in result:
+            continue
         items = result.get(key, [])
         real_count = result.get(f"{key}_total_count", len(items))
-        total = browser._calc_total(items)
+        total = _calc_total(items)
         print(f"[Bot] {label}: {real_count} cekim, {total:,.0f} TRY", flush=True)
 
-    # Panel'e durum bazli veri gonder
-    update_panel(status_data=result, status="calisiyor")
 
-    # Session'i periyodik kaydet
+def _apply_diff(result):
+    """Sonucu fark motorundan gecir, degisiklikleri logla ve zamanlayiciya bildir."""
+    delta = _scan_diff.apply(result)
+    if _scheduler is not None:
+        _scheduler.observe(delta)
+    if not delta["first"] and not delta["empty"]:
+        c = delta["counts"]
+        print(
+            f"[Diff] +{c['added']} yeni, -{c['removed']} kalkan, "
+            f"{c['transitioned']} durum degistiren, {c['changed']} guncellenen",
+            flush=True,
+        )
+        for e in delta["transitioned"]:
+            print(f"  [Diff] #{e['item'].get('id')} {e['from']} -> {e['to']}", flush=True)
+    return delta
+
+
+async def refresh_api_auth(browser, api):
+    """Token/cookie'leri tarayicidan alip API client'a uygula."""
+    if not await browser.is_logged_in():
+        print("[!] Session gecersiz, API token yenilenemedi!", flush=True)
+        return False
+    auth = await browser.get_auth()
+    if not auth:
+        print("[!] Tarayicida access_token bulunamadi!", flush=True)
+        return False
+    api.update_auth(auth["token"], auth["cookies"], auth.get("user_agent"))
     await browser.save_session()
     return True
 
 
+async def run_cycle_api(browser, api, statuses=None):
+    """
+    Hybrid mod tarama dongusu: veriler CronosAPI ile cekilir,
+    tarayici sadece token/cookie kaynagi olarak kullanilir.
+    """
+    import httpx
+    from bot.api_client import AUTH_ERROR_CODES
+
+    # Periyodik tazeleme veya tarayicida token sessizce yenilendiyse
+    if (time.monotonic() - api.auth_time > BOT_AUTH_REFRESH_SECONDS
+            or browser.token_refreshed_at > api.auth_time):
+        await refresh_api_auth(browser, api)
+
+    try:
+        result = await api.scan_all_statuses(
+            per_page=BOT_PAGE_SIZE or 500, max_pages=BOT_MAX_PAGES, statuses=statuses
+        )
+    except httpx.HTTPStatusError as e:
+        if e.response.status_code not in AUTH_ERROR_CODES:
+            raise
+        print(f"[!] API yetki hatasi ({e.response.status_code}), token yenileniyor...", flush=True)
+        if not await refresh_api_auth(browser, api):
+            update_panel(status="session_dusmus")
+            return False
+        result = await api.scan_all_statuses(
+            per_page=BOT_PAGE_SIZE or 500, max_pages=BOT_MAX_PAGES, statuses=statuses
+        )
+
+    _log_summary(result)
+    delta = _apply_diff(result)
+    # Tarayici bu modda da acik (token kaynagi); sekme yine sisebilir
+    await browser.memory_watchdog()
+    browser.schedule_token_refresh()
+    update_panel(
+        status_data=result, status="calisiyor", delta=delta,
+        browser_stats=browser.get_panel_stats(),
+    )
+    return True
+
+
 async def try_recover_session(browser):
     """Session dusunce sayfayi yenileyerek kurtarmayi dene."""
     print("[*] Session kurtarma deneniyor...", flush=True)
     try:
         await browser.bypass_cloudflare()
-        await asyncio.sleep(5)
+        await browser.wait_for_page({"login", "panel"}, timeout=15, settle=1.0)
 
         is_ok = await browser.is_logged_in()
         if is_ok:
@@ -167,11 +373,24 @@ async def try_recover_session(browser):
         return False
 
 
+def _mark_startup(phase, t0):
+    """Acilis fazinin bitisini kaydet (t0'dan itibaren saniye)."""
+    _startup[phase] = round(time.monotonic() - t0, 2)
+
+
 async def main():
-    from bot.browser import CronosBrowser
+    from bot.browser import CronosBrowser, STANDBY_SESSION_FILE
 
+    t_boot = time.monotonic()
     interval = BOT_SCAN_INTERVAL
 
+    # Disk yazimi ve konsol loglari event loop disinda
+    global _lag_monitor
+    if BOT_ASYNC_IO:
+        install_async_stdout()
+        io_writer.start()
+        _lag_monitor = LoopLagMonitor(warn_ms=BOT_LOOP_LAG_WARN_MS).start()
+
     # Railway'de headless, lokalde headed
     is_railway = os.environ.get("RAILWAY_ENVIRONMENT") is not None
     headless = is_railway or os.environ.get("HEADLESS", "").lower() in ("1", "true")
@@ -180,6 +399,7 @@ async def main():
     print("  Cronos Cekim Bot - DOM Scraping Edition", flush=True)
     print(f"  Mod: {'Headless' if headless else 'Headed'}", flush=True)
     print(f"  Tarama araligi: {interval}s", flush=True)
+    print(f"  Calisma modu: {BOT_MODE}", flush=True)
     print("=" * 60, flush=True)
     print(flush=True)
 
@@ -192,10 +412,12 @@ async def main():
     # Chrome'u baslat (sabit profil klasoru ile - session korunur)
     browser = CronosBrowser()
     await browser.start(headless=headless)
+    _mark_startup("chrome_s", t_boot)
 
     # Session kontrol - onceki login hala gecerli mi?
     update_panel(status="session_kontrol")
     session_ok = await browser.check_and_restore_session()
+    _mark_startup("session_s", t_boot)
 
     if session_ok:
         print(flush=True)
@@ -214,32 +436,113 @@ async def main():
             update_panel(status="login_basarisiz")
             await browser.close()
             sys.exit(1)
+        _mark_startup("login_s", t_boot)
 
     update_panel(status="calisiyor", login_user="logged_in")
     print(flush=True)
     print("[+] Bot surekli tarama moduna gecti.", flush=True)
     print("[*] Tarayiciyi kapatmayin!", flush=True)
 
+    # Hybrid mod: tarama CronosAPI ile, Chrome sadece session kaynagi
+    api = None
+    if BOT_MODE == "hybrid":
+        from bot.api_client import CronosAPI
+        auth = await browser.get_auth()
+        if auth:
+            api = CronosAPI(auth["token"], auth["cookies"], auth.get("user_agent"))
+            interval = BOT_API_SCAN_INTERVAL
+            print(f"[+] Hybrid mod: tarama CronosAPI ile ({interval}s aralikla)", flush=True)
+        else:
+            print("[!] Hybrid mod icin token alinamadi, browser ile taranacak.", flush=True)
+
+    # Zamanlayici: durum bazli tempo, tur suresi bekleme suresinden dusulur
+    global _scheduler
+    intervals = parse_status_intervals(BOT_STATUS_INTERVALS, interval)
+    if BOT_ADAPTIVE_SCAN:
+        scheduler = ScanScheduler(
+            intervals,
+            min_interval=min(BOT_MIN_SCAN_INTERVAL, interval),
+            backoff_max=BOT_SCAN_BACKOFF_MAX,
+        )
+    else:
+        # Sabit tempo: sadece tur suresi dusulur, hizlanma/geri cekilme yok
+        scheduler = ScanScheduler(intervals, backoff_max=1.0, speedup=1.0, backoff=1.0)
+    _scheduler = scheduler
+
+    # Sicak yedek: ayri profilde hazir bekler, ana dusunce ayni turda devralir
+    global _failover
+    failover = None
+    if BOT_STANDBY:
+        from bot.failover import BrowserFailover
+        failover = BrowserFailover(
+            browser,
+            lambda: CronosBrowser(
+                profile_dir=BOT_STANDBY_PROFILE_DIR,
+                session_file=STANDBY_SESSION_FILE,
+                name="yedek",
+            ),
+            headless=headless,
+            check_every=BOT_STANDBY_CHECK_EVERY,
+        )
+        failover.start()
+        _failover = failover
+        print("[Yedek] Yedek tarayici arka planda hazirlaniyor...", flush=True)
+
+    async def cycle(keys=None):
+        keys = scheduler.begin(keys)
+        try:
+            if api is not None:
+                ok = await run_cycle_api(browser, api, keys)
+            else:
+                ok = await run_cycle(browser, keys)
+            if ok and "first_scan_s" not in _startup:
+                _mark_startup("first_scan_s", t_boot)
+                print(f"[Bot] Ilk basarili taramaya kadar {_startup['first_scan_s']:.1f}s "
+                      f"(chrome {_startup['chrome_s']:.1f}s, session {_startup['session_s']:.1f}s)",
+                      flush=True)
+            return ok
+        finally:
+            # Tur basarisiz olsa da (diff yok) bir sonraki zaman hesaplansin
+            scheduler.observe()
+
     # Ilk tarama
     print(flush=True)
     print("[Bot] Ilk tarama yapiliyor...", flush=True)
     try:
-        await run_cycle(browser)
+        await cycle()
     except Exception as e:
         print(f"[Bot] Ilk tarama hatasi: {e}", flush=True)
         update_panel(status="hata", error=str(e))
 
     # Sonsuz dongude tara
-    print(f"\n[Bot] Surekli tarama basliyor ({interval}s aralikla)...", flush=True)
+    tempo = ", ".join(f"{k}={v['base_s']:g}s" for k, v in scheduler.snapshot()["statuses"].items())
+    print(f"\n[Bot] Surekli tarama basliyor ({tempo}, uyarlanabilir={BOT_ADAPTIVE_SCAN})...", flush=True)
     consecutive_failures = 0
     max_failures = 5
 
     while True:
-        await asyncio.sleep(interval)
+        await asyncio.sleep(scheduler.next_delay())
         try:
-            success = await run_cycle(browser)
+            reason = "tarama/session basarisiz"
+            try:
+                success = await cycle()
+            except Exception as e:
+                if failover is None or not failover.standby_ready:
+                    raise
+                # Tarayici coktu (CDP baglantisi vb.): yedege gec
+                print(f"[Bot] Hata: {e}", file=sys.stderr, flush=True)
+                reason, success = f"tarayici hatasi: {type(e).__name__}", False
+
+            if not success and failover is not None and await failover.take_over(reason):
+                # Ayni turu (ayni durumlarla) yedek tarayiciyla tekrarla
+                browser = failover.active
+                success = await cycle(scheduler.last_keys)
+
             if success:
                 consecutive_failures = 0
+                if failover is not None:
+                    failover.scan_succeeded()
+                    await failover.maintain()
             else:
                 consecutive_failures += 1
                 print(f"[!] Session dusmus ({consecutive_failures}/{max_failures})", flush=True)
@@ -264,14 +567,25 @@ async def main():
                 else:
                     wait_time = min(30 * consecutive_failures, 300)
                     print(f"[*] {wait_time}s sonra tekrar...", flush=True)
+                    # Bekleme zamanlayici uzerinden: dongu next_delay ile uyur,
+                    # panel de "hata sonrasi bekleme" ve kalan sureyi gosterir
+                    scheduler.penalize(wait_time)
                     update_panel(status="session_dusmus")
-                    await asyncio.sleep(wait_time)
         except Exception as e:
             print(f"[Bot] Hata: {e}", file=sys.stderr, flush=True)
+            scheduler.penalize(30)
             update_panel(status="hata", error=str(e))
-            await asyncio.sleep(30)
 
+    if api is not None:
+        await api.aclose()
+    if failover is not None:
+        await failover.close()
     await browser.close()
+    if _store is not None:
+        _store.close()
+    if _lag_monitor is not None:
+        _lag_monitor.stop()
+    io_writer.flush(10.0)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,189 @@
+"""
+Uyarlanabilir tarama zamanlayicisi.
+====================================
+Sabit "tur bitince N saniye uyu" yerine her durum icin hedef bir
+tempo (cadence) tutar:
+
+  - Bekleme suresi = hedef aralik - gecen sure (tur suresi dusulur)
+  - Yeni cekim / durum gecisi gelen durumlarin araligi kisalir (hizlanma)
+  - Bos gecen turlarda aralik yavasca temel degerin katlarina uzar (geri cekilme)
+  - Panel yavassa (tur suresi araliga yaklasirsa) aralik tur suresine gore acilir
+
+Durum bazli temel araliklar BOT_STATUS_INTERVALS ile verilir:
+    BOT_STATUS_INTERVALS="beklemede=3,reserve=15,islemde=60"
+"""
+import time
+
+from bot.transactions import SCAN_STATUSES
+
+STATUS_KEYS = tuple(key for _, key, _ in SCAN_STATUSES)
+
+
+def parse_status_intervals(spec, default):
+    """
+    "beklemede=3,islemde=60" -> {"beklemede": 3.0, "reserve": default, "islemde": 60.0}
+    Bilinmeyen anahtar veya bozuk deger atlanir.
+    """
+    intervals = {key: float(default) for key in STATUS_KEYS}
+    for part in (spec or "").split(","):
+        key, _, value = part.partition("=")
+        key = key.strip()
+        if key not in intervals:
+            continue
+        try:
+            intervals[key] = max(float(value), 0.1)
+        except ValueError:
+            pass
+    return intervals
+
+
+class _StatusSlot:
+    __slots__ = (
+        "key", "base", "interval", "next_due", "last_start", "achieved", "reason", "idle_cycles",
+    )
+
+    def __init__(self, key, base):
+        self.key = key
+        self.base = base
+        self.interval = base
+        self.next_due = 0.0          # ilk turda hemen
+        self.last_start = None
+        self.achieved = None         # iki tarama baslangici arasi gercek sure
+        self.reason = "baslangic"
+        self.idle_cycles = 0
+
+
+class ScanScheduler:
+    """
+    Durum bazli tempo tutan zamanlayici.
+
+        sched = ScanScheduler(base_intervals)
+        while True:
+            await asyncio.sleep(sched.next_delay())
+            keys = sched.begin()           # zamani gelen durumlar
+            ... tara(keys) ...
+            sched.observe(delta)           # ScanDiff sonucu ile araliklari ayarla
+    """
+
+    def __init__(self, intervals, min_interval=1.0, backoff_max=4.0,
+                 speedup=0.5, backoff=1.25, slow_ratio=0.8, clock=time.monotonic):
+        self._clock = clock
+        self.min_interval = min_interval
+        self.backoff_max = backoff_max
+        self.speedup = speedup
+        self.backoff = backoff
+        self.slow_ratio = slow_ratio
+        self._slots = {key: _StatusSlot(key, float(base)) for key, base in intervals.items()}
+        self._running = []
+        self._cycle_start = None
+        self.last_cycle_s = None
+        self.last_keys = []
+
+    def next_delay(self):
+        """Bir sonraki durumun zamani gelene kadar beklenecek saniye (>= 0)."""
+        now = self._clock()
+        return max(0.0, min(slot.next_due for slot in self._slots.values()) - now)
+
+    def due(self):
+        """Zamani gelmis durum anahtarlari (SCAN_STATUSES sirasinda)."""
+        now = self._clock()
+        return [key for key in STATUS_KEYS if key in self._slots and self._slots[key].next_due <= now]
+
+    def begin(self, keys=None):
+        """
+        Tur baslangicini isaretle. keys verilmezse zamani gelenler alinir.
+        Doner: taranacak durum anahtarlari.
+        """
+        now = self._clock()
+        keys = list(keys) if keys is not None else self.due()
+        for key in keys:
+            slot = self._slots[key]
+            if slot.last_start is not None:
+                slot.achieved = now - slot.last_start
+            slot.last_start = now
+        self._running = keys
+        self._cycle_start = now
+        self.last_keys = keys
+        return keys
+
+    def observe(self, delta=None):
+        """
+        Tur bitti: ScanDiff farkina ve tur suresine gore araliklari ayarla,
+        bir sonraki zamanlari hesapla (baslangictan itibaren -> sabit tempo).
+        """
+        if self._cycle_start is None:
+            return
+        now = self._clock()
+        duration = now - self._cycle_start
+        self.last_cycle_s = duration
+        active = _active_statuses(delta) if delta and not delta.get("first") else set()
+
+        for key in self._running:
+            slot = self._slots[key]
+            if key in active:
+                slot.interval = max(self.min_interval, slot.interval * self.speedup)
+                slot.idle_cycles = 0
+                slot.reason = "yeni hareket"
+            else:
+                slot.idle_cycles += 1
+                ceiling = slot.base * self.backoff_max
+                if slot.interval < slot.base:
+                    # Hareket bitti: once temel degere don
+                    slot.interval = min(slot.base, slot.interval / self.speedup)
+                    slot.reason = "normale donus"
+                elif slot.idle_cycles > 1 and slot.interval < ceiling:
+                    slot.interval = min(ceiling, slot.interval * self.backoff)
+                    slot.reason = "bos, geri cekilme"
+                else:
+                    slot.reason = "sabit"
+            if duration > slot.interval * self.slow_ratio:
+                # Panel yavas: araligi tur suresinin uzerine cek
+                slot.interval = max(slot.interval, duration / self.slow_ratio)
+                slot.reason = "panel yavas"
+            slot.next_due = self._cycle_start + slot.interval
+
+        # Kaybolan cekimler (ScanDiff pending): gitmis olabilecekleri durumlar
+        # bu turda taranmadiysa one cekilir, cekim kisa surede cozulsun
+        for key in (delta or {}).get("unresolved", ()):
+            slot = self._slots.get(key)
+            if slot is None or key in self._running:
+                continue
+            due = now + self.min_interval
+            if slot.next_due > due:
+                slot.next_due = due
+                slot.reason = "kaybolan cekim kontrolu"
+
+        self._running = []
+        self._cycle_start = None
+
+    def penalize(self, seconds):
+        """Hata/session dususunde tum durumlari en az 'seconds' ertele."""
+        due = self._clock() + seconds
+        for slot in self._slots.values():
+            slot.next_due = max(slot.next_due, due)
+            slot.reason = "hata sonrasi bekleme"
+
+    def snapshot(self):
+        """Panel / status API icin zamanlayici durumu."""
+        now = self._clock()
+        return {
+            "last_cycle_ms": None if self.last_cycle_s is None else round(self.last_cycle_s * 1000),
+            "last_keys": list(self.last_keys),
+            "statuses": {
+                key: {
+                    "base_s": slot.base,
+                    "interval_s": round(slot.interval, 2),
+                    "achieved_s": None if slot.achieved is None else round(slot.achieved, 2),
+                    "next_in_s": round(max(0.0, slot.next_due - now), 2),
+                    "reason": slot.reason,
+                }
+                for key, slot in self._slots.items()
+            },
+        }
+
+
+def _active_statuses(delta):
+    """Yeni cekim gelen veya yeni duruma gecen cekimlerin durumlari."""
+    keys = {e["status"] for e in delta.get("added", ())}
+    keys.update(e["to"] for e in delta.get("transitioned", ()))
+    return keys
@@ -1,10 +1,63 @@
 """
 Finansal işlemler sayfasından bekleyen para çekme taleplerini okur.
 """
-from decimal import Decimal
+from decimal import Decimal, InvalidOperation
 import re
 from playwright.async_api import Page
 
+# Beklemede satirlari: "Kabul et" (.button.i-green) ve "Reddet" (.button.i-red) olanlar
+PENDING_ROW_SELECTOR = "tr:has(.button.i-green):has(.button.i-red)"
+
+# Tum satirlarin hucrelerini tek browser cagrisinda okuyan JS
+_EXTRACT_ROWS_JS = """
+rows => rows.map(row => {
+    const text = sel => {
+        const el = row.querySelector(sel);
+        return el ? (el.textContent || '').trim() : '';
+    };
+    return {
+        is_withdrawal: (row.textContent || '').indexOf('Para Çekme') !== -1,
+        id: text('td:nth-child(1) > a'),
+        oyuncu: text('td:nth-child(4) > a'),
+        tutar: text('td:nth-child(6)'),
+        tarih: text('td:nth-child(12)'),
+    };
+})
+"""
+
+_AMOUNT_CLEAN_RE = re.compile(r"[^\d,.\-]")
+
+
+def _parse_amounts(raw_amounts: list) -> list:
+    """Tutar metinlerini tek geciste Decimal'e cevir; parse edilemeyen metin kalir."""
+    parsed = []
+    for tutar_raw in raw_amounts:
+        tutar_val: str | Decimal = tutar_raw
+        if tutar_raw:
+            num_str = _AMOUNT_CLEAN_RE.sub("", tutar_raw).replace(",", ".")
+            if num_str:
+                try:
+                    tutar_val = Decimal(num_str)
+                except (InvalidOperation, ValueError):
+                    pass
+        parsed.append(tutar_val)
+    return parsed
+
+
+def rows_to_withdrawals(rows: list) -> list:
+    """evaluate_all ciktisini sonuc formatina cevir (sadece Para Çekme satirlari)."""
+    rows = [r for r in rows if r.get("is_withdrawal")]
+    amounts = _parse_amounts([r.get("tutar", "") for r in rows])
+    return [
+        {
+            "id": r.get("id", ""),
+            "oyuncu": r.get("oyuncu", ""),
+            "tutar": tutar,
+            "tarih": r.get("tarih", ""),
+        }
+        for r, tutar in zip(rows, amounts)
+    ]
+
 
 async def get_pending_withdrawals(page: Page) -> list:
     """
@@ -17,41 +70,14 @@ async def get_pending_withdrawals(page: Page) -> list:
     - Tutar: 6. sütun (td:nth-child(6))
     - Tarih: 12. sütun (td:nth-child(12))
 
+    Tüm satırlar tek bir evaluate_all çağrısıyla okunur (satır başına
+    ayrı IPC yok), tutarlar sonra tek geçişte Decimal'e çevrilir.
+
     Returns:
         [{"id": str, "oyuncu": str, "tutar": Decimal|str, "tarih": str}, ...]
     """
-    result = []
-    # Kabul et (.button.i-green) ve Reddet (.button.i-red) olan satırlar = beklemede
-    rows = page.locator("tr:has(.button.i-green):has(.button.i-red)")
-    n = await rows.count()
-    for i in range(n):
-        row = rows.nth(i)
-        row_text = (await row.text_content()) or ""
-        if "Para Çekme" not in row_text:
-            continue
-        try:
-            id_el = row.locator("td:nth-child(1) > a")
-            oyuncu_el = row.locator("td:nth-child(4) > a")
-            tutar_el = row.locator("td:nth-child(6)")
-            tarih_el = row.locator("td:nth-child(12)")
-            cekim_id = (await id_el.text_content() or "").strip() if await id_el.count() else ""
-            oyuncu = (await oyuncu_el.text_content() or "").strip() if await oyuncu_el.count() else ""
-            tutar_raw = (await tutar_el.text_content() or "").strip() if await tutar_el.count() else ""
-            tarih = (await tarih_el.text_content() or "").strip() if await tarih_el.count() else ""
-        except Exception:
-            continue
-        tutar_val: str | Decimal = tutar_raw
-        if tutar_raw:
-            num_str = re.sub(r"[^\d,.\-]", "", tutar_raw).replace(",", ".")
-            if num_str:
-                try:
-                    tutar_val = Decimal(num_str)
-                except Exception:
-                    pass
-        result.append({
-            "id": cekim_id,
-            "oyuncu": oyuncu,
-            "tutar": tutar_val,
-            "tarih": tarih,
-        })
-    return result
+    try:
+        rows = await page.locator(PENDING_ROW_SELECTOR).evaluate_all(_EXTRACT_ROWS_JS)
+    except Exception:
+        return []
+    return rows_to_withdrawals(rows or [])
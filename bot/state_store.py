@@ -0,0 +1,279 @@
+"""
+Panel durumu deposu: bellek + journal + atomik snapshot.
+=========================================================
+Eskiden update_panel her turda bot_data.json'u bastan okuyup (json.load)
+indent=2 ile yeniden yaziyordu: iki kez O(toplam kayit) JSON ve yarida
+kesilirse bozuk kalan dosya.
+
+Simdi:
+  - Dogruluk kaynagi bellekteki dict (PanelStateStore.state)
+  - Her tur sadece degisen anahtarlar journal'a tek satir eklenir
+    (bot_data.journal, append-only JSONL). Cekim listeleri id bazli
+    yamalanir: sadece yeni/degisen kayitlar + id sirasi yazilir.
+  - Her compact_every turda (veya journal buyuyunce) tum durum gecici
+    dosyaya yazilip os.replace ile bot_data.json'a tasinir, journal sifirlanir
+  - Acilista snapshot + journal tekrar oynatilir (load). Yarim kalmis son
+    satir atlanir.
+
+Journal satiri:
+    {"seq": 12, "set": {"bot_status": "...", ...},
+     "lists": {"beklemede_items": {"order": [id, ...], "upsert": [{...}]}}}
+"""
+import json
+import os
+import tempfile
+from pathlib import Path
+
+# id bazli yamalanan liste anahtarlari
+LIST_KEYS = ("beklemede_items", "reserve_items", "islemde_items", "pending_items")
+
+_SEQ_KEY = "_seq"
+
+
+def _dumps(obj):
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+def _item_id(item):
+    if not isinstance(item, dict):
+        return None
+    value = item.get("id")
+    return str(value) if value not in (None, "") else None
+
+
+def list_patch(old, new):
+    """
+    Eski -> yeni liste yamasi: {"order": [id...], "upsert": [degisen kayitlar]}.
+    id'si olmayan / tekrarlayan kayit varsa None (liste tamamen yazilir).
+    """
+    order = []
+    seen = set()
+    for item in new:
+        item_id = _item_id(item)
+        if item_id is None or item_id in seen:
+            return None
+        seen.add(item_id)
+        order.append(item_id)
+    old_by_id = {}
+    for item in old or ():
+        item_id = _item_id(item)
+        if item_id is not None:
+            old_by_id[item_id] = item
+    upsert = [item for item, item_id in zip(new, order) if old_by_id.get(item_id) != item]
+    return {"order": order, "upsert": upsert}
+
+
+def apply_list_patch(old, patch):
+    by_id = {}
+    for item in old or ():
+        item_id = _item_id(item)
+        if item_id is not None:
+            by_id[item_id] = item
+    for item in patch.get("upsert", ()):
+        by_id[_item_id(item)] = item
+    return [by_id[i] for i in patch.get("order", ()) if i in by_id]
+
+
+def apply_entry(state, entry):
+    """
+    Journal satirini state'e uygula. Doner: degisen anahtarlar.
+    (Acilis replay'i ve web panelinin durum kanali ayni fonksiyonu kullanir.)
+    """
+    state.update(entry.get("set", {}))
+    for key, patch in entry.get("lists", {}).items():
+        if "same_as" in patch:
+            state[key] = state.get(patch["same_as"], [])
+        else:
+            state[key] = apply_list_patch(state.get(key), patch)
+    return list(entry.get("set", {})) + list(entry.get("lists", {}))
+
+
+def journal_path(data_file):
+    data_file = Path(data_file)
+    return data_file.with_name(data_file.stem + ".journal")
+
+
+class PanelStateStore:
+    """
+    Panel durumunun tek kaynagi.
+
+        store = PanelStateStore(DATA_FILE)
+        state = store.load()                 # snapshot + journal
+        store.commit({"bot_status": "calisiyor", "beklemede_items": items})
+    """
+
+    def __init__(self, data_file, compact_every=100, compact_bytes=8 * 1024 * 1024, writer=None,
+                 channel=None):
+        """
+        writer: IOWriter verilirse dosya isleri (journal satiri, snapshot)
+        yazici thread'inde yapilir, commit sadece bellegi gunceller.
+        channel: journal satirlarini / snapshot'lari baska surece de ileten
+        kanal (publish(entry), publish_snapshot(seq, data), flush());
+        yazici thread'inde cagrilir, DB'yi beklememelidir.
+        """
+        self.data_file = Path(data_file)
+        self.writer = writer
+        self.channel = channel
+        self.journal_file = journal_path(self.data_file)
+        self.compact_every = max(int(compact_every), 1)
+        self.compact_bytes = compact_bytes
+        self.state = {}
+        self.seq = 0
+        self._since_compact = 0
+        self._journal_size = 0
+        self._journal = None
+
+    # ── Okuma / kurtarma ─────────────────────────────────────────
+
+    def load(self):
+        """Snapshot'i oku, ustune journal'i oynat. Doner: state (dict)."""
+        state = {}
+        if self.data_file.exists():
+            try:
+                state = json.loads(self.data_file.read_text(encoding="utf-8"))
+            except (OSError, ValueError) as e:
+                print(f"[!] Panel snapshot okunamadi: {e}", flush=True)
+                state = {}
+        seq = int(state.pop(_SEQ_KEY, 0) or 0)
+
+        replayed = 0
+        if self.journal_file.exists():
+            try:
+                with open(self.journal_file, "r", encoding="utf-8") as f:
+                    for line in f:
+                        try:
+                            entry = json.loads(line)
+                        except ValueError:
+                            # Yarida kesilmis son satir
+                            break
+                        if entry.get("seq", 0) <= seq:
+                            continue
+                        if entry["seq"] != seq + 1:
+                            # Yazici kuyrugu doluyken atilmis kayit: sonrasi eksik patch
+                            print(f"[!] Panel journal'da bosluk (seq {seq} -> {entry['seq']}), "
+                                  f"kalan kayitlar atlandi", flush=True)
+                            break
+                        apply_entry(state, entry)
+                        seq = entry["seq"]
+                        replayed += 1
+                self._journal_size = self.journal_file.stat().st_size
+            except OSError as e:
+                print(f"[!] Panel journal okunamadi: {e}", flush=True)
+
+        self.state, self.seq = state, seq
+        self._since_compact = replayed
+        if replayed:
+            print(f"[Panel] Snapshot + {replayed} journal kaydi yuklendi (seq {seq})", flush=True)
+        return state
+
+    # ── Yazma ─────────────────────────────────────────────────────
+
+    def commit(self, changes):
+        """
+        Degisen anahtarlari bellege uygula ve journal'a tek satir ekle.
+        Ayni liste nesnesi iki anahtara verilirse (pending_items =
+        beklemede_items) ikincisi sadece referans olarak yazilir.
+        """
+        sets, lists = {}, {}
+        written = {}
+        for key, value in changes.items():
+            if key in LIST_KEYS and isinstance(value, list):
+                same = next((k for k, v in written.items() if v is value), None)
+                if same is not None:
+                    lists[key] = {"same_as": same}
+                else:
+                    patch = list_patch(self.state.get(key), value)
+                    if patch is None:
+                        sets[key] = value
+                    else:
+                        lists[key] = patch
+                    written[key] = value
+            else:
+                sets[key] = value
+            self.state[key] = value
+
+        self.seq += 1
+        entry = {"seq": self.seq}
+        if sets:
+            entry["set"] = sets
+        if lists:
+            entry["lists"] = lists
+        self._since_compact += 1
+        appended = self._submit(lambda: self._append(entry))
+
+        # Atilan journal satiri (yazici kuyrugu dolu): snapshot onu da kapsar
+        if (not appended or self._since_compact >= self.compact_every
+                or self._journal_size >= self.compact_bytes):
+            self.compact()
+
+    def _submit(self, fn, key=None):
+        if self.writer is None:
+            fn()
+            return True
+        return self.writer.submit(fn, key=key)
+
+    def _append(self, entry):
+        line = _dumps(entry) + "\n"
+        if self._journal is None:
+            self._journal = open(self.journal_file, "a", encoding="utf-8")
+        self._journal.write(line)
+        self._journal.flush()
+        self._journal_size += len(line)
+        if self.channel is not None:
+            self.channel.publish(entry, line)
+
+    def compact(self, reset=False):
+        """
+        Tum durumu atomik olarak snapshot'a yaz (temp + os.replace), journal'i
+        sifirla. Yazicida bekleyen eski snapshot isi varsa yenisiyle birlesir.
+        reset: kanala "durumu bastan kur" olarak yayinla (bot acilisi).
+        """
+        # Listeler yerinde degistirilmez, sig kopya yazici thread'i icin yeterli
+        data = dict(self.state)
+        data[_SEQ_KEY] = self.seq
+        self._since_compact = 0
+        self._submit(
+            lambda: self._write_snapshot(data, reset), key=("snapshot", str(self.data_file), reset)
+        )
+
+    def _write_snapshot(self, data, reset=False):
+        text = _dumps(data)
+        directory = self.data_file.parent
+        fd, tmp = tempfile.mkstemp(prefix=self.data_file.name + ".", suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(text)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.data_file)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+
+        # Snapshot seq'i journal'dakileri kapsiyor; yarida kalsa da load atlar
+        if self._journal is not None:
+            self._journal.close()
+        self._journal = open(self.journal_file, "w", encoding="utf-8")
+        self._journal_size = 0
+        if self.channel is not None:
+            self.channel.publish_snapshot(data[_SEQ_KEY], text, reset=reset)
+
+    def close(self):
+        """Son durumu snapshot'a yaz ve journal'i kapat."""
+        if self._since_compact:
+            self.compact()
+        if self.writer is not None:
+            self.writer.flush(10.0)
+        if self.channel is not None:
+            self.channel.flush(5.0)
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+
+
+def load_state(data_file):
+    """Salt okunur: snapshot + journal'dan guncel panel durumu (web paneli icin)."""
+    return PanelStateStore(data_file).load()
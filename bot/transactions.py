@@ -0,0 +1,194 @@
+"""
+Cekim kayitlarini ortak formata ceviren yardimcilar.
+=====================================================
+Panelin Vue modelinden (financial_list) veya _api yanitlarindan gelen
+ham objeleri, DOM scraping ile ayni anahtarlara sahip dict'lere cevirir.
+Boylece panel, runner ve diff tarafi kaynaktan bagimsiz calisir.
+"""
+
+# Panel durum kodlari (Durum select'i ile ayni)
+STATUS_LABELS = {
+    0: "Beklemede",
+    1: "Onaylandi",
+    2: "Reddedildi",
+    3: "Islemde",
+    4: "Reserve Edildi",
+}
+
+# Taranan durumlar: (filtre degeri, anahtar, etiket)
+SCAN_STATUSES = [
+    (0, "beklemede", "Beklemede"),
+    (4, "reserve", "Reserve Edildi"),
+    (3, "islemde", "Islemde"),
+]
+
+
+def select_statuses(keys=None):
+    """SCAN_STATUSES alt kumesi (sira korunur). keys=None ise hepsi."""
+    if keys is None:
+        return list(SCAN_STATUSES)
+    keys = set(keys)
+    return [entry for entry in SCAN_STATUSES if entry[1] in keys]
+
+
+def first_of(raw, *keys):
+    """Ilk dolu anahtari dondur. 'a.b' seklinde ic ice anahtar destekler."""
+    for key in keys:
+        val = raw
+        for part in key.split("."):
+            if not isinstance(val, dict):
+                val = None
+                break
+            val = val.get(part)
+        if val not in (None, ""):
+            return val
+    return None
+
+
+def parse_amount(value):
+    """
+    Tutari float'a cevir.
+    Sayi ise oldugu gibi, metin ise "1.234,56 TRY" formatindan parse eder.
+    """
+    if value is None or isinstance(value, bool):
+        return 0.0
+    if isinstance(value, (int, float)):
+        return float(value)
+    clean = str(value).replace("TRY", "").replace("TL", "").replace("\u20ba", "").strip()
+    if not clean:
+        return 0.0
+    try:
+        # Zaten makine formatinda ("1234.56") ise dogrudan cevir
+        if "," not in clean and clean.count(".") <= 1 and len(clean.rpartition(".")[2]) != 3:
+            return float(clean)
+        return float(clean.replace(".", "").replace(",", "."))
+    except ValueError:
+        return 0.0
+
+
+def calc_total(items):
+    """Cekim listesinin toplam tutarini hesapla (sayi veya metin tutar)."""
+    total = 0.0
+    for item in items:
+        try:
+            total += parse_amount(item.get("amount"))
+        except AttributeError:
+            pass
+    return total
+
+
+def _status_code(raw):
+    code = first_of(raw, "status_id", "status")
+    try:
+        return int(code)
+    except (TypeError, ValueError):
+        return None
+
+
+def normalize_withdrawal(raw):
+    """
+    Ham islem objesini DOM satiri ile ayni semaya cevir.
+    Tutar sayi olarak kalir, tarihler ISO string olarak gelir.
+    """
+    code = _status_code(raw)
+    status = first_of(raw, "status_name", "status_text", "status_label")
+    if status is None:
+        status = STATUS_LABELS.get(code, "" if code is None else str(code))
+
+    first_name = first_of(raw, "customer.name", "name", "first_name") or ""
+    last_name = first_of(raw, "customer.surname", "surname", "last_name") or ""
+    full_name = first_of(raw, "customer.full_name", "full_name", "customer_name")
+    if full_name is None:
+        full_name = f"{first_name} {last_name}".strip()
+
+    amount = first_of(raw, "amount", "value")
+    if isinstance(amount, str):
+        amount = parse_amount(amount)
+
+    payment_method = first_of(
+        raw, "payment_method.name", "payment_method_name", "payment_method", "method"
+    )
+    if isinstance(payment_method, dict):
+        payment_method = payment_method.get("name", "")
+
+    manager = first_of(raw, "manager.name", "manager_name", "manager.username", "manager")
+    if isinstance(manager, dict):
+        manager = manager.get("name", "")
+
+    return {
+        "id": str(first_of(raw, "id", "transaction_id") or ""),
+        "type": str(first_of(raw, "type_name", "type_text", "type") or ""),
+        "player_id": str(first_of(raw, "customer_id", "customer.id", "player_id", "user_id") or ""),
+        "username": str(first_of(raw, "customer.username", "username", "user_name") or ""),
+        "full_name": full_name,
+        "amount": amount if amount is not None else 0.0,
+        "currency": str(first_of(raw, "currency.code", "currency_code", "currency") or ""),
+        "payment_method": str(payment_method or ""),
+        "note": str(first_of(raw, "note", "description") or ""),
+        "status": status,
+        "status_code": code,
+        "manager_note": str(first_of(raw, "manager_note", "admin_note") or ""),
+        "created_at": first_of(raw, "created_at", "createdAt") or "",
+        "updated_at": first_of(raw, "updated_at", "updatedAt") or "",
+        "manager": str(manager or ""),
+        "has_accept_btn": code == 0,
+        "has_reject_btn": code == 0,
+    }
+
+
+def normalize_withdrawals(raw_items):
+    """Ham listeyi normalize et (dict olmayanlari atla)."""
+    return [normalize_withdrawal(r) for r in raw_items or [] if isinstance(r, dict)]
+
+
+def dedupe_by_id(items):
+    """
+    Ayni ID'li tekrarlari at (ilk gorulen kalir).
+    Sayfalar arasinda yeni kayit gelince bir satir iki sayfada gorunebilir.
+    """
+    seen = set()
+    out = []
+    for item in items:
+        key = str(item.get("id", "")) if isinstance(item, dict) else ""
+        if key:
+            if key in seen:
+                continue
+            seen.add(key)
+        out.append(item)
+    return out
+
+
+def extract_items(payload):
+    """
+    _api yanitindan (liste, toplam sayi) cikar.
+    Desteklenen sekiller:
+      [...]
+      {"data": [...], "total": N}  /  {"items": [...]}  /  {"list": [...]}
+      {"data": [...], "meta": {"total": N}}
+      {"data": {"data": [...], "total": N}}
+    Toplam bulunamazsa None doner.
+    """
+    if isinstance(payload, list):
+        return payload, None
+    if not isinstance(payload, dict):
+        return [], None
+
+    total = first_of(payload, "total", "meta.total", "pagination.total", "recordsTotal")
+    for key in ("data", "items", "list", "financial_list"):
+        val = payload.get(key)
+        if isinstance(val, list):
+            break
+        if isinstance(val, dict):
+            inner, inner_total = extract_items(val)
+            if inner or inner_total is not None:
+                return inner, inner_total if inner_total is not None else _to_int(total)
+    else:
+        return [], _to_int(total)
+    return val, _to_int(total)
+
+
+def _to_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
@@ -19,3 +19,111 @@ CRONOS_2FA_SECRET = os.getenv("CRONOS_2FA_SECRET", "")
 # Bot ayarlari
 BOT_SCAN_INTERVAL = int(os.getenv("BOT_SCAN_INTERVAL", "10"))
 CRONOS_BASE_URL = os.getenv("CRONOS_BASE_URL", "https://cronos.redlanegaming.com")
+
+# Filtre degisiminden sonra veri bekleme yontemi:
+#   event -> Vue $watch + Promise (Runtime.evaluate awaitPromise ile tek CDP cagrisi)
+#   poll  -> eski yontem: $data.loading'i araliklarla sorgula
+BOT_FILTER_WAIT = os.getenv("BOT_FILTER_WAIT", "event").lower()
+BOT_FILTER_TIMEOUT = float(os.getenv("BOT_FILTER_TIMEOUT", "15"))
+
+# Tarama motoru:
+#   step    -> her durum icin ayri CDP cagrilari (filtre, bekleme, tablo, total)
+#   script  -> tek async JS fonksiyonu tum durumlari tarar, tek Runtime.evaluate
+#   network -> Vue getData() tetiklenir, sonuc CDP Network ile yakalanan
+#              _api yanit govdesinden okunur (DOM'a dokunulmaz)
+BOT_SCAN_ENGINE = os.getenv("BOT_SCAN_ENGINE", "step").lower()
+
+# Cekim verisinin kaynagi:
+#   dom -> tablo satirlarini oku (formatli metin)
+#   vue -> component'in $data.financial_list ham objeleri (sayisal tutar, ISO tarih)
+#          component bulunamazsa otomatik DOM'a duser
+BOT_DATA_SOURCE = os.getenv("BOT_DATA_SOURCE", "dom").lower()
+
+# Sayfalama: component'in sayfa boyutu bu degere cekilir (0 = dokunma),
+# toplam sayiya ulasilamazsa kalan sayfalar sirayla okunur (en fazla BOT_MAX_PAGES).
+BOT_PAGE_SIZE = int(os.getenv("BOT_PAGE_SIZE", "500"))
+BOT_MAX_PAGES = int(os.getenv("BOT_MAX_PAGES", "20"))
+
+# Network capture modunda dinlenecek URL parcasi
+BOT_CAPTURE_MATCH = os.getenv("BOT_CAPTURE_MATCH", "/_api/financial")
+
+# Calisma modu:
+#   browser -> her tarama Chrome sekmesinde (varsayilan)
+#   hybrid  -> Chrome sadece Cloudflare + session icin; tarama CronosAPI (httpx) ile
+BOT_MODE = os.getenv("BOT_MODE", "browser").lower()
+BOT_API_SCAN_INTERVAL = float(os.getenv("BOT_API_SCAN_INTERVAL", "2"))
+# Hybrid modda token/cookie'ler bu kadar saniyede bir tarayicidan tazelenir
+BOT_AUTH_REFRESH_SECONDS = int(os.getenv("BOT_AUTH_REFRESH_SECONDS", "300"))
+# Panelin cekim listesi endpoint'i (_api altinda)
+CRONOS_API_TRANSACTIONS_PATH = os.getenv("CRONOS_API_TRANSACTIONS_PATH", "/financial/transactions")
+
+# CronosAPI connection pool ayarlari (HTTP/2 icin: pip install httpx[http2])
+CRONOS_API_HTTP2 = os.getenv("CRONOS_API_HTTP2", "").lower() in ("1", "true")
+CRONOS_API_MAX_CONNECTIONS = int(os.getenv("CRONOS_API_MAX_CONNECTIONS", "20"))
+CRONOS_API_MAX_KEEPALIVE = int(os.getenv("CRONOS_API_MAX_KEEPALIVE", "10"))
+CRONOS_API_TIMEOUT = float(os.getenv("CRONOS_API_TIMEOUT", "30"))
+
+# Toplu onay/red: ayni anda en fazla N istek, saniyede en fazla RATE istek (0 = limitsiz)
+CRONOS_BULK_CONCURRENCY = int(os.getenv("CRONOS_BULK_CONCURRENCY", "8"))
+CRONOS_BULK_RATE = float(os.getenv("CRONOS_BULK_RATE", "10"))
+
+# Her durum (beklemede/reserve/islemde) icin ayri sabit sekme acip paralel tara
+BOT_MULTI_TAB = os.getenv("BOT_MULTI_TAB", "").lower() in ("1", "true")
+
+# Tarama zamanlayicisi: durum bazli temel araliklar (saniye), bos olanlar
+# BOT_SCAN_INTERVAL (hybrid modda BOT_API_SCAN_INTERVAL) degerini alir.
+#   orn. BOT_STATUS_INTERVALS="beklemede=3,reserve=15,islemde=60"
+BOT_STATUS_INTERVALS = os.getenv("BOT_STATUS_INTERVALS", "")
+# Hareket olunca hizlanma / bos turlarda geri cekilme (0 ise sabit tempo)
+BOT_ADAPTIVE_SCAN = os.getenv("BOT_ADAPTIVE_SCAN", "1").lower() in ("1", "true")
+BOT_MIN_SCAN_INTERVAL = float(os.getenv("BOT_MIN_SCAN_INTERVAL", "1"))
+BOT_SCAN_BACKOFF_MAX = float(os.getenv("BOT_SCAN_BACKOFF_MAX", "4"))
+
+# Tarayicida gereksiz kaynaklari CDP Fetch ile engelle (gorsel/font/medya/izleyici)
+BOT_BLOCK_RESOURCES = os.getenv("BOT_BLOCK_RESOURCES", "").lower() in ("1", "true")
+# Engellenen CDP kaynak tipleri (Image, Font, Media, Stylesheet ...)
+BOT_BLOCK_TYPES = [
+    t.strip() for t in os.getenv("BOT_BLOCK_TYPES", "Image,Font,Media").split(",") if t.strip()
+]
+# Ek engellenecek URL desenleri (virgulle, orn. "*chat-widget.com/*")
+BOT_BLOCK_URLS = [u.strip() for u in os.getenv("BOT_BLOCK_URLS", "").split(",") if u.strip()]
+# Engellenmeyecek adres parcalari (Cloudflare challenge kaynaklari)
+BOT_BLOCK_ALLOW = [
+    a.strip()
+    for a in os.getenv("BOT_BLOCK_ALLOW", "challenges.cloudflare.com,/cdn-cgi/").split(",")
+    if a.strip()
+]
+
+# Bellek izleme: her N turda JS heap + Chrome RSS olcumu (0 = kapali)
+BOT_MEMORY_CHECK_EVERY = int(os.getenv("BOT_MEMORY_CHECK_EVERY", "10"))
+# Asilinca ana sekme yenilenir (0 = sinir yok). RSS sekme yenilemesine
+# ragmen sinirin ustunde kalirsa Chrome yeniden baslatilir. RSS siniri her
+# Chrome icin ayri uygulanir (BOT_STANDBY=1 ile toplam bellek ~2 x sinir).
+BOT_MAX_JS_HEAP_MB = float(os.getenv("BOT_MAX_JS_HEAP_MB", "512"))
+BOT_MAX_RSS_MB = float(os.getenv("BOT_MAX_RSS_MB", "1500"))
+BOT_TAB_MAX_AGE_MIN = float(os.getenv("BOT_TAB_MAX_AGE_MIN", "360"))
+
+# access_token (JWT) bitisine bu kadar saniye kala arka planda yeniden login (0 = kapali)
+BOT_TOKEN_REFRESH_LEAD = int(os.getenv("BOT_TOKEN_REFRESH_LEAD", "600"))
+
+# Sicak yedek tarayici: ayri profilde login + cekim sayfasinda bekler,
+# ana tarayici dusunce ayni turda taramayi devralir (~2x bellek)
+BOT_STANDBY = os.getenv("BOT_STANDBY", "").lower() in ("1", "true")
+BOT_STANDBY_PROFILE_DIR = os.getenv(
+    "BOT_STANDBY_PROFILE_DIR", os.path.expanduser("~/.cronos_bot_chrome_profile_standby")
+)
+# Yedegin saglik kontrolu her N turda bir
+BOT_STANDBY_CHECK_EVERY = int(os.getenv("BOT_STANDBY_CHECK_EVERY", "10"))
+
+# Panel durumu her turda journal'a eklenir; her N turda bir atomik snapshot alinir
+BOT_PANEL_SNAPSHOT_EVERY = int(os.getenv("BOT_PANEL_SNAPSHOT_EVERY", "100"))
+
+# Panel/session dosya yazimi ve konsol loglari ayri thread'de (event loop bloklanmaz)
+BOT_ASYNC_IO = os.getenv("BOT_ASYNC_IO", "1").lower() in ("1", "true")
+# Event loop bu kadar ms'den fazla bloklanirsa loglanir (0 = sadece olcum)
+BOT_LOOP_LAG_WARN_MS = float(os.getenv("BOT_LOOP_LAG_WARN_MS", "100"))
+
+# Web paneli ayri surecteyse (Procfile web + worker) durum kanali:
+#   ""       -> kapali (ayni surecte calisan panel bellekten okur)
+#   postgres -> her tur farki Postgres'e yazilir + LISTEN/NOTIFY ile web'e iletilir
+BOT_STATE_CHANNEL = os.getenv("BOT_STATE_CHANNEL", "").lower()
@@ -0,0 +1,352 @@
+"""
+Bot -> web paneli durum kanali (Postgres LISTEN/NOTIFY).
+=========================================================
+Procfile'da web (uvicorn) ve worker (bot.runner) ayri sureclerdir; web
+sureci bot_data.json'u sadece acilista okudugu icin eski veri gosteriyordu.
+
+Bot tarafi (PostgresStatePublisher, PanelStateStore'un channel'i, kendi
+thread'inde; DB yokken yazici thread'ini bekletmez):
+  - Her tur journal satiri bot_state_log tablosuna yazilir ve
+    NOTIFY bot_state ile yayinlanir. Satir NOTIFY sinirina (8000 bayt)
+    sigiyorsa payload'in kendisidir, sigmiyorsa sadece {"seq": n} gider.
+  - Her snapshot bot_state_snapshot'a yazilir, eski log satirlari silinir.
+    Bot acilisinda reset=True ile yayinlanir (seq bastan baslayabilir).
+
+Web tarafi (PostgresStateListener, ayri thread):
+  - LISTEN bot_state, sonra snapshot + log ile durumu kurar
+  - Her bildirimde sadece o turun farkini uygular (sira atlanirsa log'dan
+    tamamlar, log'da yoksa snapshot'tan yeniden yukler) ve degisen
+    anahtarlari on_update ile bot_state'e aktarir. Istek basina dosya
+    okunmaz/parse edilmez.
+
+Lokal: docker compose up -d postgres && BOT_STATE_CHANNEL=postgres
+"""
+import json
+import logging
+import select
+import threading
+import time
+from collections import deque
+
+import psycopg2
+from sqlalchemy import text
+
+from bot.state_store import apply_entry
+from config.settings import DATABASE_URL
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "bot_state"
+# Postgres NOTIFY payload siniri 8000 bayt
+NOTIFY_MAX_BYTES = 7900
+
+
+def _dsn(url):
+    """SQLAlchemy URL'si -> libpq DSN (postgresql+psycopg2:// -> postgresql://)."""
+    return url.replace("postgresql+psycopg2://", "postgresql://", 1)
+
+
+class PostgresStatePublisher:
+    """
+    Bot sureci: journal satirlarini / snapshot'lari Postgres'e yazar ve NOTIFY eder.
+
+    publish / publish_snapshot sadece kuyruga ekler (IOWriter thread'inden
+    cagrilir, DB'yi beklemez); yazim kendi thread'inde yapilir:
+      - Yeni snapshot, kapsadigi bekleyen log satirlarini gecersiz kilar;
+        bekleyen tek bir snapshot tutulur (en yenisi).
+      - Hata = devre kesici acilir: retry_delay'den baslayip max_delay'e
+        kadar katlanan sure boyunca DB denenmez, bekleyenler birikir ve
+        sonra tek transaction'da yazilir.
+      - Bekleyen log satirlari max_pending'i asarsa en eskisi atilir; ara
+        kopmus olur, bir sonraki snapshot'a kadar satir yayinlanmaz
+        (web tarafi snapshot ile yeniden kurar).
+    """
+
+    def __init__(self, engine=None, max_pending=1000, retry_delay=5.0, max_delay=60.0):
+        if engine is None:
+            from database.db import engine
+        self.engine = engine
+        self.max_pending = max_pending
+        self.retry_delay = retry_delay
+        self.max_delay = max_delay
+        self._entries = deque()          # (seq, body, payload)
+        self._snapshot = None            # (seq, data, reset)
+        self._last_snapshot_seq = 0
+        self._gap = False
+        self._epoch = 0
+        self._ready = False
+        self._cond = threading.Condition()
+        self._thread = None
+        self._delay = 0.0
+        self._open_until = 0.0
+        self.published = 0
+        self.dropped = 0
+        self.errors = 0
+        self.last_error = None
+        self.last_ms = None
+
+    def start(self):
+        """Yayin thread'ini baslat (tablolar ilk yazimdan once olusturulur)."""
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._loop, name="state-publisher", daemon=True)
+            self._thread.start()
+        return self
+
+    def publish(self, entry, line):
+        """Tur farki: log'a yaz + NOTIFY (NOTIFY commit'te gider)."""
+        body = line.rstrip("\n")
+        payload = body if len(body.encode("utf-8")) <= NOTIFY_MAX_BYTES else json.dumps({"seq": entry["seq"]})
+        with self._cond:
+            if entry["seq"] <= self._last_snapshot_seq:
+                # Zaten yayinlanacak snapshot'in icinde
+                return
+            if self._gap:
+                self.dropped += 1
+                return
+            if len(self._entries) >= self.max_pending:
+                # DB uzun suredir yok: bellek sinirsiz buyumesin, snapshot'i bekle
+                self.dropped += len(self._entries) + 1
+                self._entries.clear()
+                self._gap = True
+                return
+            self._entries.append((entry["seq"], body, payload))
+            self._cond.notify()
+
+    def publish_snapshot(self, seq, data, reset=False):
+        """Tam durum: snapshot satirini guncelle, kapsanan log satirlarini sil."""
+        with self._cond:
+            if self._snapshot is not None:
+                reset = reset or self._snapshot[2]
+            self._snapshot = (seq, data, reset)
+            self._last_snapshot_seq = seq
+            if reset:
+                # seq bastan baslamis olabilir: eski satirlarin hepsi gecersiz
+                self._entries.clear()
+                self._epoch += 1
+            while self._entries and self._entries[0][0] <= seq:
+                self._entries.popleft()
+            self._gap = False
+            self._cond.notify()
+
+    def flush(self, timeout=5.0):
+        """Bekleyenler yazilana kadar bekle (kapanis). Doner: bosaldiysa True."""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while self._snapshot is not None or self._entries:
+                left = deadline - time.monotonic()
+                if left <= 0 or not self.running:
+                    return False
+                self._cond.wait(min(left, 0.1))
+        return True
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def _loop(self):
+        while True:
+            with self._cond:
+                while True:
+                    wait = self._open_until - time.monotonic()
+                    if wait <= 0 and (self._snapshot is not None or self._entries):
+                        break
+                    self._cond.wait(wait if wait > 0 else None)
+                snapshot, entries, epoch = self._snapshot, list(self._entries), self._epoch
+            t0 = time.perf_counter()
+            try:
+                if not self._ready:
+                    # init_db hatayi loglayip yutar: ilk basarili yazima kadar tekrarlanir
+                    from database.db import init_db
+                    init_db()
+                with self.engine.begin() as conn:
+                    if snapshot is not None:
+                        self._write_snapshot(conn, *snapshot)
+                    for seq, body, payload in entries:
+                        if snapshot is None or seq > snapshot[0]:
+                            self._write_entry(conn, seq, body, payload)
+            except Exception as e:
+                self._failed(e)
+                continue
+            with self._cond:
+                if self._snapshot is snapshot:
+                    self._snapshot = None
+                # Yazilanlari cikar (bu arada gelen snapshot bir kismini silmis olabilir)
+                written = entries[-1][0] if entries and epoch == self._epoch else 0
+                while self._entries and self._entries[0][0] <= written:
+                    self._entries.popleft()
+                self._cond.notify_all()
+            if self.last_error is not None:
+                print("[+] Durum kanali (Postgres) tekrar calisiyor", flush=True)
+                self.last_error = None
+            self._ready = True
+            self._delay = 0.0
+            self.published += len(entries) + (snapshot is not None)
+            self.last_ms = round((time.perf_counter() - t0) * 1000, 2)
+
+    def _failed(self, e):
+        """Devre kesici: bir sonraki denemeyi katlanan sure kadar ertele."""
+        self.errors += 1
+        if self.last_error is None:
+            print(f"[!] Durum kanali (Postgres) hatasi: {e}", flush=True)
+        self.last_error = f"{type(e).__name__}: {e}"
+        self._delay = min(self.max_delay, max(self.retry_delay, self._delay * 2))
+        with self._cond:
+            self._open_until = time.monotonic() + self._delay
+
+    @staticmethod
+    def _write_entry(conn, seq, body, payload):
+        conn.execute(
+            text(
+                "INSERT INTO bot_state_log (seq, entry, created_at) "
+                "VALUES (:seq, :entry, now() at time zone 'utc') "
+                "ON CONFLICT (seq) DO UPDATE SET entry = EXCLUDED.entry"
+            ),
+            {"seq": seq, "entry": body},
+        )
+        conn.execute(text("SELECT pg_notify(:ch, :payload)"), {"ch": CHANNEL, "payload": payload})
+
+    @staticmethod
+    def _write_snapshot(conn, seq, data, reset):
+        conn.execute(
+            text(
+                "INSERT INTO bot_state_snapshot (id, seq, data, updated_at) "
+                "VALUES (1, :seq, :data, now() at time zone 'utc') "
+                "ON CONFLICT (id) DO UPDATE SET seq = EXCLUDED.seq, data = EXCLUDED.data, "
+                "updated_at = EXCLUDED.updated_at"
+            ),
+            {"seq": seq, "data": data},
+        )
+        if reset:
+            conn.execute(text("DELETE FROM bot_state_log"))
+        else:
+            conn.execute(text("DELETE FROM bot_state_log WHERE seq <= :seq"), {"seq": seq})
+        conn.execute(
+            text("SELECT pg_notify(:ch, :payload)"),
+            {"ch": CHANNEL, "payload": json.dumps({"snapshot": seq, "reset": reset})},
+        )
+
+    def stats(self):
+        with self._cond:
+            pending = len(self._entries) + (self._snapshot is not None)
+            open_s = max(0.0, self._open_until - time.monotonic())
+        return {
+            "published": self.published,
+            "pending": pending,
+            "dropped": self.dropped,
+            "errors": self.errors,
+            "last_error": self.last_error,
+            "last_ms": self.last_ms,
+            "circuit_open_s": round(open_s, 1),
+        }
+
+
+class PostgresStateListener:
+    """
+    Web sureci: LISTEN bot_state ile her turun farkini alir.
+
+        listener = PostgresStateListener(set_bot_state).start()
+    """
+
+    def __init__(self, on_update, dsn=None, reconnect_delay=5.0, idle_timeout=30.0):
+        self.on_update = on_update
+        self.dsn = dsn or _dsn(DATABASE_URL)
+        self.reconnect_delay = reconnect_delay
+        self.idle_timeout = idle_timeout
+        self.state = {}
+        self.seq = 0
+        self.received = 0
+        self.fetched = 0
+        self.reloads = 0
+        self.last_error = None
+        self._thread = None
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="state-listener", daemon=True)
+            self._thread.start()
+        return self
+
+    def _run(self):
+        while True:
+            try:
+                self._listen()
+            except Exception as e:
+                self.last_error = f"{type(e).__name__}: {e}"
+                logger.warning("Durum kanali baglantisi koptu, %ss sonra tekrar: %s",
+                               self.reconnect_delay, e)
+            time.sleep(self.reconnect_delay)
+
+    def _listen(self):
+        conn = psycopg2.connect(self.dsn, connect_timeout=10)
+        try:
+            conn.autocommit = True
+            cur = conn.cursor()
+            # Once LISTEN, sonra yukleme: aradaki bildirimler kaybolmaz
+            cur.execute(f"LISTEN {CHANNEL}")
+            self._reload(cur)
+            self.last_error = None
+            logger.info("Durum kanali dinleniyor (seq %s)", self.seq)
+            while True:
+                if select.select([conn], [], [], self.idle_timeout) == ([], [], []):
+                    # Bosta: baglanti canli mi?
+                    cur.execute("SELECT 1")
+                    continue
+                conn.poll()
+                while conn.notifies:
+                    self._handle(cur, conn.notifies.pop(0).payload)
+        finally:
+            conn.close()
+
+    def _reload(self, cur):
+        """Snapshot + sonraki log satirlarindan durumu bastan kur."""
+        cur.execute("SELECT seq, data FROM bot_state_snapshot WHERE id = 1")
+        row = cur.fetchone()
+        state, seq = {}, 0
+        if row:
+            seq, state = row[0], json.loads(row[1])
+            state.pop("_seq", None)
+        cur.execute("SELECT entry FROM bot_state_log WHERE seq > %s ORDER BY seq", (seq,))
+        for (entry,) in cur.fetchall():
+            entry = json.loads(entry)
+            apply_entry(state, entry)
+            seq = entry["seq"]
+        self.state, self.seq = state, seq
+        self.reloads += 1
+        self.on_update(dict(state))
+
+    def _handle(self, cur, payload):
+        msg = json.loads(payload)
+        self.received += 1
+        if "snapshot" in msg:
+            if msg.get("reset") or msg["snapshot"] > self.seq:
+                self._reload(cur)
+            return
+
+        seq = msg.get("seq", 0)
+        if seq <= self.seq:
+            return
+        if seq == self.seq + 1 and ("set" in msg or "lists" in msg):
+            entries = [msg]
+        else:
+            # Payload'a sigmadi veya bildirim kacti: eksikleri log'dan al
+            cur.execute("SELECT entry FROM bot_state_log WHERE seq > %s ORDER BY seq", (self.seq,))
+            entries = [json.loads(e) for (e,) in cur.fetchall()]
+            self.fetched += 1
+            if not entries or entries[0]["seq"] != self.seq + 1:
+                self._reload(cur)
+                return
+
+        changed = set()
+        for entry in entries:
+            changed.update(apply_entry(self.state, entry))
+            self.seq = entry["seq"]
+        self.on_update({key: self.state[key] for key in changed})
+
+    def stats(self):
+        return {
+            "seq": self.seq,
+            "received": self.received,
+            "fetched": self.fetched,
+            "reloads": self.reloads,
+            "last_error": self.last_error,
+        }